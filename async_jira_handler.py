@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+
+'''
+async_jira_handler.py
+
+This module provides the AsyncJira class, an asyncio counterpart of jira_handler.Jira.
+
+It requires the "httpx" library and offers the Jira operations (sending requests, creating
+issues and epics, linking issues and looking up sprints) as coroutines, for embedding the
+issue creation in asyncio applications. A semaphore caps the number of in-flight requests.
+Every request and created issue is recorded in a RunReport, like with the Jira class.
+Issue links to other nodes of the plan ('ref' targets) are sent once the issues of the call are
+created, so they can point to any issue created by the same call.
+
+Example:
+    async with AsyncJira(jira_url, jira_api_base_url, jira_token, jira_special_fields) as jira:
+        await jira.create_epics_and_issues('PROJECT_KEY', epics)
+'''
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from jira_handler import JiraBase, DEFAULT_CONNECTION_SETTINGS, MAX_RESPONSE_LOG_SIZE
+from link_stage import LinkStage, link_target
+from rate_limiter import RequestStats
+from run_report import RunReport
+from sprint_resolver import normalize_sprint_name
+
+DEFAULT_MAX_IN_FLIGHT = 10  # Default maximum number of concurrent Jira requests
+
+
+class AsyncJira(JiraBase):
+    def __init__(self,
+                 jira_url: str,
+                 jira_api_base_url: str,
+                 jira_token: str,
+                 jira_special_fields: Dict[str, Any],
+                 connection_settings: Optional[Dict[str, Any]] = None,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 run_report: Optional[RunReport] = None):
+        '''
+        Initializes a new instance of the AsyncJira class.
+        The credentials are validated when entering the `async with` block
+        (or by awaiting `validate_credentials`).
+
+        Args:
+            jira_url (str): The base URL of the Jira instance.
+            jira_api_base_url (str): The base URL for Jira API requests.
+            jira_token (str): The API token for authenticating Jira requests.
+            jira_special_fields (Dict[str, Any]): Configuration dictionary containing fields related to Jira API interactions.
+            connection_settings (Optional[Dict[str, Any]]): The 'jira_connection' configuration section
+                (pool sizes and timeouts). Missing values fall back to DEFAULT_CONNECTION_SETTINGS.
+            max_in_flight (int): Maximum number of concurrent Jira requests.
+            run_report (Optional[RunReport]): The instrumentation of the run, recording every request
+                and created issue. Defaults to a new RunReport.
+        '''
+        super().__init__(jira_url, jira_api_base_url, jira_token, jira_special_fields)
+
+        self.run_report = run_report or RunReport()
+        self.stats = RequestStats()
+
+        settings = {**DEFAULT_CONNECTION_SETTINGS, **(connection_settings or {})}
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=httpx.Timeout(settings['read_timeout'], connect=settings['connect_timeout']),
+            limits=httpx.Limits(max_connections=settings['pool_maxsize'],
+                                max_keepalive_connections=settings['pool_maxsize']))
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+
+        # Builds of the sprint indexes (normalized sprint name -> sprint ID) by project key, see get_sprint_index
+        self._sprint_indexes: Dict[str, asyncio.Future] = {}
+        # Last built sprint index by project key
+        self._built_sprint_indexes: Dict[str, Dict[str, str]] = {}
+        # Normalized sprint names already missing after the last rebuild of a project index
+        self._missing_sprint_names: Dict[str, Set[str]] = {}
+        # Keys of the created nodes by 'ref' name, and the links to refs that were not created yet
+        self.link_stage = LinkStage()
+        self._pending_ref_links: List[Tuple[str, Dict[str, Any], str]] = []
+
+    async def __aenter__(self) -> 'AsyncJira':
+        await self.validate_credentials()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        '''
+        Close the pooled connections of the AsyncJira instance.
+        '''
+        await self.client.aclose()
+
+    def log_run_summary(self) -> None:
+        '''
+        Log the request statistics of the run (see Jira.log_run_summary). AsyncJira does not retry requests.
+        '''
+        stats = self.stats.as_dict()
+        logging.info(f'Run summary: {stats["requests"]} Jira requests, {stats["retries"]} retries')
+        self.run_report.log_summary(stats)
+
+    def write_run_report(self, report_file: str) -> None:
+        '''
+        Write the run report as JSON or as a Prometheus textfile, see RunReport.write.
+        '''
+        self.run_report.write(report_file, self.stats.as_dict())
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        '''
+        Send an HTTP request within the in-flight limit, and record it in the run report.
+        '''
+        async with self.semaphore:
+            self.stats.add(requests=1)
+            start = time.monotonic()
+            try:
+                response = await self.client.request(method.upper(), url, **kwargs)
+            except httpx.HTTPError:
+                self.run_report.record_request(method, url, None, 0, time.monotonic() - start)
+                raise
+        self.run_report.record_request(method, url, response.status_code, len(response.content),
+                                       time.monotonic() - start)
+        return response
+
+    async def validate_credentials(self) -> None:
+        '''
+        Validate the Jira URL and token by making a simple request to the Jira API.
+
+        Raises:
+            RuntimeError: If the Jira URL or token validation fails.
+        '''
+        logging.debug('Validating Jira URL and token')
+        response = await self._request('get', f'{self.jira_api_base_url}/myself')
+        if response.status_code != 200:
+            logging.error(
+                f'Failed to validate Jira URL or token. The Jira API request responded with a "{response.status_code}" status code.')
+            logging.info('Make sure the Jira URL and token are set correctly.')
+            raise RuntimeError(
+                'Failed to validate Jira URL or token. Check log for details.')
+
+    async def send_request(self,
+                           api_type: Optional[str] = None,
+                           custom_jira_api_base_url: Optional[str] = None,
+                           issue_key: Optional[str] = None,
+                           jira_request_data: Optional[Dict[str, Any]] = None,
+                           method: Optional[str] = 'post') -> Dict[str, Any]:
+        '''
+        Send a request to the Jira API and return the parsed response.
+        At most `max_in_flight` requests are sent concurrently.
+
+        Args:
+            api_type (str): Type of the API endpoint (e.g., 'issue', 'board').
+            custom_jira_api_base_url (Optional[str]): Custom base URL for the Jira API request.
+            issue_key (Optional[str]): The key of the issue for PUT requests.
+            jira_request_data (Optional[Dict[str, Any]]): Data to send in the request.
+            method (Optional[str]): HTTP method to use ('post', 'put', 'get'). Defaults to 'post'.
+
+        Returns:
+            Dict[str, Any]: Parsed response from the Jira API, an empty dict for empty responses.
+
+        Raises:
+            httpx.HTTPError: If the request to Jira fails.
+            ValueError: If an invalid HTTP method is used.
+        '''
+        if method.lower() not in ['post', 'put', 'get']:
+            raise ValueError(
+                'Invalid HTTP method. Allowed methods are "post", "put", "get".')
+
+        if custom_jira_api_base_url:
+            url = custom_jira_api_base_url
+        else:
+            if method.lower() in ['put', 'get'] and issue_key:
+                url = f'{self.jira_api_base_url}/{api_type}/{issue_key}'
+            else:
+                url = f'{self.jira_api_base_url}/{api_type}'
+
+        logging.debug('Sending a Jira %s request to "%s" with the following DATA: %s',
+                      method.upper(), url, jira_request_data)
+        response = None
+        try:
+            if method.lower() == 'get':
+                response = await self._request(method, url, params=jira_request_data)
+            else:
+                response = await self._request(method, url, json=jira_request_data)
+
+            response.raise_for_status()  # Raise exception for non-2xx response codes
+            if not response.content:
+                return {}
+            try:
+                response_json = response.json()
+            except ValueError:
+                logging.error(
+                    f'Return Non-JSON response as text: {response.text}')
+                return {'response_text': response.text}
+            if len(response.content) <= MAX_RESPONSE_LOG_SIZE:
+                logging.debug('Request response: %s', response_json)
+            else:
+                logging.debug('Request response is too large to log (size: %d bytes)', len(response.content))
+            return response_json
+        except httpx.HTTPError as e:
+            logging.error(f'Error in Jira API request: {str(e)}')
+            if response is not None:
+                logging.error(f'Request response: {response.text}')
+            raise e  # Re-raise the exception for handling at a higher level
+
+    async def get_project_id_by_key(self, project_key: str) -> str:
+        '''
+        Get the ID of a Jira project by its key.
+
+        Raises:
+            RuntimeError: If the project key is not found.
+        '''
+        try:
+            return (await self.send_request(api_type='project', issue_key=project_key, method='get'))['id']
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                raise RuntimeError(f'Project key "{project_key}" not found.')
+            raise e
+
+    async def get_board_ids_by_project_key(self, project_key: str) -> List[str]:
+        '''
+        Return **all** Scrum board IDs (type='scrum') for the given project, skipping Kanban boards.
+        '''
+        project_id = await self.get_project_id_by_key(project_key)
+        search_project_boards_url = f'{self.jira_url}/rest/agile/1.0/board?projectKeyOrId={project_id}'
+        response = await self.send_request(
+            custom_jira_api_base_url=search_project_boards_url, method='get')
+
+        board_ids = [str(board['id']) for board in response.get('values', [])
+                     if board.get('type') == 'scrum']
+        if not board_ids:
+            raise RuntimeError(f'No boards (Scrum) found for project key "{project_key}".')
+        return board_ids
+
+    async def get_sprint_id_from_all_boards(self, project_key: str, sprint_name: str) -> Optional[str]:
+        '''
+        Search for a sprint across all Scrum boards in the project.
+        Returns the first matching sprint ID, or None if not found in any board.
+        '''
+        board_ids = await self.get_board_ids_by_project_key(project_key)
+        for b_id in board_ids:
+            possible_sprint_id = await self.get_sprint_id(b_id, sprint_name)
+            if possible_sprint_id:
+                logging.debug(f'Sprint "{sprint_name}" was found in board {b_id}.')
+                return possible_sprint_id
+
+        logging.error(f'Sprint "{sprint_name}" was not found in the "{project_key}" project.')
+        return None
+
+    async def get_sprint_id(self, board_id: str, sprint_name: str) -> Optional[str]:
+        '''
+        Get the ID of a sprint by its name on a given scrum board.
+        Fetches active and future sprints and handles pagination.
+        '''
+        base_url = f'{self.jira_url}/rest/agile/1.0/board/{board_id}/sprint'
+        start_at = 0
+        max_results = 50  # default page size
+
+        while True:
+            response = await self.send_request(
+                custom_jira_api_base_url=base_url,
+                method='get',
+                jira_request_data={
+                    "state": "active,future",
+                    "startAt": start_at,
+                    "maxResults": max_results
+                }
+            )
+            for sprint in response.get('values', []):
+                if sprint.get('name', '').strip().lower() == sprint_name.strip().lower():
+                    return sprint.get('id')
+
+            start_at += max_results
+            if response.get('isLast', True):
+                break
+
+        logging.debug(f'Sprint "{sprint_name}" not found in board {board_id}.')
+        return None
+
+    async def get_sprint_index(self, project_key: str) -> Dict[str, str]:
+        '''
+        Build an index of the active and future sprints of all the Scrum boards in the project.
+        When several boards have a sprint with the same name, the first board wins.
+
+        Returns:
+            Dict[str, str]: Sprint IDs by normalized sprint name.
+        '''
+        board_ids = await self.get_board_ids_by_project_key(project_key)
+        board_sprints = await asyncio.gather(*(self.get_board_sprints(b_id) for b_id in board_ids))
+        sprint_index: Dict[str, str] = {}
+        for sprints in board_sprints:
+            for sprint in sprints:
+                sprint_index.setdefault(normalize_sprint_name(sprint.get('name')), sprint.get('id'))
+        logging.debug(f'Indexed {len(sprint_index)} sprints of the "{project_key}" project')
+        return sprint_index
+
+    async def get_board_sprints(self, board_id: str) -> List[Dict[str, Any]]:
+        '''
+        Get all the active and future sprints of a scrum board, following the pagination.
+        '''
+        base_url = f'{self.jira_url}/rest/agile/1.0/board/{board_id}/sprint'
+        start_at = 0
+        max_results = 50  # default page size
+        sprints: List[Dict[str, Any]] = []
+
+        while True:
+            response = await self.send_request(
+                custom_jira_api_base_url=base_url,
+                method='get',
+                jira_request_data={
+                    "state": "active,future",
+                    "startAt": start_at,
+                    "maxResults": max_results
+                }
+            )
+            sprints.extend(response.get('values', []))
+
+            start_at += max_results
+            if response.get('isLast', True):
+                break
+        return sprints
+
+    async def _prefetch_sprint_id(self, jira_project: str, jira_issue: Dict[str, Any]) -> Dict[str, str]:
+        '''
+        Return the sprint index of the project to build the data of an issue with, once it has the
+        sprint of the issue (or was rebuilt without finding it). The index is built once per project
+        (concurrent callers share the same build) and rebuilt only when a sprint name is missing from it.
+        A caller that misses a name while a rebuild is already running waits for that rebuild.
+        '''
+        if 'sprint' not in jira_issue or 'sprint' not in self.custom_field_mapping:
+            return {}
+        name = normalize_sprint_name(jira_issue['sprint'])
+        build = self._sprint_indexes.get(jira_project) or self._start_sprint_index_build(jira_project)
+        sprint_index = await self._await_sprint_index(jira_project, build)
+        if name in sprint_index or name in self._missing_sprint_names[jira_project]:
+            return sprint_index
+
+        rebuild = self._sprint_indexes.get(jira_project)
+        if rebuild is None or rebuild is build:
+            logging.debug(f'Sprint "{jira_issue["sprint"]}" is not in the sprint index of the '
+                          f'"{jira_project}" project, refreshing the index')
+            rebuild = self._start_sprint_index_build(jira_project)
+        sprint_index = await self._await_sprint_index(jira_project, rebuild)
+        if name not in sprint_index:
+            self._missing_sprint_names[jira_project].add(name)
+        return sprint_index
+
+    def _start_sprint_index_build(self, jira_project: str) -> asyncio.Future:
+        '''
+        Start building the sprint index of a project, shared by the callers until the next rebuild.
+        '''
+        build = asyncio.ensure_future(self.get_sprint_index(jira_project))
+        self._sprint_indexes[jira_project] = build
+        self._missing_sprint_names[jira_project] = set()
+        return build
+
+    async def _await_sprint_index(self, jira_project: str, build: asyncio.Future) -> Dict[str, str]:
+        '''
+        Wait for a sprint index build of a project. A failed build is forgotten, so the next lookup builds it again.
+        '''
+        try:
+            sprint_index = await build
+        except Exception:
+            if self._sprint_indexes.get(jira_project) is build:
+                del self._sprint_indexes[jira_project]
+            raise
+        self._built_sprint_indexes[jira_project] = sprint_index
+        return sprint_index
+
+    def _resolve_sprint_id(self,
+                           jira_project: str,
+                           sprint_name: str,
+                           sprint_index: Optional[Dict[str, str]] = None) -> Optional[str]:
+        '''
+        Return the ID of a sprint of the project from a sprint index returned by _prefetch_sprint_id
+        (by default, the last built index of the project), or None if it is not found.
+        '''
+        if sprint_index is None:
+            sprint_index = self._built_sprint_indexes.get(jira_project, {})
+        sprint_id = sprint_index.get(normalize_sprint_name(sprint_name))
+        if sprint_id is None:
+            logging.error(f'Sprint "{sprint_name}" was not found in the "{jira_project}" project.')
+        return sprint_id
+
+    async def link_jira_issues(self,
+                               issue_key: str,
+                               issue_parent_key: str,
+                               link_type: str = 'Related') -> Dict[str, Any]:
+        '''
+        Link two Jira issues with a specified relationship type.
+
+        Args:
+            issue_key (str): The key of the Jira issue to link (outward issue).
+            issue_parent_key (str): The key of the Jira issue to link to (inward issue).
+            link_type (str, optional): The type of relationship between the issues. Defaults to 'Related'.
+
+        Returns:
+            Dict[str, Any]: The response from the Jira API after linking the issues.
+        '''
+        link_data = {
+            'type': {'name': link_type},
+            'inwardIssue': {'key': issue_key},
+            'outwardIssue': {'key': issue_parent_key}
+        }
+        return await self.send_request(api_type='issueLink', method='post', jira_request_data=link_data)
+
+    async def create_new_jira_issue(self,
+                                    jira_project: str,
+                                    jira_issue: Dict[str, Any],
+                                    epic_key: Optional[str] = None,
+                                    parent_key: Optional[str] = None) -> Dict[str, Any]:
+        '''
+        Create a new Jira issue in a specified project and optionally link it to an epic or parent issue.
+        Some fields are updated post-creation as specified in the configuration.
+
+        Args:
+            jira_project (str): The key of the Jira project where the issue will be created.
+            jira_issue (Dict[str, Any]): A dictionary containing the fields and values for the new Jira issue.
+            epic_key (Optional[str], optional): The key of the epic to link the new issue to. Defaults to None.
+            parent_key (Optional[str], optional): The key of the parent issue for sub-tasks. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: The response from the Jira API after creating the issue.
+        '''
+        sprint_index = await self._prefetch_sprint_id(jira_project, jira_issue)
+        initial_issue_data, update_data = self._build_issue_payloads(
+            jira_project, jira_issue, epic_key, parent_key,
+            lambda sprint_name: self._resolve_sprint_id(jira_project, sprint_name, sprint_index))
+        start = time.monotonic()
+        response_data = await self.send_request(api_type='issue',
+                                                method='post',
+                                                jira_request_data=initial_issue_data)
+        issue_key = response_data.get('key')
+        if issue_key:
+            logging.debug(f'Issue {issue_key} successfully created')
+        else:
+            raise ValueError(
+                'Failed to retrieve issue key from the Jira response')
+
+        if update_data['fields']:
+            logging.debug('Update the issue with the post-creation fields')
+            await self.send_request(api_type='issue',
+                                    method='put',
+                                    issue_key=issue_key,
+                                    jira_request_data=update_data)
+        self.run_report.record_node(issue_key, parent_key or epic_key, time.monotonic() - start)
+
+        if 'ref' in jira_issue:
+            self.link_stage.register_ref(jira_issue['ref'], issue_key)
+
+        links = []
+        for link in jira_issue.get('issuelinks') or []:
+            link_type = link['type'].get('name', 'Related')
+            target = link_target(link)
+            issue_parent_key = self.link_stage.resolve_target(target)
+            if not issue_parent_key:
+                # The linked node is not created yet, the link is sent by flush_links
+                self._pending_ref_links.append((issue_key, target, link_type))
+                continue
+            logging.debug(f'Requesting a "{link_type}" link between '
+                          f'{issue_key} --> {issue_parent_key}')
+            links.append(self.link_jira_issues(issue_key, issue_parent_key, link_type))
+        await asyncio.gather(*links)
+
+        return response_data
+
+    async def flush_links(self) -> None:
+        '''
+        Send the links to the 'ref' targets that were not created yet when their issue was created.
+
+        Raises:
+            ValueError: If a link points to a 'ref' that no created issue has.
+        '''
+        pending, self._pending_ref_links = self._pending_ref_links, []
+        unresolved = [(issue_key, target) for issue_key, target, _ in pending
+                      if not self.link_stage.resolve_target(target)]
+        if unresolved:
+            raise ValueError('Cannot link issues to refs that were not created: '
+                             + ', '.join(f'{issue_key} --> {target["ref"]}' for issue_key, target in unresolved))
+        links = []
+        for issue_key, target, link_type in pending:
+            target_key = self.link_stage.resolve_target(target)
+            logging.debug(f'Requesting a "{link_type}" link between {issue_key} --> {target_key}')
+            links.append(self.link_jira_issues(issue_key, target_key, link_type))
+        await asyncio.gather(*links)
+
+    async def create_list_of_jira_issues(self,
+                                         jira_project: str,
+                                         jira_issues: List[Dict[str, Any]],
+                                         epic_key: Optional[str] = None,
+                                         issue_parent_key: Optional[str] = None) -> None:
+        '''
+        Create a list of Jira issues and their child issues under a specific project and epic.
+        Sibling issues are created concurrently, and child issues as soon as their parent exists.
+
+        Args:
+            jira_project (str): The key of the Jira project where the issues will be created.
+            jira_issues (List[Dict[str, Any]]): The issues to create.
+            epic_key (Optional[str], optional): The key of the epic to link the new issues to. Defaults to None.
+            issue_parent_key (Optional[str], optional): The key of the parent issue for sub-tasks. Defaults to None.
+        '''
+        await self._create_issue_list(jira_project, jira_issues, epic_key, issue_parent_key)
+        await self.flush_links()
+
+    async def _create_issue_list(self,
+                                 jira_project: str,
+                                 jira_issues: List[Dict[str, Any]],
+                                 epic_key: Optional[str],
+                                 issue_parent_key: Optional[str]) -> None:
+        '''
+        Create sibling issues and their child issues concurrently.
+        '''
+        await asyncio.gather(*(self._create_issue_tree(jira_project, issue, epic_key, issue_parent_key)
+                               for issue in jira_issues))
+
+    async def _create_issue_tree(self,
+                                 jira_project: str,
+                                 issue: Dict[str, Any],
+                                 epic_key: Optional[str],
+                                 issue_parent_key: Optional[str]) -> None:
+        '''
+        Create an issue, link it to its parent issue and create its child issues.
+        '''
+        logging.info(
+            f'Creating a Jira Issue type {issue["issuetype"]}: \"{issue["summary"]}\"')
+        issue_create_response = await self.create_new_jira_issue(jira_project=jira_project,
+                                                                 jira_issue=issue,
+                                                                 epic_key=epic_key,
+                                                                 parent_key=issue_parent_key)
+        issue_key = issue_create_response['key']
+        if epic_key:
+            logging.info(f'Issue created successfully under Epic {epic_key}: '
+                         f'{self.jira_url}/browse/{issue_key}')
+        else:
+            logging.info(
+                f'Issue created successfully: {self.jira_url}/browse/{issue_key}')
+
+        if issue_parent_key and issue['issuetype'] != 'Sub-task':
+            link_type = issue.get('linkType', 'Related')
+            logging.debug(f'Requesting a "{link_type}" link between '
+                          f'{issue_key} --> {issue_parent_key}')
+            await self.link_jira_issues(issue_key, issue_parent_key, link_type)
+
+        if 'issues' in issue:
+            await self._create_issue_list(
+                jira_project, issue['issues'], epic_key, issue_key)
+
+    async def create_epics_and_issues(self,
+                                      jira_project: str,
+                                      epics: List[Dict[str, Any]]) -> None:
+        '''
+        Create Jira epics and optionally their associated issues.
+        The epics are created concurrently.
+
+        Args:
+            jira_project (str): Key of the Jira project where epics/issues will be created.
+            epics (list): List of dictionaries containing details of epics and optionally issues.
+        '''
+        await asyncio.gather(*(self._create_epic_tree(jira_project, epic) for epic in epics))
+        await self.flush_links()
+
+    async def _create_epic_tree(self, jira_project: str, epic: Dict[str, Any]) -> None:
+        '''
+        Create an epic and its child issues.
+        '''
+        logging.info(f'Creating a Jira Epic \"{epic["epicName"]}\"')
+        epic_create_response = await self.create_new_jira_issue(jira_project=jira_project,
+                                                                jira_issue=epic)
+        epic_key = epic_create_response['key']
+        logging.info(
+            f'Epic created successfully: {self.jira_url}/browse/{epic_key}')
+
+        if 'issues' in epic:
+            await self._create_issue_list(
+                jira_project, epic['issues'], epic_key, None)
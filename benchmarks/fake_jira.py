@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+'''
+fake_jira.py
+
+Local stand-in of a Jira server, used for tuning and benchmarking the Jira client without a real Jira.
+
+It implements the endpoints used by jira_handler.Jira:
+
+- REST API: '/myself', '/project', '/project/{key}', '/project/{key}/components', '/project/{key}/versions',
+  '/user', '/search', '/issue', '/issue/bulk', '/issue/{key}' and '/issueLink'.
+- Agile API: '/rest/agile/1.0/board' and the paginated '/rest/agile/1.0/board/{id}/sprint'.
+
+The created issues and links are kept in memory. Every response can be delayed by a fixed latency
+(with an optional random jitter), and a configurable share of the requests is answered with a server
+error (500) or throttled (429 with a Retry-After header). The credential check ('/myself') is never
+failed or throttled.
+
+Usage:
+    python benchmarks/fake_jira.py [--port PORT] [--latency SECONDS] [--jitter SECONDS]
+                                   [--error-rate RATE] [--throttle-rate RATE] [--retry-after SECONDS]
+'''
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+API_PATH = '/rest/api/2'
+AGILE_PATH = '/rest/agile/1.0'
+MAX_SPRINT_RESULTS = 50
+# Phrase clauses of the summary searches of the duplicate index
+SUMMARY_PHRASE_PATTERN = re.compile(r'summary ~ "\\"(.*?)\\""')
+# Path segments of issue keys, project keys and numeric IDs, grouped in the request statistics
+ID_SEGMENT_PATTERN = re.compile(r'/(\d+|[A-Z][A-Z0-9]*(-\d+)?)(?=/|$)')
+
+
+def words(text: str) -> List[str]:
+    '''
+    Return the lower case words of a text, like the text index of Jira.
+    '''
+    return re.findall(r'\w+', text.lower())
+
+
+def endpoint_name(method: str, path: str) -> str:
+    '''
+    Return the endpoint of a request, e.g. 'PUT /issue/{id}', for the request statistics.
+    '''
+    for prefix in (API_PATH, AGILE_PATH):
+        if path.startswith(prefix):
+            path = path[len(prefix):]
+            break
+    return f'{method} {ID_SEGMENT_PATTERN.sub("/{id}", path)}'
+
+
+class FakeJiraHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive connections, like a real Jira
+    # The headers and the body are written separately, so without TCP_NODELAY every response
+    # would wait for the delayed ACK of the client (~40ms)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def _send(self, status: int, body: Any = None, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method: str) -> None:
+        url = urlparse(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+
+        status, response, headers = self.server.respond(method, url.path, query, body)
+        self._send(status, response, headers)
+
+
+class FakeJiraServer(ThreadingHTTPServer):
+    '''
+    In-memory fake Jira server with configurable latency, error rate and throttling.
+    '''
+    daemon_threads = True
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 throttle_rate: float = 0.0,
+                 retry_after: float = 1.0,
+                 sprints: int = 120,
+                 seed: Optional[int] = None):
+        '''
+        Initializes a new instance of the FakeJiraServer class.
+
+        Args:
+            host (str): Address to listen on.
+            port (int): Port to listen on, 0 picks a free port.
+            latency (float): Seconds every response is delayed by.
+            jitter (float): Maximum random seconds added to the latency.
+            error_rate (float): Share of the requests answered with a 500 error (0 to 1).
+            throttle_rate (float): Share of the requests answered with a 429 error (0 to 1).
+            retry_after (float): Seconds of the Retry-After header of the throttled requests.
+            sprints (int): Number of active sprints of every Scrum board ('SPRINT-0', 'SPRINT-1', ...).
+            seed (Optional[int]): Seed of the random errors and jitter, for reproducible runs.
+        '''
+        super().__init__((host, port), FakeJiraHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.sprints = [{'id': 100 + index, 'name': f'SPRINT-{index}', 'state': 'active'} for index in range(sprints)]
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.reset()
+
+    @property
+    def url(self) -> str:
+        '''
+        The base URL of the server (the 'jira_url' of the client).
+        '''
+        return f'http://{self.server_address[0]}:{self.server_address[1]}'
+
+    def start(self) -> 'FakeJiraServer':
+        '''
+        Serve the requests in a background thread.
+        '''
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        '''
+        Stop serving and close the listening socket.
+        '''
+        self.shutdown()
+        self.server_close()
+
+    def reset(self) -> None:
+        '''
+        Forget the created issues and links, and reset the request statistics.
+        '''
+        with self._lock:
+            self.issues: Dict[str, Dict[str, Any]] = {}
+            self.links: List[Dict[str, Any]] = []
+            self.request_counts: Counter = Counter()
+            self.error_count = 0
+            self.throttle_count = 0
+            self._issue_ids = itertools.count(1)
+
+    def stats(self) -> Dict[str, Any]:
+        '''
+        Return the request statistics since the last reset.
+        '''
+        with self._lock:
+            return {'requests': sum(self.request_counts.values()),
+                    'requests_by_endpoint': dict(self.request_counts),
+                    'errors': self.error_count,
+                    'throttled': self.throttle_count,
+                    'issues': len(self.issues),
+                    'links': len(self.links)}
+
+    def respond(self, method: str, path: str, query: Dict[str, str], body: Any):
+        '''
+        Return the status, body and headers of the response of a request.
+        '''
+        endpoint = endpoint_name(method, path)
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        with self._lock:
+            self.request_counts[endpoint] += 1
+            failure = None
+            if not path.endswith('/myself'):
+                draw = self._random.random()
+                if draw < self.throttle_rate:
+                    failure = 'throttle'
+                    self.throttle_count += 1
+                elif draw < self.throttle_rate + self.error_rate:
+                    failure = 'error'
+                    self.error_count += 1
+        if delay:
+            time.sleep(delay)
+        if failure == 'throttle':
+            return 429, {'errorMessages': ['Rate limit exceeded']}, {'Retry-After': str(self.retry_after)}
+        if failure == 'error':
+            return 500, {'errorMessages': ['Internal server error']}, None
+
+        if path.startswith(AGILE_PATH):
+            return self._respond_agile(path[len(AGILE_PATH):], query)
+        if path.startswith(API_PATH):
+            return self._respond_api(method, path[len(API_PATH):], query, body)
+        return 404, {'errorMessages': [f'Unknown path: {path}']}, None
+
+    def _respond_api(self, method: str, path: str, query: Dict[str, str], body: Any):
+        if path == '/myself':
+            return 200, {'name': 'benchmark'}, None
+        if path == '/user':
+            return 200, {'name': query.get('username')}, None
+        if path == '/project':
+            return 200, [{'id': '10000', 'key': 'BENCH'}], None
+        match = re.fullmatch(r'/project/([^/]+)(/components|/versions)?', path)
+        if match:
+            return 200, [] if match.group(2) else {'id': '10000', 'key': match.group(1)}, None
+        if path == '/search':
+            return 200, self._search(body or {}), None
+        if path == '/issue' and method == 'POST':
+            return 201, self._create_issue(body['fields']), None
+        if path == '/issue/bulk' and method == 'POST':
+            return 201, {'issues': [self._create_issue(update['fields']) for update in body['issueUpdates']],
+                         'errors': []}, None
+        match = re.fullmatch(r'/issue/([^/]+)', path)
+        if match:
+            with self._lock:
+                issue = self.issues.get(match.group(1))
+                if issue is None:
+                    return 404, {'errorMessages': ['Issue does not exist']}, None
+                if method == 'PUT':
+                    issue.update(body.get('fields') or {})
+                    return 204, None, None
+                return 200, {'key': match.group(1), 'fields': issue}, None
+        if path == '/issueLink' and method == 'POST':
+            with self._lock:
+                self.links.append(body)
+            return 201, None, None
+        return 404, {'errorMessages': [f'Unknown path: {path}']}, None
+
+    def _respond_agile(self, path: str, query: Dict[str, str]):
+        if path == '/board':
+            return 200, {'values': [{'id': 1, 'type': 'scrum'}, {'id': 2, 'type': 'kanban'}]}, None
+        if re.fullmatch(r'/board/\d+/sprint', path):
+            start_at = int(query.get('startAt', 0))
+            max_results = min(int(query.get('maxResults', MAX_SPRINT_RESULTS)), MAX_SPRINT_RESULTS)
+            return 200, {'values': self.sprints[start_at:start_at + max_results],
+                         'isLast': start_at + max_results >= len(self.sprints)}, None
+        return 404, {'errorMessages': [f'Unknown path: {path}']}, None
+
+    def _search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        # Only the 'key in (...)' searches of the pre-flight and the summary phrase searches of the
+        # duplicate index are supported
+        jql = body.get('jql', '')
+        phrases = [words(phrase) for phrase in SUMMARY_PHRASE_PATTERN.findall(jql)]
+        with self._lock:
+            if phrases:
+                matches = []
+                for key, fields in self.issues.items():
+                    summary = words(fields.get('summary', ''))
+                    if any(summary[index:index + len(phrase)] == phrase
+                           for phrase in phrases for index in range(len(summary) - len(phrase) + 1)):
+                        matches.append({'key': key, 'fields': {'summary': fields.get('summary'),
+                                                               'issuetype': fields.get('issuetype')}})
+            else:
+                matches = [{'key': key, 'fields': {name: self.issues[key].get(name) for name in body.get('fields', [])}}
+                           for key in re.findall(r'"([^"]+)"', jql) if key in self.issues]
+        start_at = int(body.get('startAt', 0))
+        max_results = int(body.get('maxResults', 50))
+        return {'issues': matches[start_at:start_at + max_results], 'startAt': start_at,
+                'maxResults': max_results, 'total': len(matches)}
+
+    def _create_issue(self, fields: Dict[str, Any]) -> Dict[str, str]:
+        with self._lock:
+            issue_id = next(self._issue_ids)
+            key = f'{fields.get("project", {}).get("key", "BENCH")}-{issue_id}'
+            self.issues[key] = dict(fields)
+        return {'id': str(issue_id), 'key': key}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in of a Jira server.',
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on.')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds every response is delayed by.')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Maximum random seconds added to the latency.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of the requests failed with 500.')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Share of the requests throttled with 429.')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds of the throttled requests.')
+    args = parser.parse_args()
+
+    server = FakeJiraServer(host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+                            error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                            retry_after=args.retry_after)
+    print(f'Fake Jira listening on {server.url} (set it as jira_url, with jira_api_base_url: {API_PATH})')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats(), indent=2))
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
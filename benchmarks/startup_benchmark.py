@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+'''
+startup_benchmark.py
+
+Startup-time benchmark of the jira-issues-creator CLI. It measures, in fresh interpreters:
+
+- The import time of the jira_issues_creator module, and checks that importing it does not
+  load the LLM stack (langchain, chat_handler).
+- The time to first request: from starting the CLI with --issues-file until its first request
+  reaches a local Jira endpoint. The endpoint refuses the credentials, so the CLI stops there.
+
+The benchmark exits with status 1 when a median exceeds its limit or the LLM stack is imported,
+so startup regressions get caught.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs RUNS] [--max-import-seconds SECONDS]
+                                           [--max-first-request-seconds SECONDS]
+'''
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import yaml
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LLM_MODULES = ('chat_handler', 'templates', 'langchain', 'langchain_core', 'langchain_openai', 'langchain_ollama')
+
+IMPORT_CODE = f'''
+import json, sys, time
+start = time.perf_counter()
+import jira_issues_creator
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds,
+                  'llm_modules': [name for name in {LLM_MODULES!r} if name in sys.modules]}}))
+'''
+
+
+def measure_import() -> dict:
+    '''
+    Import the CLI module in a fresh interpreter and return its import time and the LLM modules it loaded.
+    '''
+    output = subprocess.run([sys.executable, '-c', IMPORT_CODE],
+                            cwd=REPO_DIR, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+class FirstRequestHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.first_request_time = self.server.first_request_time or time.monotonic()
+        self.server.first_request.set()
+        self.send_response(401)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+def measure_first_request(config_file: str, issues_file: str, cache_dir: str, server: ThreadingHTTPServer) -> float:
+    '''
+    Start the CLI and return the time until its first request reaches the local endpoint.
+    '''
+    server.first_request = threading.Event()
+    server.first_request_time = None
+    env = {**os.environ, 'XDG_CACHE_HOME': cache_dir}
+    start = time.monotonic()
+    process = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, 'jira_issues_creator.py'),
+                                '--config-file', config_file, '--issues-file', issues_file],
+                               cwd=REPO_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not server.first_request.wait(timeout=60):
+            raise RuntimeError('The CLI did not send any request within 60 seconds')
+        return server.first_request_time - start
+    finally:
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup-time benchmark of the jira-issues-creator CLI.',
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Number of runs of every measure (the median is reported).')
+    parser.add_argument('--max-import-seconds', type=float, default=1.0,
+                        help='Limit of the median import time of the CLI module.')
+    parser.add_argument('--max-first-request-seconds', type=float, default=2.0,
+                        help='Limit of the median time to first request of the CLI.')
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    import_seconds = statistics.median(result['seconds'] for result in imports)
+    llm_modules = sorted({name for result in imports for name in result['llm_modules']})
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FirstRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with tempfile.TemporaryDirectory() as work_dir:
+        with open(os.path.join(REPO_DIR, 'jira_config.yaml'), 'r') as config:
+            jira_config = yaml.safe_load(config)
+        jira_config['jira_url'] = f'http://127.0.0.1:{server.server_address[1]}'
+        jira_config['jira_token'] = 'benchmark'
+        config_file = os.path.join(work_dir, 'jira_config.yaml')
+        with open(config_file, 'w') as config:
+            yaml.safe_dump(jira_config, config)
+
+        first_request_seconds = statistics.median(
+            measure_first_request(config_file, os.path.join(REPO_DIR, 'jira_issues.yaml'), work_dir, server)
+            for _ in range(args.runs))
+    server.shutdown()
+
+    print(f'Import time of jira_issues_creator: {import_seconds:.3f}s (limit {args.max_import_seconds}s)')
+    print(f'Time to first request:              {first_request_seconds:.3f}s '
+          f'(limit {args.max_first_request_seconds}s)')
+
+    failures = []
+    if llm_modules:
+        failures.append(f'importing the CLI loads the LLM stack: {", ".join(llm_modules)}')
+    if import_seconds > args.max_import_seconds:
+        failures.append('the import time exceeds its limit')
+    if first_request_seconds > args.max_first_request_seconds:
+        failures.append('the time to first request exceeds its limit')
+    for failure in failures:
+        print(f'FAILED: {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+'''
+throughput_benchmark.py
+
+End-to-end throughput benchmark of the Jira client against the local fake Jira (fake_jira.py).
+
+Synthetic plans of the requested sizes (epics with stories, story points, sprints and issue links)
+are created with every requested creation mode, and for every run the benchmark reports the created
+issues per second, the number of requests and the p50/p95 request latencies seen by the client.
+Runs that stopped before creating the whole plan (e.g. with --error-rate) show fewer created issues.
+The 'serial' mode is the default behavior of the tool, so every other mode can be compared to it.
+
+Usage:
+    python benchmarks/throughput_benchmark.py [--sizes SIZE [SIZE ...]] [--modes MODE [MODE ...]]
+                                              [--workers WORKERS] [--latency SECONDS] [--jitter SECONDS]
+                                              [--error-rate RATE] [--throttle-rate RATE] [--output FILE]
+'''
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+import yaml
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import jira_handler  # noqa: E402
+from fake_jira import API_PATH, FakeJiraServer  # noqa: E402
+
+PROJECT_KEY = 'BENCH'
+STORIES_PER_EPIC = 49
+
+# Creation settings of every mode, on top of the 'jira_creation' defaults
+MODES = {
+    'serial': {},
+    'bulk': {'bulk_create': True},
+    'workers': {'max_workers': None},
+    'workers-deferred': {'max_workers': None, 'defer_updates': True},
+    'bulk-deferred': {'bulk_create': True, 'defer_updates': True},
+}
+
+
+def synthetic_plan(nodes: int) -> Dict[str, Any]:
+    '''
+    Return a plan of `nodes` issues: epics of up to STORIES_PER_EPIC stories. Every story has story
+    points (a post-creation update), every 5th story a sprint and every 10th story a link to the
+    previous story of its epic.
+    '''
+    epics: List[Dict[str, Any]] = []
+    created = 0
+    while created < nodes:
+        epic_number = len(epics) + 1
+        stories = []
+        for story_number in range(1, min(STORIES_PER_EPIC, nodes - created - 1) + 1):
+            story = {'summary': f'Story {epic_number}.{story_number}',
+                     'description': f'Synthetic story {story_number} of epic {epic_number}.',
+                     'issuetype': 'Story',
+                     'storyPoints': story_number % 8 + 1,
+                     'ref': f'story-{epic_number}-{story_number}'}
+            if story_number % 5 == 0:
+                story['sprint'] = f'SPRINT-{story_number % 20}'
+            if story_number % 10 == 0:
+                story['issuelinks'] = [{'outwardIssue': {'ref': f'story-{epic_number}-{story_number - 1}'},
+                                        'type': {'name': 'Blocks'}}]
+            stories.append(story)
+        epics.append({'summary': f'Epic {epic_number}',
+                      'epicName': f'Epic {epic_number}',
+                      'issuetype': 'Epic',
+                      'issues': stories})
+        created += 1 + len(stories)
+    return {'project_key': PROJECT_KEY, 'epics': epics}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    '''
+    Return a percentile of the values (nearest rank), 0 if there are none.
+    '''
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run(server: FakeJiraServer,
+        special_fields: Dict[str, Any],
+        plan: str,
+        nodes: int,
+        mode: str,
+        workers: int,
+        work_dir: str) -> Dict[str, Any]:
+    '''
+    Create a plan with a creation mode and return the measures of the run.
+    '''
+    server.reset()
+    creation_settings = {name: workers if value is None else value for name, value in MODES[mode].items()}
+    creation_settings['journal_file'] = os.path.join(work_dir, f'journal_{mode}_{nodes}.jsonl')
+    jira = jira_handler.Jira(jira_url=server.url,
+                             jira_api_base_url=API_PATH,
+                             jira_token='benchmark',
+                             jira_special_fields=special_fields,
+                             connection_settings={'pool_maxsize': max(10, workers), 'backoff_base': 0.1,
+                                                  'backoff_max': 1},
+                             creation_settings=creation_settings,
+                             cache_settings={'enabled': False})
+
+    # The latency of every request, as seen by the client (including the connection pool waits)
+    latencies: List[float] = []
+    latencies_lock = threading.Lock()
+    send = jira.transport.request
+
+    def timed_request(method, url, **kwargs):
+        start = time.monotonic()
+        try:
+            return send(method, url, **kwargs)
+        finally:
+            with latencies_lock:
+                latencies.append(time.monotonic() - start)
+
+    jira.transport.request = timed_request
+    start = time.monotonic()
+    try:
+        jira.jira_issues_creator(plan)
+    except SystemExit:
+        pass  # Failures are reported below
+    finally:
+        seconds = time.monotonic() - start
+        jira.close()
+
+    server_stats = server.stats()
+    client_stats = jira.transport.stats.as_dict()
+    return {'nodes': nodes,
+            'mode': mode,
+            'seconds': seconds,
+            'issues': server_stats['issues'],
+            'issues_per_second': server_stats['issues'] / seconds if seconds else 0.0,
+            'requests': client_stats['requests'],
+            'retries': client_stats['retries'],
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'failed': len(jira.failed_issues) + len(jira.failed_updates) + len(jira.failed_links),
+            'requests_by_endpoint': server_stats['requests_by_endpoint']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end throughput benchmark of the Jira client.',
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 10000],
+                        help='Number of issues of the synthetic plans.')
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES),
+                        help='Creation modes to benchmark.')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Number of workers of the concurrent modes.')
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help='Seconds every response of the fake Jira is delayed by.')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='Maximum random seconds added to the latency.')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Share of the requests failed with 500 by the fake Jira.')
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help='Share of the requests throttled with 429 by the fake Jira.')
+    parser.add_argument('--output',
+                        help='Write the results to this JSON file, for comparing runs.')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    with open(os.path.join(REPO_DIR, 'jira_config.yaml'), 'r') as config:
+        special_fields = yaml.safe_load(config)['jira_special_fields']
+    server = FakeJiraServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                            throttle_rate=args.throttle_rate, retry_after=0.1, seed=0).start()
+
+    print(f'{"nodes":>6} {"mode":<17} {"seconds":>8} {"created":>8} {"issues/s":>9} {"requests":>9} '
+          f'{"retries":>8} {"p50 ms":>7} {"p95 ms":>7} {"failed":>7}')
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for nodes in args.sizes:
+            plan = yaml.safe_dump(synthetic_plan(nodes), sort_keys=False)
+            for mode in args.modes:
+                result = run(server, special_fields, plan, nodes, mode, args.workers, work_dir)
+                results.append(result)
+                print(f'{nodes:>6} {mode:<17} {result["seconds"]:>8.2f} {result["issues"]:>8} '
+                      f'{result["issues_per_second"]:>9.1f} {result["requests"]:>9} {result["retries"]:>8} '
+                      f'{result["p50_ms"]:>7.1f} {result["p95_ms"]:>7.1f} {result["failed"]:>7}', flush=True)
+    server.stop()
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'settings': vars(args), 'results': results}, output, indent=2)
+    # Only the runs that created the whole plan are compared
+    complete = [result for result in results if result['issues'] == result['nodes'] and result['seconds']]
+    serial = {result['nodes']: result for result in complete if result['mode'] == 'serial'}
+    for result in complete:
+        if result['mode'] != 'serial' and result['nodes'] in serial:
+            print(f'{result["nodes"]:>6} {result["mode"]:<17} '
+                  f'{serial[result["nodes"]]["seconds"] / result["seconds"]:.1f}x faster than serial')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,113 @@
+import time
 from langchain_openai import ChatOpenAI
 from langchain.schema import StrOutputParser
-from templates import pipeline_prompt
+from templates import ticket_prompt
 from langchain_ollama.llms import OllamaLLM
+from response_cache import response_cache_key
+
+
+# How long Ollama keeps the model and the context of the static prompt prefix loaded between generations
+DEFAULT_OLLAMA_KEEP_ALIVE = '30m'
 
 
 class ChatHandler:
-    def __init__(self, model_name, ollama=False):
+    def __init__(self, model_name, ollama=False, response_cache=None, keep_alive=DEFAULT_OLLAMA_KEEP_ALIVE,
+                 run_report=None):
+        self.model_name = model_name
+        self.backend = 'ollama' if ollama else 'openai'
+        # Optional ResponseCache of the generated tickets
+        self.response_cache = response_cache
+        # Time to first token and total time of the last streamed generation
+        self.last_generation_stats = None
+        # Optional RunReport recording every invocation
+        self.run_report = run_report
         if ollama:
             self.model = OllamaLLM(
-                model=model_name
+                model=model_name,
+                keep_alive=keep_alive
             )
         else:
             self.model = ChatOpenAI(
                 model_name=model_name
             )
+        # The chain is built once and reused by every generation
+        self.chain = ticket_prompt | self.model | StrOutputParser()
+
+    def _cache_key(self, prompt_parameters):
+        # The responses are cached by the fully rendered prompt, the model and the backend
+        return response_cache_key(self.backend, self.model_name, ticket_prompt.format(**prompt_parameters))
+
+    def _record(self, operation, start, cached=False, time_to_first_token=None):
+        if self.run_report is not None:
+            self.run_report.record_llm(operation, self.model_name, time.monotonic() - start,
+                                       cached=cached, time_to_first_token=time_to_first_token)
+
+    def invoke_chain(self, prompt_parameters, use_cache=True):
+        # use_cache=False regenerates the ticket, and the new response replaces the cached one
+        start = time.monotonic()
+        cache_key = self._cache_key(prompt_parameters) if self.response_cache is not None else None
+        if cache_key and use_cache:
+            response = self.response_cache.get(cache_key)
+            if response is not None:
+                self._record('invoke', start, cached=True)
+                return response
+
+        response = self.chain.invoke(prompt_parameters)
+        if cache_key:
+            self.response_cache.set(cache_key, response)
+        self._record('invoke', start)
+        return response
+
+    def stream_chain(self, prompt_parameters, use_cache=True):
+        # Yields the ticket as its tokens arrive; a cached response is yielded at once
+        start = time.monotonic()
+        first_token_time = None
+        cache_key = self._cache_key(prompt_parameters) if self.response_cache is not None else None
+        response = self.response_cache.get(cache_key) if cache_key and use_cache else None
+        cached = response is not None
+        if cached:
+            first_token_time = time.monotonic()
+            yield response
+        else:
+            chunks = []
+            for chunk in self.chain.stream(prompt_parameters):
+                if first_token_time is None:
+                    first_token_time = time.monotonic()
+                chunks.append(chunk)
+                yield chunk
+            response = ''.join(chunks)
+            if cache_key:
+                self.response_cache.set(cache_key, response)
+        end = time.monotonic()
+        self.last_generation_stats = {'time_to_first_token': (first_token_time or end) - start,
+                                      'total_time': end - start,
+                                      'cached': cached}
+        self._record('stream', start, cached=cached,
+                     time_to_first_token=self.last_generation_stats['time_to_first_token'])
+
+    def batch_invoke_chain(self, prompts_parameters, max_concurrency=4):
+        start = time.monotonic()
+        responses = [None] * len(prompts_parameters)
+        cache_keys = [None] * len(prompts_parameters)
+        if self.response_cache is not None:
+            cache_keys = [self._cache_key(parameters) for parameters in prompts_parameters]
+            responses = [self.response_cache.get(cache_key) for cache_key in cache_keys]
+
+        # Only the prompts without a cached response are sent to the model
+        missing = [index for index, response in enumerate(responses) if response is None]
+        if missing:
+            # Failed generations are returned as exceptions, so one failed prompt does not stop the batch
+            generated = self.chain.batch([prompts_parameters[index] for index in missing],
+                                         config={'max_concurrency': max_concurrency},
+                                         return_exceptions=True)
+            for index, response in zip(missing, generated):
+                responses[index] = response
+                if cache_keys[index] and not isinstance(response, Exception):
+                    self.response_cache.set(cache_keys[index], response)
+        self._record('batch', start, cached=not missing)
+        return responses
 
-    def invoke_chain(self, prompt_parameters):
-        chain = pipeline_prompt | self.model | StrOutputParser()
-        return chain.invoke(prompt_parameters)
+    def invalidate_cached_response(self, prompt_parameters):
+        # Called for responses that turned out to be unusable, so they are generated again next time
+        if self.response_cache is not None:
+            self.response_cache.invalidate(self._cache_key(prompt_parameters))
@@ -6,7 +6,10 @@ This module provides utility functions for handling configuration files and logg
 
 Functions:
 - load_yaml_file(yaml_file): Safely loads and renders YAML configuration files.
-   Supports Jinja2 variables template.
+   Supports Jinja2 variables template. Loaded files are cached by path and modification time.
+- load_yaml(yaml_content): Safely loads and renders YAML content.
+- render_yaml(yaml_content): The shared loader, which skips Jinja2 for content without template
+   markers and caches the compiled templates.
 - setup_logging(level=logging.INFO): Sets up logging configuration for the application.
 
 Exceptions:
@@ -20,13 +23,46 @@ Dependencies:
 - Python modules: os, logging, datetime, yaml, jinja2
 '''
 
+import atexit
+import copy
 from datetime import datetime
+import hashlib
 import inspect
-from jinja2 import Template, Environment, meta
+from jinja2 import Environment, meta
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 import yaml
 
+# Content without any of these markers is loaded without Jinja2
+TEMPLATE_MARKERS = ('{{', '{%', '{#')
+MAX_CACHED_TEMPLATES = 64
+
+_jinja_environment = Environment()
+_cache_lock = threading.Lock()
+# Compiled templates and whether they have variables, by content hash
+_template_cache = {}
+# Loaded YAML files as ((modification time, size), content), by path
+_file_cache = {}
+# Background listener writing the log records (see setup_logging)
+_queue_listener = None
+
+
+def stop_logging() -> None:
+    '''
+    Write the pending log records and stop the background listener of setup_logging, if any.
+    '''
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+# The pending log records are written before the process exits
+atexit.register(stop_logging)
+
 
 def setup_logging(level=logging.INFO):
     '''
@@ -34,6 +70,9 @@ def setup_logging(level=logging.INFO):
     logging directory specific to the script, configures file and console handlers,
     and sets the desired logging level.
 
+    The file and console handlers run in a background QueueListener: the logging threads only
+    enqueue the records, so the request workers never block on disk or console writes.
+
     Args:
         level (int or str): Logging level to be set. Defaults to logging.INFO.
                             Can be one of:
@@ -47,6 +86,7 @@ def setup_logging(level=logging.INFO):
         OSError: If there's an issue creating the logging directory.
         Exception: Any unexpected exception during logging setup.
     '''
+    global _queue_listener
     try:
         # Get the caller's module name
         caller_module = inspect.stack()[1].filename
@@ -86,11 +126,20 @@ def setup_logging(level=logging.INFO):
         console_handler.setFormatter(formatter)
 
         # Clear any existing handlers to avoid duplicate logs
+        stop_logging()
         logging.root.handlers.clear()
 
-        # Add handlers to the root logger
-        logging.root.addHandler(file_handler)
-        logging.root.addHandler(console_handler)
+        # The records are written by a listener thread, which respects the level of every handler.
+        # Their messages are formatted when they are logged, as the arguments (e.g. request payloads)
+        # can change afterwards, so only the I/O is deferred
+        log_queue = queue.SimpleQueue()
+        _queue_listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler,
+                                                         respect_handler_level=True)
+        _queue_listener.start()
+        logging.root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+        # The httpx library (used by AsyncJira) logs every request at INFO level
+        logging.getLogger('httpx').setLevel(logging.WARNING)
 
         logging.info(f'Logging DEBUG execution logs to: {logging_file}')
 
@@ -133,11 +182,67 @@ def get_config_file_path(config_file='', default_config_file=''):
         return os.path.abspath(expanded_path)
 
 
+def render_yaml(yaml_content):
+    '''
+    Load YAML content, rendering it first as a Jinja2 template when the template has variables.
+    The variables of the template are the top-level values of the YAML content itself.
+
+    Content without template markers is not compiled at all. The compiled templates are cached
+    by the hash of their content.
+
+    Args:
+        yaml_content (str): YAML content to load.
+
+    Returns:
+        dict: Loaded and rendered YAML content.
+
+    Raises:
+        yaml.YAMLError: If there's an error parsing the YAML content.
+    '''
+    if not any(marker in yaml_content for marker in TEMPLATE_MARKERS):
+        return yaml.safe_load(yaml_content)
+
+    template, has_variables = _compile_template(yaml_content)
+    if not has_variables:
+        # Like content without markers, a template without variables is loaded as is
+        return yaml.safe_load(yaml_content)
+
+    # First pass: the YAML values are the template variables
+    initial_load = yaml.safe_load(yaml_content)
+    variables = initial_load if isinstance(initial_load, dict) else {}
+    return yaml.safe_load(template.render(variables))
+
+
+def _compile_template(template_content):
+    '''
+    Return the compiled Jinja2 template of some content and whether it has undeclared variables,
+    from the cache when the same content was already compiled.
+    '''
+    content_hash = hashlib.sha256(template_content.encode('utf-8')).hexdigest()
+    with _cache_lock:
+        if content_hash in _template_cache:
+            return _template_cache[content_hash]
+
+    # The template is parsed once, both for finding its variables and for compiling it
+    parsed_content = _jinja_environment.parse(template_content)
+    compiled = (_jinja_environment.from_string(parsed_content),
+                bool(meta.find_undeclared_variables(parsed_content)))
+    with _cache_lock:
+        if len(_template_cache) >= MAX_CACHED_TEMPLATES:
+            # Evict the oldest template
+            _template_cache.pop(next(iter(_template_cache)))
+        _template_cache[content_hash] = compiled
+    return compiled
+
+
 def load_yaml_file(yaml_file):
     '''
     Load YAML configuration file safely and render Jinja2 templates.
     Supports Jinja2 variables template.
 
+    Loaded files are cached by path, modification time and size, so loading an unchanged file
+    again only returns a copy of the cached content.
+
     Args:
         yaml_file (str): Path to the YAML file to load.
 
@@ -149,41 +254,19 @@ def load_yaml_file(yaml_file):
         yaml.YAMLError: If there's an error loading the YAML file.
         ValueError: If required variables are missing or invalid.
     '''
-
-    def extract_template_variables(template_content):
-        '''
-        Extract the required variables from a Jinja2 template.
-
-        Args:
-            template_content (str): The content of the Jinja2 template.
-
-        Returns:
-            set: A set of variable names required by the template.
-        '''
-        env = Environment()
-        parsed_content = env.parse(template_content)
-        return meta.find_undeclared_variables(parsed_content)
-
     try:
-        with open(yaml_file, 'r') as file:
-            yaml_content = file.read()
-
-        # First pass: Load YAML to extract variables if present
-        initial_load = yaml.safe_load(yaml_content)
-
-        # Check if there are any template variables in the YAML content
-        required_variables = extract_template_variables(yaml_content)
-
-        if required_variables:
-            # Render Jinja2 template with extracted variables if needed
-            template = Template(yaml_content)
-            variables = initial_load if isinstance(initial_load, dict) else {}
-            rendered_content = template.render(variables)
-        else:
-            rendered_content = yaml_content
-
-        # Second pass: Load YAML from rendered content safely
-        loaded_file = yaml.safe_load(rendered_content)
+        file_path = os.path.abspath(yaml_file)
+        file_stat = os.stat(file_path)
+        file_version = (file_stat.st_mtime_ns, file_stat.st_size)
+        with _cache_lock:
+            cached = _file_cache.get(file_path)
+        if cached is None or cached[0] != file_version:
+            with open(file_path, 'r') as file:
+                cached = (file_version, render_yaml(file.read()))
+            with _cache_lock:
+                _file_cache[file_path] = cached
+        # The callers can modify the loaded content, so they get their own copy
+        loaded_file = copy.deepcopy(cached[1])
     except FileNotFoundError as exc:
         logging.error(f'Failed to find the YAML file "{yaml_file}"')
         raise exc
@@ -202,58 +285,23 @@ def load_yaml_file(yaml_file):
 
 def load_yaml(yaml_content):
     '''
-    Load YAML configuration file safely and render Jinja2 templates.
+    Load YAML content safely and render Jinja2 templates.
     Supports Jinja2 variables template.
 
     Args:
-        yaml (str): YAML to load.
+        yaml_content (str): YAML to load.
 
     Returns:
         dict: Loaded and rendered YAML content as a dictionary.
 
     Raises:
-        FileNotFoundError: If the YAML file is not found.
-        yaml.YAMLError: If there's an error loading the YAML file.
+        yaml.YAMLError: If there's an error loading the YAML content.
         ValueError: If required variables are missing or invalid.
     '''
-
-    def extract_template_variables(template_content):
-        '''
-        Extract the required variables from a Jinja2 template.
-
-        Args:
-            template_content (str): The content of the Jinja2 template.
-
-        Returns:
-            set: A set of variable names required by the template.
-        '''
-        env = Environment()
-        parsed_content = env.parse(template_content)
-        return meta.find_undeclared_variables(parsed_content)
-
     try:
-        # First pass: Load YAML to extract variables if present
-        initial_load = yaml.safe_load(yaml_content)
-
-        # Check if there are any template variables in the YAML content
-        required_variables = extract_template_variables(yaml_content)
-
-        if required_variables:
-            # Render Jinja2 template with extracted variables if needed
-            template = Template(yaml_content)
-            variables = initial_load if isinstance(initial_load, dict) else {}
-            rendered_content = template.render(variables)
-        else:
-            rendered_content = yaml_content
-
-        # Second pass: Load YAML from rendered content safely
-        loaded_file = yaml.safe_load(rendered_content)
-    except FileNotFoundError as exc:
-        logging.error(f'Failed to find the YAML file "{yaml_file}"')
-        raise exc
+        loaded_content = render_yaml(yaml_content)
     except yaml.YAMLError as exc:
-        logging.error(
-            f'Failed to load the YAML file "{yaml_file}": {exc}')
+        logging.error(f'Failed to load the YAML content: {exc}')
         raise exc
     except ValueError as exc:
         logging.error(f'Validation error: {exc}')
@@ -261,5 +309,4 @@ def load_yaml(yaml_content):
     except Exception as exc:
         logging.error(f'An unexpected error occurred: {exc}')
         raise exc
-    return loaded_file
-
+    return loaded_content
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+'''
+duplicate_index.py
+
+This module provides the DuplicateIndex class, the lookup of the plan nodes that already exist in Jira.
+
+Before a plan is created, the distinct summaries of its nodes are searched in the project with a few
+JQL searches: every search matches up to DEDUPE_BATCH_SIZE summaries with OR'ed phrase clauses and
+only returns the summary and the issue type of the matches. Jira text searches are fuzzy, so the
+matches are filtered again by their exact summary (case and whitespace insensitive) and issue type,
+and kept in an in-memory index. Every existing issue is assigned to at most one node, in the order of
+the plan (oldest issues first), so nodes with the same summary (e.g. the 'Write tests' sub-task of
+every story) are matched to distinct issues. Creating the plan then looks the nodes up without any request.
+'''
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from issue_plan import iter_plan_nodes
+
+DEDUPE_BATCH_SIZE = 50  # Maximum number of summaries per JQL search
+MAX_SEARCH_RESULTS = 100  # Issues per page of the search results
+# Characters of the text search syntax (and punctuation, which the text index ignores anyway)
+PHRASE_IGNORED_PATTERN = re.compile(r'[^\w\s]+')
+
+
+def normalize_summary(summary: Any) -> str:
+    '''
+    Return the summary an issue is matched by: lower case, with collapsed whitespace.
+    '''
+    return ' '.join(str(summary).split()).lower()
+
+
+def summary_phrase(summary: Any) -> str:
+    '''
+    Return the text search phrase of a summary, without the characters of the text search syntax.
+    '''
+    return ' '.join(PHRASE_IGNORED_PATTERN.sub(' ', str(summary)).split())
+
+
+class DuplicateIndex:
+    def __init__(self, jira: Any, project_key: str):
+        '''
+        Initializes a new instance of the DuplicateIndex class.
+
+        Args:
+            jira (Jira): The Jira instance used for the searches.
+            project_key (str): The key of the project where the plan will be created.
+        '''
+        self.jira = jira
+        self.project_key = project_key
+        # Issue type and key of the existing issues by normalized summary, oldest first
+        self.existing_issues: Dict[str, List[Tuple[str, str]]] = {}
+        # The key of the existing issue of every matched plan node, by node identity
+        self.node_keys: Dict[int, str] = {}
+        self.searches = 0
+
+    def build(self, plan: Dict[str, Any], mapped_keys: Optional[Dict[int, str]] = None) -> int:
+        '''
+        Search the summaries of the nodes of a plan and index the existing issues.
+
+        Args:
+            plan (Dict[str, Any]): The loaded issues plan.
+            mapped_keys (Optional[Dict[int, str]], optional): The keys of the nodes that already have an
+                issue, by node identity. These nodes are not searched, and their issues are not matched
+                to other nodes. Defaults to None.
+
+        Returns:
+            int: The number of searched nodes of the plan that already exist.
+        '''
+        mapped_keys = mapped_keys or {}
+        nodes = [node for node, _, _ in iter_plan_nodes(plan) if node.get('summary') and id(node) not in mapped_keys]
+        phrases: Dict[str, str] = {}
+        for node in nodes:
+            phrase = summary_phrase(node['summary'])
+            if phrase:
+                phrases.setdefault(normalize_summary(node['summary']), phrase)
+
+        phrase_list = sorted(set(phrases.values()))
+        for start in range(0, len(phrase_list), DEDUPE_BATCH_SIZE):
+            self._search(phrase_list[start:start + DEDUPE_BATCH_SIZE])
+
+        assigned: Set[str] = {str(issue_key).upper() for issue_key in mapped_keys.values()}
+        for node in nodes:
+            issue_key = self._assign(node, assigned)
+            if issue_key:
+                self.node_keys[id(node)] = issue_key
+                assigned.add(issue_key.upper())
+        if nodes:
+            logging.info(f'{len(self.node_keys)} of the {len(nodes)} searched issues of the plan already exist '
+                         f'in the "{self.project_key}" project ({self.searches} searches)')
+        return len(self.node_keys)
+
+    def match(self, jira_issue: Dict[str, Any]) -> Optional[str]:
+        '''
+        Return the key of the existing issue matched to a node of the indexed plan, or None.
+        '''
+        return self.node_keys.get(id(jira_issue))
+
+    def _assign(self, node: Dict[str, Any], assigned: Set[str]) -> Optional[str]:
+        '''
+        Return the oldest unassigned existing issue with the summary and the issue type of a node
+        (any issue type if the node has none), or None.
+        '''
+        summary = normalize_summary(node['summary'])
+        issue_type = str(node.get('issuetype') or '').lower()
+        for existing_type, issue_key in self.existing_issues.get(summary, []):
+            if issue_key.upper() not in assigned and (not issue_type or existing_type == issue_type):
+                return issue_key
+        return None
+
+    def _search(self, phrases: List[str]) -> None:
+        '''
+        Index the issues of the project that match any of the summary phrases, page by page.
+        '''
+        summary_clauses = ' OR '.join(f'summary ~ "\\"{phrase}\\""' for phrase in phrases)
+        jql = f'project = "{self.project_key}" AND ({summary_clauses}) ORDER BY created ASC'
+        start_at = 0
+        while True:
+            response = self.jira.send_request(api_type='search', method='post', jira_request_data={
+                'jql': jql,
+                'fields': ['summary', 'issuetype'],
+                'startAt': start_at,
+                'maxResults': MAX_SEARCH_RESULTS,
+            })
+            self.searches += 1
+            issues = response.get('issues', [])
+            for issue in issues:
+                self._add(issue)
+            start_at += len(issues)
+            if not issues or start_at >= response.get('total', 0):
+                return
+
+    def _add(self, issue: Dict[str, Any]) -> None:
+        fields = issue.get('fields') or {}
+        summary = normalize_summary(fields.get('summary') or '')
+        issue_type = str((fields.get('issuetype') or {}).get('name', '')).lower()
+        existing_issues = self.existing_issues.setdefault(summary, [])
+        if (issue_type, issue['key']) not in existing_issues:
+            existing_issues.append((issue_type, issue['key']))
+        logging.debug('Existing issue %s "%s"', issue['key'], fields.get('summary'))
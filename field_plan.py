@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+'''
+field_plan.py
+
+This module provides the FieldPlan class, the compiled form of the 'jira_special_fields' configuration.
+
+The special fields configuration is compiled once, when a Jira client is created, into a
+field name -> transformer dispatch table. Building the payload of an issue is then a single
+dictionary lookup per field, and the creation and post-creation update payloads of an issue
+are produced together in a single pass over its fields.
+'''
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Fields of the plan that are not Jira fields: the child issues, the issue links (created by the
+# link stage), the type of the link to the parent issue, the name of the issue within the plan and
+# the key of the existing issue of the node
+PLAN_ONLY_FIELDS = frozenset(['issues', 'issuelinks', 'linkType', 'ref', 'key'])
+
+# A transformer receives the field value and the sprint resolver of the project
+Transformer = Callable[[Any, Callable[[Any], Optional[str]]], Any]
+
+
+def format_value(field_value: Any, key_type: str) -> Any:
+    '''
+    Format a field value as {key_type: value}, or a list of them for a dictionary of values.
+    '''
+    if isinstance(field_value, dict):
+        return [{key_type: val} for val in field_value.values()]
+    return {key_type: field_value}
+
+
+def _passthrough(field_value: Any, resolve_sprint: Callable[[Any], Optional[str]]) -> Any:
+    return field_value
+
+
+def _resolve_sprint(field_value: Any, resolve_sprint: Callable[[Any], Optional[str]]) -> Any:
+    return resolve_sprint(field_value)
+
+
+def _formatter(key_type: str, as_array: bool = False) -> Transformer:
+    def transform(field_value: Any, resolve_sprint: Callable[[Any], Optional[str]]) -> Any:
+        value = format_value(field_value, key_type)
+        if as_array and not isinstance(value, list):
+            value = [value]
+        return value
+    return transform
+
+
+class FieldPlan:
+    def __init__(self, jira_special_fields: Dict[str, Any]):
+        '''
+        Compile the special fields configuration into a dispatch table.
+
+        Args:
+            jira_special_fields (Dict[str, Any]): The 'jira_special_fields' section of the configuration.
+        '''
+        custom_field_mapping = jira_special_fields.get('custom_field_mapping', {})
+        array_fields = set(jira_special_fields.get('array_format_fields', []))
+        self.post_creation_fields = frozenset(jira_special_fields.get('post_creation_update_fields', []))
+
+        # Field name -> (Jira field name, transformer). The entries are added from the lowest to
+        # the highest precedence, so a field configured in multiple sections keeps its first match
+        # of: key_format_fields, name_format_fields, custom_field_mapping, then the custom
+        # 'key_format_fields' and 'name_format_fields' mappings
+        self.transformers: Dict[str, Tuple[str, Transformer]] = {}
+        for key_type in ('name', 'key'):
+            for field_name, custom_field_name in custom_field_mapping.get(f'{key_type}_format_fields', {}).items():
+                self.transformers[field_name] = (custom_field_name, _formatter(key_type))
+        for field_name, custom_field_name in custom_field_mapping.items():
+            if field_name in ('key_format_fields', 'name_format_fields'):
+                continue
+            transformer = _resolve_sprint if field_name == 'sprint' else _passthrough
+            self.transformers[field_name] = (custom_field_name, transformer)
+        for key_type in ('name', 'key'):
+            for field_name in jira_special_fields.get(f'{key_type}_format_fields', []):
+                self.transformers[field_name] = (field_name, _formatter(key_type, field_name in array_fields))
+
+    def transform(self,
+                  field_name: str,
+                  field_value: Any,
+                  resolve_sprint: Callable[[Any], Optional[str]]) -> Tuple[str, Any]:
+        '''
+        Return the Jira field name and value of a plan field.
+        '''
+        jira_field_name, transformer = self.transformers.get(field_name, (field_name, _passthrough))
+        return jira_field_name, transformer(field_value, resolve_sprint)
+
+    def split(self,
+              fields: Dict[str, Any],
+              resolve_sprint: Callable[[Any], Optional[str]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        '''
+        Build the Jira fields of an issue in a single pass, split between the fields set at creation
+        time and the post-creation fields, which Jira does not accept in the creation request.
+
+        Args:
+            fields (Dict[str, Any]): The fields of the plan issue.
+            resolve_sprint (Callable[[Any], Optional[str]]): Function returning the ID of a sprint name.
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, Any]]: The creation fields and the post-creation update fields.
+        '''
+        create_fields: Dict[str, Any] = {}
+        update_fields: Dict[str, Any] = {}
+        for field_name, field_value in fields.items():
+            if field_name in PLAN_ONLY_FIELDS:
+                continue
+            jira_field_name, value = self.transform(field_name, field_value, resolve_sprint)
+            if field_name in self.post_creation_fields:
+                update_fields[jira_field_name] = value
+            else:
+                create_fields[jira_field_name] = value
+        return create_fields, update_fields
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+'''
+issue_plan.py
+
+This module provides helpers for walking a loaded issues plan (the epics/issues YAML structure).
+
+A plan is a dictionary with a 'project_key' and optional 'epics' and 'issues' lists. Every
+epic and issue can have child issues in its own 'issues' list.
+'''
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def iter_plan_nodes(plan: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], int, Optional[Dict[str, Any]]]]:
+    '''
+    Iterate over all the epics and issues of a plan, depth-first in creation order.
+
+    Args:
+        plan (Dict[str, Any]): The loaded issues plan.
+
+    Yields:
+        Tuple[Dict[str, Any], int, Optional[Dict[str, Any]]]: Every node with its depth
+            (0 for the epics and the top-level issues) and its parent node (None at depth 0).
+    '''
+    for root_list in ('epics', 'issues'):
+        yield from _iter_nodes(plan.get(root_list) or [], 0, None)
+
+
+def _iter_nodes(nodes: List[Dict[str, Any]],
+                depth: int,
+                parent: Optional[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], int, Optional[Dict[str, Any]]]]:
+    for node in nodes:
+        yield node, depth, parent
+        yield from _iter_nodes(node.get('issues') or [], depth + 1, node)
+
+
+def field_values(value: Any) -> List[Any]:
+    '''
+    Return the individual values of a plan field, which can be a single value,
+    a list of values or a dictionary of values (see field_plan.format_value).
+    '''
+    if isinstance(value, dict):
+        return list(value.values())
+    if isinstance(value, list):
+        return value
+    return [value]
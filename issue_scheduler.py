@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+'''
+issue_scheduler.py
+
+This module provides the IssueScheduler class for creating a tree of Jira epics and issues concurrently.
+
+The only ordering rule between the issues of a plan is that a child issue needs the key of
+its epic (epicLink) or of its parent issue ('parent' field or parent link). The scheduler treats
+the epics/issues tree as a dependency graph: every node is submitted to a bounded worker pool
+as soon as the key it depends on exists. For example, all the epics are created at once and the
+issues of each epic start as soon as that epic is created.
+'''
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# A node of the dependency graph: the function creating it and its arguments
+Task = Tuple[Callable[..., List['Task']], Tuple[Any, ...]]
+
+
+class IssueScheduler:
+    def __init__(self, jira: Any, jira_project: str, max_workers: int):
+        '''
+        Initializes a new instance of the IssueScheduler class.
+
+        Args:
+            jira (Jira): The Jira instance used for creating the issues.
+            jira_project (str): The key of the Jira project where the issues will be created.
+            max_workers (int): Maximum number of nodes created concurrently.
+        '''
+        self.jira = jira
+        self.jira_project = jira_project
+        self.max_workers = max_workers
+
+    def run(self,
+            epics: Optional[List[Dict[str, Any]]] = None,
+            issues: Optional[List[Dict[str, Any]]] = None,
+            epic_key: Optional[str] = None,
+            parent_key: Optional[str] = None) -> None:
+        '''
+        Create the epics and issues trees and wait for all of them to be created.
+
+        Args:
+            epics (Optional[List[Dict[str, Any]]]): Epics to create, with their child issues.
+            issues (Optional[List[Dict[str, Any]]]): Issues to create, with their child issues.
+            epic_key (Optional[str], optional): The key of the epic of `issues`. Defaults to None.
+            parent_key (Optional[str], optional): The key of the parent issue of `issues`. Defaults to None.
+
+        Raises:
+            Exception: The first error raised while creating a node. Nodes that are already
+                running are completed, but no new node is started after an error.
+        '''
+        tasks: List[Task] = []
+        if epics:
+            tasks.extend(self._sibling_tasks(self._create_epics, epics))
+        if issues:
+            tasks.extend(self._sibling_tasks(self._create_issues, issues, epic_key, parent_key))
+
+        errors: List[Exception] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix='jira-worker') as executor:
+            running: Dict[Future, Task] = {
+                executor.submit(function, *args): (function, args) for function, args in tasks}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                    try:
+                        ready_tasks = future.result()
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    if errors:
+                        # Stop scheduling new nodes and let the running nodes finish
+                        continue
+                    for function, args in ready_tasks:
+                        running[executor.submit(function, *args)] = (function, args)
+
+        if errors:
+            if len(errors) > 1:
+                logging.error(f'{len(errors)} nodes failed, raising the first error')
+            raise errors[0]
+
+    def _sibling_tasks(self,
+                       function: Callable[..., List[Task]],
+                       siblings: List[Dict[str, Any]],
+                       *args: Any) -> List[Task]:
+        '''
+        Split siblings into graph nodes: one node for all the siblings in bulk creation mode,
+        otherwise one node for each sibling.
+        '''
+        if self.jira.bulk_create:
+            return [(function, (siblings, *args))]
+        return [(function, ([sibling], *args)) for sibling in siblings]
+
+    def _create_epics(self, epics: List[Dict[str, Any]]) -> List[Task]:
+        '''
+        Create epics and return the nodes of their child issues.
+        '''
+        for epic in epics:
+            logging.info(f'Creating a Jira Epic \"{epic["epicName"]}\"')
+        epic_keys = self._create(epics)
+
+        ready_tasks: List[Task] = []
+        for epic, epic_key in zip(epics, epic_keys):
+            if epic_key is None:
+                continue
+            logging.info(
+                f'Epic created successfully: {self.jira.jira_url}/browse/{epic_key}')
+            if 'issues' in epic:
+                ready_tasks.extend(self._sibling_tasks(
+                    self._create_issues, epic['issues'], epic_key, None))
+        return ready_tasks
+
+    def _create_issues(self,
+                       issues: List[Dict[str, Any]],
+                       epic_key: Optional[str],
+                       parent_key: Optional[str]) -> List[Task]:
+        '''
+        Create sibling issues and return the nodes of their child issues.
+        '''
+        for issue in issues:
+            logging.info(
+                f'Creating a Jira Issue type {issue["issuetype"]}: \"{issue["summary"]}\"')
+        issue_keys = self._create(issues, epic_key, parent_key)
+
+        ready_tasks: List[Task] = []
+        for issue, issue_key in zip(issues, issue_keys):
+            if issue_key is None:
+                # The issue failed, so its child issues are skipped
+                continue
+            self.jira._finalize_created_issue(issue, issue_key, epic_key, parent_key)
+            if 'issues' in issue:
+                ready_tasks.extend(self._sibling_tasks(
+                    self._create_issues, issue['issues'], epic_key, issue_key))
+        return ready_tasks
+
+    def _create(self,
+                issues: List[Dict[str, Any]],
+                epic_key: Optional[str] = None,
+                parent_key: Optional[str] = None) -> List[Optional[str]]:
+        '''
+        Create sibling issues and return their keys (None for issues rejected in bulk mode).
+        '''
+        if self.jira.bulk_create:
+            return self.jira.create_jira_issues_in_bulk(jira_project=self.jira_project,
+                                                        jira_issues=issues,
+                                                        epic_key=epic_key,
+                                                        parent_key=parent_key)
+        return [self.jira.create_new_jira_issue(jira_project=self.jira_project,
+                                                jira_issue=issue,
+                                                epic_key=epic_key,
+                                                parent_key=parent_key)['key']
+                for issue in issues]
@@ -9,30 +9,204 @@ It requires the "requests" library and provides functionalities to interact with
 Jira by creating issues, epics, linking issues, and validating credentials.
 '''
 
-import json
+import abc
+import hashlib
 import logging
+import os
+import threading
+import time
 import requests
-from typing import Optional, Dict, List, Any
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Iterable, List, Any, Callable, Set, Tuple
 from config_utils import load_yaml_file, get_config_file_path, load_yaml
+from issue_scheduler import IssueScheduler
+from sprint_resolver import SprintResolver, normalize_sprint_name
+from metadata_cache import MetadataCache, DEFAULT_CACHE_SETTINGS, APP_CACHE_DIR
+from rate_limiter import TokenBucket, RetryPolicy, RequestStats
+from duplicate_index import DuplicateIndex
+from plan_preflight import PlanPreflight
+from plan_sync import PlanSync
+from issue_plan import iter_plan_nodes
+from update_queue import UpdateQueue
+from link_stage import LinkStage, link_target
+from field_plan import FieldPlan
+from run_journal import RunJournal, plan_node_ids, plan_node_paths
+from plan_stream import iter_plan_documents
+from run_report import RunReport
 import sys
 
 
 MAX_RESPONSE_LOG_SIZE = 2500  # Set a threshold for response DEBUG log size
 
+# Function called after every HTTP request: (method, url, status, response size, seconds)
+RequestHook = Callable[[str, str, Optional[int], int, float], None]
+
+# Defaults for the 'jira_connection' section of the Jira configuration file
+DEFAULT_CONNECTION_SETTINGS = {
+    'pool_connections': 10,  # Number of distinct hosts to keep connection pools for
+    'pool_maxsize': 10,  # Maximum number of keep-alive connections per host
+    'connect_timeout': 10,  # Seconds to wait for a TCP/TLS connection
+    'read_timeout': 60,  # Seconds to wait for the server response
+    'max_retries': 5,  # Maximum number of retries of a throttled or failed request
+    'backoff_base': 1,  # Seconds before the first retry, doubled on every retry (with jitter)
+    'backoff_max': 60,  # Maximum seconds between retries
+    'rate_limit': 0,  # Maximum requests per second to the Jira host, shared by all processes (0 disables)
+    'rate_limit_burst': 10,  # Number of requests that can be sent at once before the rate limit applies
+}
+
+# Defaults for the 'jira_creation' section of the Jira configuration file
+DEFAULT_CREATION_SETTINGS = {
+    'bulk_create': False,  # Create sibling issues through the '/issue/bulk' endpoint
+    'bulk_size': 50,  # Maximum number of issues per bulk request (Jira's limit is 50)
+    'max_workers': 1,  # Number of issues created concurrently, 1 keeps the serial creation order
+    'preflight': True,  # Resolve the sprints, users, components, versions and linked issues before creating
+    'defer_updates': False,  # Queue the post-creation updates and send them after the creation stage
+    'stage_workers': 8,  # Number of concurrent requests of the deferred stages
+    'journal': True,  # Record the completed steps of every run, so a failed run can be resumed
+    'journal_file': None,  # Path of the run journal, defaults to a file per Jira URL in the cache directory
+    'dedupe': False,  # Reuse the existing issues with the summary and issue type of a plan node instead of creating them
+}
+
+
+class JiraTransport:
+    '''
+    Pooled, keep-alive HTTP transport used for all the requests of a Jira instance.
+
+    Every thread gets its own requests.Session (sessions are not guaranteed to be
+    thread-safe), but all the sessions share a single HTTPAdapter, so connections
+    are reused across threads from one bounded pool.
+
+    Throttled and transiently failed requests are retried according to a RetryPolicy,
+    and an optional TokenBucket keeps the request rate under the server quota.
+    '''
+
+    def __init__(self,
+                 headers: Dict[str, str],
+                 pool_connections: int = DEFAULT_CONNECTION_SETTINGS['pool_connections'],
+                 pool_maxsize: int = DEFAULT_CONNECTION_SETTINGS['pool_maxsize'],
+                 connect_timeout: float = DEFAULT_CONNECTION_SETTINGS['connect_timeout'],
+                 read_timeout: float = DEFAULT_CONNECTION_SETTINGS['read_timeout'],
+                 retry_policy: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 request_hooks: Optional[List[RequestHook]] = None):
+        '''
+        Initializes a new instance of the JiraTransport class.
+
+        Args:
+            headers (Dict[str, str]): Headers sent with every request.
+            pool_connections (int): Number of distinct hosts to keep connection pools for.
+            pool_maxsize (int): Maximum number of keep-alive connections per host.
+                Callers beyond this number wait for a free connection.
+            connect_timeout (float): Seconds to wait for establishing a connection.
+            read_timeout (float): Seconds to wait for the server response.
+            retry_policy (Optional[RetryPolicy]): Policy of retrying failed requests. Defaults to no retries.
+            rate_limiter (Optional[TokenBucket]): Limiter taking a token before every request. Defaults to none.
+            request_hooks (Optional[List[RequestHook]]): Functions called after every HTTP request
+                (including retries) with its method, URL, status (None without a response),
+                response size in bytes and duration in seconds.
+        '''
+        self.headers = headers
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=0)
+        self.rate_limiter = rate_limiter
+        self.stats = RequestStats()
+        self.request_hooks = list(request_hooks or [])
+        self.timeout = (connect_timeout, read_timeout)
+        self._adapter = HTTPAdapter(pool_connections=pool_connections,
+                                    pool_maxsize=pool_maxsize,
+                                    pool_block=True)
+        self._local = threading.local()
+
+    def _get_session(self) -> requests.Session:
+        '''
+        Return the requests.Session of the calling thread, creating it on first use.
+        '''
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            self._local.session = session
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        '''
+        Send an HTTP request over the pooled connections, retrying it when the retry policy allows.
+
+        Args:
+            method (str): HTTP method ('get', 'post', 'put', ...).
+            url (str): Full URL of the request.
+            **kwargs: Extra arguments passed to requests.Session.request (json, params, ...).
+
+        Returns:
+            requests.Response: The response of the request (the last one if it was retried).
+
+        Raises:
+            requests.exceptions.RequestException: If the request failed without a response
+                and it cannot be retried anymore.
+        '''
+        kwargs.setdefault('timeout', self.timeout)
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.stats.add(rate_limit_seconds=self.rate_limiter.acquire())
+            self.stats.add(requests=1)
+            start = time.monotonic()
+            try:
+                response = self._get_session().request(method.upper(), url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self._call_hooks(method, url, None, 0, time.monotonic() - start)
+                if attempt >= self.retry_policy.max_retries or not self.retry_policy.should_retry_error(method, e):
+                    raise e
+                delay = self.retry_policy.get_delay(attempt)
+                reason = str(e)
+            else:
+                self._call_hooks(method, url, response.status_code, len(response.content), time.monotonic() - start)
+                retry_after = response.headers.get('Retry-After')
+                if (attempt >= self.retry_policy.max_retries
+                        or not self.retry_policy.should_retry_status(method, response.status_code, retry_after)):
+                    return response
+                delay = self.retry_policy.get_delay(attempt, retry_after)
+                reason = f'status code {response.status_code}'
+                response.close()  # Release the connection back to the pool
+
+            attempt += 1
+            logging.warning(f'Jira {method.upper()} request to "{url}" failed ({reason}), '
+                            f'retry {attempt}/{self.retry_policy.max_retries} in {delay:.1f} seconds')
+            self.stats.add(retries=1, throttled_seconds=delay)
+            time.sleep(delay)
+
+    def _call_hooks(self, method: str, url: str, status: Optional[int], size: int, seconds: float) -> None:
+        '''
+        Call the request hooks. A failing hook is logged without failing the request.
+        '''
+        for hook in self.request_hooks:
+            try:
+                hook(method, url, status, size, seconds)
+            except Exception as e:
+                logging.debug(f'Request hook {hook!r} failed: {e}')
+
+    def close(self) -> None:
+        '''
+        Close all the pooled connections.
+        '''
+        self._adapter.close()
+
+
+class JiraBase(abc.ABC):
+    '''
+    Configuration and issue payload building shared by the Jira and AsyncJira clients.
+    '''
 
-class Jira:
     def __init__(self, jira_url: str, jira_api_base_url: str, jira_token: str, jira_special_fields: Dict[str, Any]):
         '''
-        Initializes a new instance of the Jira class.
+        Initializes the shared configuration of a Jira client.
 
         Args:
             jira_url (str): The base URL of the Jira instance.
             jira_api_base_url (str): The base URL for Jira API requests.
             jira_token (str): The API token for authenticating Jira requests.
             jira_special_fields (Dict[str, Any]): Configuration dictionary containing fields related to Jira API interactions.
-
-        Raises:
-            RuntimeError: If the Jira URL or token validation fails.
         '''
         self.jira_url = jira_url
         self.jira_api_base_url = (
@@ -54,9 +228,218 @@ class Jira:
             'post_creation_update_fields', [])
         self.array_format_fields = jira_special_fields.get(
             'array_format_fields', [])
+        # The special fields compiled into a field -> transformer dispatch table
+        self.field_plan = FieldPlan(jira_special_fields)
+
+    @abc.abstractmethod
+    def _resolve_sprint_id(self, jira_project: str, sprint_name: str) -> Optional[str]:
+        '''
+        Return the ID of a sprint of the project by its name, or None if it is not found.
+        '''
+
+    def _build_issue_payloads(self,
+                              jira_project: str,
+                              jira_issue: Dict[str, Any],
+                              epic_key: Optional[str] = None,
+                              parent_key: Optional[str] = None,
+                              resolve_sprint: Optional[Callable[[Any], Optional[str]]] = None
+                              ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        '''
+        Build the data of the creation request and of the post-creation update request of an issue,
+        in a single pass over its fields.
+
+        Args:
+            jira_project (str): The key of the Jira project where the issue will be created.
+            jira_issue (Dict[str, Any]): A dictionary containing the fields and values for the new Jira issue.
+            epic_key (Optional[str], optional): The key of the epic to link the new issue to. Defaults to None.
+            parent_key (Optional[str], optional): The key of the parent issue for sub-tasks. Defaults to None.
+            resolve_sprint (Optional[Callable[[Any], Optional[str]]], optional): Function returning the ID
+                of a sprint name. Defaults to _resolve_sprint_id in the project.
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, Any]]: The data of the issue creation and of the post-creation update.
+            The update data has no fields when the issue has no post-creation fields.
+        '''
+        # The post-creation fields are not allowed to be set during the issue creation time
+        if resolve_sprint is None:
+            def resolve_sprint(sprint_name: Any) -> Optional[str]:
+                return self._resolve_sprint_id(jira_project, sprint_name)
+        create_fields, update_fields = self.field_plan.split(jira_issue, resolve_sprint)
+        # Setting the issue's project
+        create_fields['project'] = {'key': jira_project}
+
+        # Set a link to epic if epic_key is provided and issuetype is not Sub-task
+        if epic_key and jira_issue.get('issuetype') != 'Sub-task':
+            create_fields[self.custom_field_mapping['epicLink']] = epic_key
+        # Handle sub-tasks by linking them to parent_key if provided
+        elif jira_issue.get('issuetype') == 'Sub-task' and parent_key:
+            create_fields['parent'] = {'key': parent_key}
+
+        return {'fields': create_fields}, {'fields': update_fields}
+
+
+class Jira(JiraBase):
+    def __init__(self,
+                 jira_url: str,
+                 jira_api_base_url: str,
+                 jira_token: str,
+                 jira_special_fields: Dict[str, Any],
+                 connection_settings: Optional[Dict[str, Any]] = None,
+                 creation_settings: Optional[Dict[str, Any]] = None,
+                 cache_settings: Optional[Dict[str, Any]] = None,
+                 run_report: Optional[RunReport] = None):
+        '''
+        Initializes a new instance of the Jira class.
+
+        Args:
+            jira_url (str): The base URL of the Jira instance.
+            jira_api_base_url (str): The base URL for Jira API requests.
+            jira_token (str): The API token for authenticating Jira requests.
+            jira_special_fields (Dict[str, Any]): Configuration dictionary containing fields related to Jira API interactions.
+            connection_settings (Optional[Dict[str, Any]]): The 'jira_connection' configuration section
+                (pool sizes and timeouts). Missing values fall back to DEFAULT_CONNECTION_SETTINGS.
+            creation_settings (Optional[Dict[str, Any]]): The 'jira_creation' configuration section
+                (creation modes). Missing values fall back to DEFAULT_CREATION_SETTINGS.
+            cache_settings (Optional[Dict[str, Any]]): The 'jira_cache' configuration section
+                (metadata cache file and TTLs). Missing values fall back to DEFAULT_CACHE_SETTINGS.
+            run_report (Optional[RunReport]): The instrumentation of the run, recording every request
+                and created issue. Defaults to a new RunReport.
+
+        Raises:
+            RuntimeError: If the Jira URL or token validation fails.
+        '''
+        super().__init__(jira_url, jira_api_base_url, jira_token, jira_special_fields)
+
+        self.run_report = run_report or RunReport()
+        settings = {**DEFAULT_CONNECTION_SETTINGS, **(connection_settings or {})}
+        rate_limiter = None
+        if settings['rate_limit']:
+            # The state file is keyed by the Jira URL, so every process using this Jira shares the bucket
+            url_hash = hashlib.sha256(self.jira_url.encode()).hexdigest()[:16]
+            rate_limiter = TokenBucket(rate=settings['rate_limit'],
+                                       capacity=settings['rate_limit_burst'],
+                                       state_file=os.path.join(APP_CACHE_DIR, f'rate_limit_{url_hash}.json'))
+        self.transport = JiraTransport(headers=self.headers,
+                                       pool_connections=settings['pool_connections'],
+                                       pool_maxsize=settings['pool_maxsize'],
+                                       connect_timeout=settings['connect_timeout'],
+                                       read_timeout=settings['read_timeout'],
+                                       retry_policy=RetryPolicy(max_retries=settings['max_retries'],
+                                                                backoff_base=settings['backoff_base'],
+                                                                backoff_max=settings['backoff_max']),
+                                       rate_limiter=rate_limiter,
+                                       request_hooks=[self.run_report.record_request])
+
+        creation = {**DEFAULT_CREATION_SETTINGS, **(creation_settings or {})}
+        self.bulk_create = creation['bulk_create']
+        self.bulk_size = creation['bulk_size']
+        self.max_workers = creation['max_workers']
+        self.preflight = creation['preflight']
+        self.defer_updates = creation['defer_updates']
+        self.stage_workers = creation['stage_workers']
+        self.update_queue = UpdateQueue()
+        # Deferred updates that failed, reported at the end of the run
+        self.failed_updates: List[Dict[str, Any]] = []
+        self.link_stage = LinkStage()
+        # Links are collected into the link stage while a plan is created (see create_issues_plan)
+        self.collect_links = False
+        self.failed_links: List[Dict[str, Any]] = []
+        # Issues that Jira refused to create, reported at the end of the run
+        self.failed_issues: List[Dict[str, Any]] = []
+        self.journal_enabled = creation['journal']
+        self.journal_file = os.path.expanduser(creation['journal_file'] or '') or os.path.join(
+            APP_CACHE_DIR, f'journal_{hashlib.sha256(self.jira_url.encode()).hexdigest()[:16]}.jsonl')
+        # The journal of the current plan run and the identifiers and paths of the plan nodes (see run_journal)
+        self.journal: Optional[RunJournal] = None
+        self._node_ids: Dict[int, str] = {}
+        self._node_paths: Dict[int, str] = {}
+        # The path of the file of the current plan, which scopes the node paths
+        self.plan_file: Optional[str] = None
+        self.dedupe = creation['dedupe']
+        # The existing issues of the current plan document, and the reused ones (see duplicate_index)
+        self.duplicate_index: Optional[DuplicateIndex] = None
+        self.existing_issue_keys: Set[str] = set()
+        self.sprint_resolver = SprintResolver(self.get_sprint_index)
+
+        cache = {**DEFAULT_CACHE_SETTINGS, **(cache_settings or {})}
+        self.cache_ttl = {**DEFAULT_CACHE_SETTINGS['ttl'], **(cache.get('ttl') or {})}
+        self.metadata_cache = MetadataCache(path=cache['path'] if cache['enabled'] else None,
+                                            refresh=cache['refresh'])
 
         self._validate_credentials()
 
+    def close(self) -> None:
+        '''
+        Release the pooled connections, the metadata cache and the run journal of the Jira instance.
+        '''
+        self.transport.close()
+        self.metadata_cache.close()
+        if self.journal is not None:
+            self.journal.close()
+
+    def log_run_summary(self) -> None:
+        '''
+        Log the request statistics of the run: requests, retries and time spent throttled.
+        '''
+        stats = self.transport.stats.as_dict()
+        logging.info(f'Run summary: {stats["requests"]} Jira requests, {stats["retries"]} retries, '
+                     f'{stats["throttled_seconds"]:.1f}s waiting for retries, '
+                     f'{stats["rate_limit_seconds"]:.1f}s waiting for the rate limiter')
+        self.run_report.log_summary(stats)
+
+    def write_run_report(self, report_file: str) -> None:
+        '''
+        Write the run report (requests by endpoint, latency histograms, retries, LLM invocations and
+        critical path) as JSON or as a Prometheus textfile, see RunReport.write.
+        '''
+        self.run_report.write(report_file, self.transport.stats.as_dict())
+
+    def _cached_metadata(self, kind: str, key: str, fetch: Callable[[], Any], refresh: bool = False) -> Any:
+        '''
+        Return Jira metadata from the metadata cache, fetching it on a cache miss.
+
+        Args:
+            kind (str): The metadata type, one of the 'jira_cache.ttl' keys ('project', 'boards', ...).
+            key (str): The key of the metadata within its type (e.g. a project key).
+            fetch (Callable[[], Any]): Function fetching the metadata from Jira.
+            refresh (bool, optional): Fetch the metadata even if it is cached. Defaults to False.
+
+        Returns:
+            Any: The metadata.
+        '''
+        cache_key = f'{self.jira_url}|{kind}|{key}'
+        if refresh:
+            value = fetch()
+            self.metadata_cache.set(cache_key, value, self.cache_ttl[kind])
+            return value
+        return self.metadata_cache.get_or_fetch(cache_key, fetch, self.cache_ttl[kind])
+
+    def warm_up(self, project_key: Optional[str] = None) -> None:
+        '''
+        Prefetch the metadata of a project (ID, Scrum boards, active and future sprints), so the
+        creation of its issues starts without lookups.
+
+        Args:
+            project_key (Optional[str]): The key of the project. Nothing is prefetched without it.
+
+        Raises:
+            RuntimeError: If the project does not exist.
+
+        Notes:
+            The other prefetch failures are only logged: the creation looks the metadata up again and reports them.
+        '''
+        if not project_key:
+            return
+        logging.debug(f'Prefetching the metadata of the "{project_key}" project')
+        try:
+            self.get_project_id_by_key(project_key)
+        except requests.exceptions.RequestException as e:
+            logging.debug(f'Failed to prefetch the ID of the "{project_key}" project: {e}')
+        try:
+            self.sprint_resolver.prefetch(project_key)
+        except (RuntimeError, requests.exceptions.RequestException) as e:
+            logging.debug(f'Failed to prefetch the sprints of the "{project_key}" project: {e}')
+
     def _validate_credentials(self) -> None:
         '''
         Validate the Jira URL and token by making a simple request to the Jira API.
@@ -71,7 +454,7 @@ class Jira:
         logging.debug('Validating Jira URL and token')
         validate_url = f'{self.jira_api_base_url}/myself'
 
-        response = requests.get(validate_url, headers=self.headers)
+        response = self.transport.request('get', validate_url)
         if response.status_code != 200:
             logging.error(
                 f'Failed to validate Jira URL or token. The Jira API request responded with a "{response.status_code}" status code.')
@@ -116,30 +499,29 @@ class Jira:
             else:
                 url = f'{self.jira_api_base_url}/{api_type}'
 
-        logging.debug(f'Sending a Jira {method.upper()} request to '
-                      f'"{url}" with the following DATA: {jira_request_data}')
+        # The payload is only formatted if the record is emitted (see config_utils.setup_logging)
+        logging.debug('Sending a Jira %s request to "%s" with the following DATA: %s',
+                      method.upper(), url, jira_request_data)
+        response = None
         try:
-            if method.lower() == 'post':
-                response = requests.post(
-                    url, headers=self.headers, json=jira_request_data)
-            elif method.lower() == 'put':
-                response = requests.put(
-                    url, headers=self.headers, json=jira_request_data)
-            elif method.lower() == 'get':
-                response = requests.get(
-                    url, headers=self.headers, params=jira_request_data)
+            if method.lower() == 'get':
+                response = self.transport.request(
+                    method, url, params=jira_request_data)
+            else:
+                response = self.transport.request(
+                    method, url, json=jira_request_data)
 
             response.raise_for_status()  # Raise exception for non-2xx response codes
             # Check if response is not empty and is valid JSON
-            if response.text:
+            if response.content:
                 try:
-                    # Conditionally log the response JSON based on its size
+                    # Conditionally log the response JSON based on the size of the raw body
                     response_json = response.json()
-                    if len(json.dumps(response_json)) <= MAX_RESPONSE_LOG_SIZE:
-                        logging.debug(f'Request response: {response_json}')
+                    if len(response.content) <= MAX_RESPONSE_LOG_SIZE:
+                        logging.debug('Request response: %s', response_json)
                     else:
-                        logging.debug(f'Request response is too large to log '
-                                      f'(size: {len(json.dumps(response_json))} bytes)')
+                        logging.debug('Request response is too large to log (size: %d bytes)',
+                                      len(response.content))
                 except ValueError:
                     logging.error(
                         f'Return Non-JSON response as text: {response.text}')
@@ -157,7 +539,7 @@ class Jira:
             except ValueError:
                 # Handle cases where response is not valid JSON
                 logging.error(
-                    f'Request response: {response.text if response else "No response"}')
+                    f'Request response: {response.text if response is not None else "No response"}')
 
             raise e  # Re-raise the exception for handling at a higher level
 
@@ -174,28 +556,31 @@ class Jira:
         Raises:
             RuntimeError: If the project key is not found.
         '''
-        response = self.send_request(api_type='project', method='get')
-
-        for project in response:
-            if project['key'] == project_key:
-                return project['id']
+        def fetch_project_id() -> str:
+            try:
+                return self.send_request(api_type='project', issue_key=project_key, method='get')['id']
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
+                    raise RuntimeError(f'Project key "{project_key}" not found.')
+                raise e
 
-        raise RuntimeError(f'Project key "{project_key}" not found.')
+        return self._cached_metadata('project', project_key, fetch_project_id)
 
-    def get_board_ids_by_project_key(self, project_key: str) -> List[str]:
+    def get_board_ids_by_project_key(self, project_key: str, refresh: bool = False) -> List[str]:
         '''
         Return **all** Scrum board IDs (type='scrum') for the given project, skipping Kanban boards.
+        With `refresh`, the board list is fetched even if it is cached.
         '''
-        project_id = self.get_project_id_by_key(project_key)
-        search_project_boards_url = f'{self.jira_url}/rest/agile/1.0/board?projectKeyOrId={project_id}'
-        response = self.send_request(
-            custom_jira_api_base_url=search_project_boards_url, method='get')
+        def fetch_board_ids() -> List[str]:
+            project_id = self.get_project_id_by_key(project_key)
+            search_project_boards_url = f'{self.jira_url}/rest/agile/1.0/board?projectKeyOrId={project_id}'
+            response = self.send_request(
+                custom_jira_api_base_url=search_project_boards_url, method='get')
 
-        board_ids: List[str] = []
-        for board in response.get('values', []):
-            if board.get('type') == 'scrum':
-                board_ids.append(str(board['id']))
+            return [str(board['id']) for board in response.get('values', [])
+                    if board.get('type') == 'scrum']
 
+        board_ids = self._cached_metadata('boards', project_key, fetch_board_ids, refresh)
         if not board_ids:
             raise RuntimeError(f'No boards (Scrum) found for project key "{project_key}".')
         return board_ids
@@ -215,6 +600,71 @@ class Jira:
         logging.error(f'Sprint "{sprint_name}" was not found in the "{project_key}" project.')
         return None
 
+    def _resolve_sprint_id(self, jira_project: str, sprint_name: str) -> Optional[str]:
+        return self.sprint_resolver.resolve(jira_project, sprint_name)
+
+    def get_sprint_index(self, project_key: str, refresh: bool = False) -> Dict[str, str]:
+        '''
+        Build an index of the active and future sprints of all the Scrum boards in the project.
+        When several boards have a sprint with the same name, the first board wins
+        (like in get_sprint_id_from_all_boards).
+
+        Args:
+            project_key (str): The key of the project.
+            refresh (bool, optional): Fetch the boards and sprints even if they are cached. Defaults to False.
+
+        Returns:
+            Dict[str, str]: Sprint IDs by normalized sprint name.
+        '''
+        sprint_index: Dict[str, str] = {}
+        for b_id in self.get_board_ids_by_project_key(project_key, refresh):
+            for sprint in self.get_board_sprints(b_id, refresh):
+                sprint_index.setdefault(normalize_sprint_name(sprint.get('name')), sprint.get('id'))
+        return sprint_index
+
+    def get_board_sprints(self, board_id: str, refresh: bool = False) -> List[Dict[str, Any]]:
+        '''
+        Get all the active and future sprints of a scrum board, following the pagination.
+
+        Args:
+            board_id (str): The ID of the board.
+            refresh (bool, optional): Fetch the sprints even if they are cached. Defaults to False.
+
+        Returns:
+            List[Dict[str, Any]]: The sprints of the board (ID and name).
+        '''
+        return self._cached_metadata('sprints', board_id,
+                                     lambda: self._fetch_board_sprints(board_id), refresh)
+
+    def _fetch_board_sprints(self, board_id: str) -> List[Dict[str, Any]]:
+        '''
+        Fetch all the active and future sprints of a scrum board from Jira.
+        '''
+        base_url = f'{self.jira_url}/rest/agile/1.0/board/{board_id}/sprint'
+        start_at = 0
+        max_results = 50  # default page size
+        sprints: List[Dict[str, Any]] = []
+
+        while True:
+            response = self.send_request(
+                custom_jira_api_base_url=base_url,
+                method='get',
+                jira_request_data={
+                    "state": "active,future",
+                    "startAt": start_at,
+                    "maxResults": max_results
+                }
+            )
+            sprints.extend({'id': sprint.get('id'), 'name': sprint.get('name')}
+                           for sprint in response.get('values', []))
+
+            start_at += max_results
+            if response.get('isLast', True):
+                break
+
+        logging.debug(f'Found {len(sprints)} active/future sprints on board {board_id}.')
+        return sprints
+
     def get_sprint_id(self, board_id: str, sprint_name: str) -> Optional[str]:
         '''
         Get the ID of a sprint by its name on a given scrum board.
@@ -283,83 +733,6 @@ class Jira:
         }
         return self.send_request(api_type='issueLink', method='post', jira_request_data=link_data)
 
-    def _build_issue_data(self,
-                          jira_project: str,
-                          fields: Dict[str, Any],
-                          exclude_fields: List[str] = []) -> Dict[str, Any]:
-        '''
-        Build the data structure for a Jira issue.
-
-        Args:
-            jira_project (str): The key of the project where the issue will be created.
-            fields (Dict[str, Any]): A dictionary containing the fields and their values for the issue.
-            exclude_fields (List[str], optional): A list of field names to exclude from the issue data. Defaults to an empty list.
-
-        Returns:
-            Dict[str, Any]: The data structure for the issue.
-        '''
-
-        # Helper function to transform field values for string or dict
-        def transform_field_value(field_value, key_type):
-            if isinstance(field_value, dict):
-                # Fix: use .items() to properly iterate through dictionary key-value pairs
-                return [{key_type: val} for key, val in field_value.items()]
-            else:
-                return {key_type: field_value}
-
-        # Initializes a new dict for the issue data
-        issue_data = {'fields': {}}
-
-        # Get the list of fields that should be formatted as arrays
-        array_fields = getattr(self, 'array_format_fields', [])
-
-        for field_name, field_value in fields.items():
-            if field_name == 'issues':
-                # The 'issues' key contains a list of child issues that will be created later
-                continue
-            if field_name in exclude_fields:
-                continue
-            if field_name == 'issuelinks':
-                # The 'issuelinks' will be handled later by the link_jira_issues def
-                continue
-
-            if field_name in self.key_format_fields:
-                # Fields that require 'key' format
-                value = transform_field_value(field_value, 'key')
-                # Ensure array formatting if needed
-                if field_name in array_fields and not isinstance(value, list):
-                    value = [value]
-                issue_data['fields'][field_name] = value
-            elif field_name in self.name_format_fields:
-                # Fields that require 'name' format
-                value = transform_field_value(field_value, 'name')
-                # Ensure array formatting if needed
-                if field_name in array_fields and not isinstance(value, list):
-                    value = [value]
-                issue_data['fields'][field_name] = value
-            elif field_name in self.custom_field_mapping:
-                if field_name == "sprint":
-                    custom_field_name = self.custom_field_mapping[field_name]
-                    sprint_id = self.get_sprint_id_from_all_boards(jira_project, field_value)
-                    issue_data['fields'][custom_field_name] = sprint_id
-                else:
-                    issue_data['fields'][self.custom_field_mapping[field_name]
-                                        ] = field_value
-            elif field_name in self.custom_field_mapping.get('key_format_fields', {}):
-                # Custom fields that require 'key' format
-                custom_field_name = self.custom_field_mapping['key_format_fields'][field_name]
-                issue_data['fields'][custom_field_name] = transform_field_value(
-                    field_value, 'key')
-            elif field_name in self.custom_field_mapping.get('name_format_fields', {}):
-                # Custom fields that require 'name' format
-                custom_field_name = self.custom_field_mapping['name_format_fields'][field_name]
-                issue_data['fields'][custom_field_name] = transform_field_value(
-                    field_value, 'name')
-            else:
-                # Non-special fields
-                issue_data['fields'][field_name] = field_value
-        return issue_data
-
     def create_new_jira_issue(self,
                               jira_project: str,
                               jira_issue: Dict[str, Any],
@@ -392,55 +765,307 @@ class Jira:
 
             response = jira.create_new_jira_issue(jira_project, jira_issue, epic_key)
         '''
-        # Build initial issue data excluding post-creation fields
-        # The post-creation fields are not allowed to be set during the issue creation time
-        initial_issue_data = self._build_issue_data(jira_project,
-                                                    jira_issue,
-                                                    self.post_creation_update_fields)
-        # Setting the issue's project
-        initial_issue_data['fields']['project'] = {'key': jira_project}
+        issue_key = self._journaled_issue_key(jira_issue)
+        if issue_key:
+            self._resume_created_issue(jira_project, jira_issue, issue_key, epic_key, parent_key)
+            return {'key': issue_key}
+        issue_key = self._existing_issue_key(jira_issue)
+        if issue_key:
+            return {'key': issue_key}
 
-        # Set a link to epic if epic_key is provided and issuetype is not Sub-task
-        if epic_key and jira_issue.get('issuetype') != 'Sub-task':
-            initial_issue_data['fields'][self.custom_field_mapping['epicLink']] = epic_key
-        # Handle sub-tasks by linking them to parent_key if provided
-        elif jira_issue.get('issuetype') == 'Sub-task' and parent_key:
-            initial_issue_data['fields']['parent'] = {'key': parent_key}
+        initial_issue_data, update_data = self._build_issue_payloads(jira_project,
+                                                                     jira_issue,
+                                                                     epic_key,
+                                                                     parent_key)
 
         # Send a request to create the issue
+        start = time.monotonic()
         response_data = self.send_request(api_type='issue',
                                           method='post',
                                           jira_request_data=initial_issue_data)
         issue_key = response_data['key']
         if issue_key:
-            logging.debug(f'Issue {issue_key} successfully created')
+            logging.debug('Issue %s successfully created', issue_key)
         else:
             raise ValueError(
                 'Failed to retrieve issue key from the Jira response')
+        self._record_created_issue(jira_issue, issue_key)
 
-        # Prepare the update data for post-creation fields
+        self._apply_post_creation_fields(jira_issue, issue_key, update_data)
+        self.run_report.record_node(issue_key, parent_key or epic_key, time.monotonic() - start)
+
+        return response_data
+
+    def _apply_post_creation_fields(self,
+                                    jira_issue: Dict[str, Any],
+                                    issue_key: str,
+                                    update_data: Dict[str, Any]) -> None:
+        '''
+        Set the post-creation fields and the issue links of a newly created issue.
+
+        Args:
+            jira_issue (Dict[str, Any]): A dictionary containing the fields and values of the Jira issue.
+            issue_key (str): The key of the created issue.
+            update_data (Dict[str, Any]): The post-creation update data of the issue (see _build_issue_payloads).
+        '''
         # The post-creation fields can be set after the issue is created
-        fields_set_during_issue_creation = set(
-            jira_issue.keys()) - set(self.post_creation_update_fields)
-        update_data = self._build_issue_data(jira_project,
-                                             jira_issue,
-                                             exclude_fields=fields_set_during_issue_creation)
-        if update_data['fields']:
+        if update_data['fields'] and self.defer_updates:
+            logging.debug('Queue the post-creation fields update of issue %s', issue_key)
+            self.update_queue.add(issue_key, update_data['fields'], jira_issue.get('summary', ''))
+        elif update_data['fields']:
             logging.debug('Update the issue with the post-creation fields')
-            self.send_request(api_type='issue',
-                              method='put',
-                              issue_key=issue_key,
-                              jira_request_data=update_data)
-
-        if 'issuelinks' in jira_issue.keys():
-            for link in jira_issue['issuelinks']:
-                link_type = link['type'].get('name', 'Related')
-                issue_parent_key = link['outwardIssue'].get('key', '')
-            logging.debug(f'Requesting a "{link_type}" link between '
-                          f'{issue_key} --> {issue_parent_key}')
-            self.link_jira_issues(issue_key, issue_parent_key, link_type)
+            self._send_update(issue_key, update_data)
 
-        return response_data
+        if 'ref' in jira_issue:
+            self.link_stage.register_ref(jira_issue['ref'], issue_key)
+
+        for link in jira_issue.get('issuelinks') or []:
+            link_type = link['type'].get('name', 'Related')
+            self._request_link(issue_key, link_target(link), link_type, jira_issue.get('summary', ''))
+
+    def _request_link(self, issue_key: str, target: Any, link_type: str, summary: str = '') -> None:
+        '''
+        Link a created issue to a target issue. While a plan is created, the link is collected
+        into the link stage; otherwise it is sent immediately.
+
+        Args:
+            issue_key (str): The key of the created issue (inward issue).
+            target (Any): The key of the linked issue, or {'ref': name} for a node of the plan.
+            link_type (str): The type of the link.
+            summary (str, optional): The summary of the created issue, used when reporting failures.
+        '''
+        if self.collect_links:
+            self.link_stage.add(issue_key, target, link_type, summary)
+            return
+
+        target_key = self.link_stage.resolve_target(target)
+        if not target_key:
+            raise ValueError(f'Cannot link issue {issue_key} to {target}: the linked issue was not created')
+        logging.debug('Requesting a "%s" link between %s --> %s', link_type, issue_key, target_key)
+        self._send_link(issue_key, target_key, link_type)
+
+    def _send_update(self, issue_key: str, update_data: Dict[str, Any]) -> None:
+        '''
+        Send the post-creation update of an issue and record it in the run journal.
+        '''
+        self.send_request(api_type='issue',
+                          method='put',
+                          issue_key=issue_key,
+                          jira_request_data=update_data)
+        if self.journal is not None:
+            self.journal.record_updated(issue_key)
+
+    def _send_link(self, issue_key: str, target_key: str, link_type: str) -> None:
+        '''
+        Create an issue link and record it in the run journal, unless a previous run already created it.
+        '''
+        if self.journal is not None and self.journal.is_linked(issue_key, target_key, link_type):
+            logging.debug('The "%s" link between %s --> %s was created by a previous run',
+                          link_type, issue_key, target_key)
+            return
+        self.link_jira_issues(issue_key, target_key, link_type)
+        if self.journal is not None:
+            self.journal.record_linked(issue_key, target_key, link_type)
+
+    def _journaled_issue_key(self, jira_issue: Dict[str, Any]) -> Optional[str]:
+        '''
+        Return the key that a previous run created for a node of the plan, or None.
+        '''
+        if self.journal is None or id(jira_issue) not in self._node_ids:
+            return None
+        return self.journal.issue_key(self._node_ids[id(jira_issue)])
+
+    def _record_created_issue(self, jira_issue: Dict[str, Any], issue_key: str) -> None:
+        '''
+        Record the key of a created node of the plan in the run journal.
+        '''
+        if self.journal is not None and id(jira_issue) in self._node_ids:
+            self.journal.record_created(self._node_ids[id(jira_issue)], issue_key, self._node_paths.get(id(jira_issue)))
+
+    def _tracked_issue_key(self, jira_issue: Dict[str, Any]) -> Optional[str]:
+        '''
+        Return the key last recorded for the path of a node of the plan (its 'ref' or its position), or None.
+        Unlike _journaled_issue_key, the key is found even if the node was edited since it was recorded.
+        '''
+        if self.journal is None or id(jira_issue) not in self._node_paths:
+            return None
+        return self.journal.path_issue_key(self._node_paths[id(jira_issue)])
+
+    def _resume_created_issue(self,
+                              jira_project: str,
+                              jira_issue: Dict[str, Any],
+                              issue_key: str,
+                              epic_key: Optional[str] = None,
+                              parent_key: Optional[str] = None) -> None:
+        '''
+        Reuse an issue created by a previous run: only its missing post-creation update and links are sent.
+
+        Args:
+            jira_project (str): The key of the Jira project of the issue.
+            jira_issue (Dict[str, Any]): The node of the plan.
+            issue_key (str): The key created for the node by the previous run.
+            epic_key (Optional[str], optional): The key of the epic of the issue. Defaults to None.
+            parent_key (Optional[str], optional): The key of the parent issue for sub-tasks. Defaults to None.
+        '''
+        logging.info(f'Issue {issue_key} "{jira_issue.get("summary", "")}" was created by a previous run')
+        if self.journal.is_updated(issue_key):
+            update_data: Dict[str, Any] = {'fields': {}}
+        else:
+            update_data = self._build_issue_payloads(jira_project, jira_issue, epic_key, parent_key)[1]
+        self._apply_post_creation_fields(jira_issue, issue_key, update_data)
+
+    def _matched_issue_key(self, jira_issue: Dict[str, Any]) -> Optional[str]:
+        '''
+        Return the key of the existing issue of a node of the plan: its 'key' field, or the issue it
+        duplicates (see dedupe). None if the node has no existing issue.
+        '''
+        if jira_issue.get('key'):
+            return str(jira_issue['key'])
+        if self.duplicate_index is None:
+            return None
+        return self.duplicate_index.match(jira_issue)
+
+    def _existing_issue_key(self, jira_issue: Dict[str, Any]) -> Optional[str]:
+        '''
+        Return the key of the existing issue of a node of the plan (see _matched_issue_key), or None.
+        The existing issue is reused as it is: it gets neither the post-creation fields nor the links of
+        the node, but its child issues are created under it and other nodes can link to its 'ref'.
+        '''
+        issue_key = self._matched_issue_key(jira_issue)
+        if issue_key:
+            logging.info(f'Issue {issue_key} "{jira_issue.get("summary", "")}" already exists, it is reused')
+            self.existing_issue_keys.add(issue_key)
+            if 'ref' in jira_issue:
+                self.link_stage.register_ref(jira_issue['ref'], issue_key)
+        return issue_key
+
+    def create_jira_issues_in_bulk(self,
+                                   jira_project: str,
+                                   jira_issues: List[Dict[str, Any]],
+                                   epic_key: Optional[str] = None,
+                                   parent_key: Optional[str] = None) -> List[Optional[str]]:
+        '''
+        Create sibling Jira issues through the '/issue/bulk' endpoint, up to `bulk_size` issues per request.
+        The post-creation fields and links are applied to every created issue.
+
+        Args:
+            jira_project (str): The key of the Jira project where the issues will be created.
+            jira_issues (List[Dict[str, Any]]): The sibling issues to create.
+            epic_key (Optional[str], optional): The key of the epic to link the new issues to. Defaults to None.
+            parent_key (Optional[str], optional): The key of the parent issue for sub-tasks. Defaults to None.
+
+        Returns:
+            List[Optional[str]]: The created issue keys, in the order of `jira_issues`.
+            Issues rejected by Jira have a None key and are recorded in `failed_issues`.
+        '''
+        issue_keys: List[Optional[str]] = []
+        resumed_keys = {}
+        for index, issue in enumerate(jira_issues):
+            issue_key = self._journaled_issue_key(issue)
+            if issue_key:
+                self._resume_created_issue(jira_project, issue, issue_key, epic_key, parent_key)
+            else:
+                issue_key = self._existing_issue_key(issue)
+            if issue_key:
+                resumed_keys[index] = issue_key
+        # Only the issues that neither previous runs created nor already exist are sent
+        pending_issues = [issue for index, issue in enumerate(jira_issues) if index not in resumed_keys]
+
+        for start in range(0, len(pending_issues), self.bulk_size):
+            chunk = pending_issues[start:start + self.bulk_size]
+            payloads = [self._build_issue_payloads(jira_project, issue, epic_key, parent_key)
+                        for issue in chunk]
+            bulk_data = {'issueUpdates': [create_data for create_data, _ in payloads]}
+            chunk_start = time.monotonic()
+            try:
+                response_data = self.send_request(api_type='issue/bulk',
+                                                  method='post',
+                                                  jira_request_data=bulk_data)
+            except requests.exceptions.HTTPError as e:
+                # Jira responds with an error status when every item of the request failed,
+                # but the body still holds the per-item errors
+                try:
+                    response_data = e.response.json()
+                except ValueError:
+                    raise e
+                if not response_data.get('errors'):
+                    raise e
+
+            # Successful items are returned in request order, failed items by their index
+            errors = {error.get('failedElementNumber'): error.get('elementErrors', {})
+                      for error in response_data.get('errors', [])}
+            created_issues = iter(response_data.get('issues', []))
+            chunk_keys: List[Optional[str]] = []
+            for index, issue in enumerate(chunk):
+                if index in errors:
+                    self._record_failed_issue(issue, errors[index])
+                    chunk_keys.append(None)
+                    continue
+                issue_key = next(created_issues)['key']
+                logging.debug('Issue %s successfully created', issue_key)
+                chunk_keys.append(issue_key)
+            # Every created issue is journaled before any post-creation request can fail,
+            # so a resumed run does not create the rest of the chunk again
+            for issue, issue_key in zip(chunk, chunk_keys):
+                if issue_key is not None:
+                    self._record_created_issue(issue, issue_key)
+            issue_keys.extend(chunk_keys)
+            for index, (issue, issue_key) in enumerate(zip(chunk, chunk_keys)):
+                if issue_key is not None:
+                    self._apply_post_creation_fields(issue, issue_key, payloads[index][1])
+            # Every issue of the request costs the whole request on its branch of the tree
+            seconds = time.monotonic() - chunk_start
+            for issue_key in chunk_keys:
+                if issue_key is not None:
+                    self.run_report.record_node(issue_key, parent_key or epic_key, seconds)
+
+        created_keys = iter(issue_keys)
+        return [resumed_keys[index] if index in resumed_keys else next(created_keys)
+                for index in range(len(jira_issues))]
+
+    def _record_failed_issue(self, jira_issue: Dict[str, Any], errors: Dict[str, Any]) -> None:
+        '''
+        Log and record an issue that Jira refused to create.
+
+        Args:
+            jira_issue (Dict[str, Any]): The issue of the YAML plan that failed.
+            errors (Dict[str, Any]): The error details returned by Jira.
+        '''
+        logging.error(f'Failed to create a Jira Issue type {jira_issue.get("issuetype")}: '
+                      f'"{jira_issue.get("summary")}". Jira response: {errors}')
+        self.failed_issues.append({'summary': jira_issue.get('summary'),
+                                   'issuetype': jira_issue.get('issuetype'),
+                                   'errors': errors})
+
+    def _finalize_created_issue(self,
+                                jira_issue: Dict[str, Any],
+                                issue_key: str,
+                                epic_key: Optional[str] = None,
+                                issue_parent_key: Optional[str] = None) -> None:
+        '''
+        Log a created issue and link it to its parent issue.
+
+        Args:
+            jira_issue (Dict[str, Any]): The created issue of the YAML plan.
+            issue_key (str): The key of the created issue.
+            epic_key (Optional[str], optional): The key of the epic of the issue. Defaults to None.
+            issue_parent_key (Optional[str], optional): The key of the parent issue. Defaults to None.
+        '''
+        if issue_key in self.existing_issue_keys:
+            # A reused issue is already linked to its parent
+            return
+        if epic_key:
+            logging.info(f'Issue created successfully under Epic {epic_key}: '
+                         f'{self.jira_url}/browse/{issue_key}')
+        else:
+            logging.info(
+                f'Issue created successfully: {self.jira_url}/browse/{issue_key}')
+
+        # Create a link if the issue is a child issue
+        # This means that the issue is part of another issue's 'issues' list
+        if issue_parent_key and jira_issue['issuetype'] != 'Sub-task':
+            link_type = jira_issue.get('linkType', 'Related')
+            self._request_link(issue_key, issue_parent_key, link_type, jira_issue.get('summary', ''))
 
     def create_list_of_jira_issues(self,
                                    jira_project: str,
@@ -457,6 +1082,30 @@ class Jira:
             epic_key (Optional[str], optional): The key of the epic to link the new issues to. Defaults to None.
             issue_parent_key (Optional[str], optional): The key of the parent issue for sub-tasks. Defaults to None.
         '''
+        if self.max_workers > 1:
+            IssueScheduler(self, jira_project, self.max_workers).run(
+                issues=jira_issues, epic_key=epic_key, parent_key=issue_parent_key)
+            return
+
+        if self.bulk_create:
+            # Create all the siblings together, then descend into each one of them
+            for issue in jira_issues:
+                logging.info(
+                    f'Creating a Jira Issue type {issue["issuetype"]}: \"{issue["summary"]}\"')
+            issue_keys = self.create_jira_issues_in_bulk(jira_project=jira_project,
+                                                         jira_issues=jira_issues,
+                                                         epic_key=epic_key,
+                                                         parent_key=issue_parent_key)
+            created_issues = [(issue, issue_key) for issue, issue_key in zip(jira_issues, issue_keys)
+                              if issue_key is not None]  # Child issues of failed issues are skipped
+            for issue, issue_key in created_issues:
+                self._finalize_created_issue(issue, issue_key, epic_key, issue_parent_key)
+            for issue, issue_key in created_issues:
+                if 'issues' in issue:
+                    self.create_list_of_jira_issues(
+                        jira_project, issue['issues'], epic_key, issue_key)
+            return
+
         for issue in jira_issues:
             logging.info(
                 f'Creating a Jira Issue type {issue["issuetype"]}: \"{issue["summary"]}\"')
@@ -465,20 +1114,7 @@ class Jira:
                                                                epic_key=epic_key,
                                                                parent_key=issue_parent_key)
             issue_key = issue_create_response['key']
-            if epic_key:
-                logging.info(f'Issue created successfully under Epic {epic_key}: '
-                             f'{self.jira_url}/browse/{issue_key}')
-            else:
-                logging.info(
-                    f'Issue created successfully: {self.jira_url}/browse/{issue_key}')
-
-            # Create a link if the issue is a child issue
-            # This means that the issue is part of another issue's 'issues' list
-            if issue_parent_key and issue['issuetype'] != 'Sub-task':
-                link_type = issue.get('linkType', 'Related')
-                logging.debug(f'Requesting a "{link_type}" link between '
-                              f'{issue_key} --> {issue_parent_key}')
-                self.link_jira_issues(issue_key, issue_parent_key, link_type)
+            self._finalize_created_issue(issue, issue_key, epic_key, issue_parent_key)
 
             # Recursively create child issues if 'issues' key exists in the current issue
             if 'issues' in issue:
@@ -498,6 +1134,26 @@ class Jira:
         Raises:
             KeyError: If required keys are missing in the epics data structure.
         '''
+        if self.max_workers > 1:
+            IssueScheduler(self, jira_project, self.max_workers).run(epics=epics)
+            return
+
+        if self.bulk_create:
+            for epic in epics:
+                logging.info(f'Creating a Jira Epic \"{epic["epicName"]}\"')
+            epic_keys = self.create_jira_issues_in_bulk(jira_project=jira_project,
+                                                        jira_issues=epics)
+            created_epics = [(epic, epic_key) for epic, epic_key in zip(epics, epic_keys)
+                             if epic_key is not None]
+            for epic, epic_key in created_epics:
+                logging.info(
+                    f'Epic created successfully: {self.jira_url}/browse/{epic_key}')
+            for epic, epic_key in created_epics:
+                if 'issues' in epic:
+                    self.create_list_of_jira_issues(
+                        jira_project, epic['issues'], epic_key=epic_key)
+            return
+
         for epic in epics:
             try:
                 logging.info(f'Creating a Jira Epic \"{epic["epicName"]}\"')
@@ -516,8 +1172,197 @@ class Jira:
                     f'Failed to process epic: {e}. Ensure all required fields are provided.')
                 raise e
 
-    def jira_issues_creator(self, issue_list):
+    def flush_post_creation_updates(self) -> None:
+        '''
+        Send the queued post-creation updates concurrently, one PUT per issue.
+        Failed updates are logged per issue and recorded in `failed_updates`.
+        '''
+        self.failed_updates.extend(self.update_queue.flush(self._send_update, self.stage_workers))
+
+    def flush_links(self) -> None:
+        '''
+        Send the collected issue links concurrently, once all their endpoints exist.
+        Failed links are logged and recorded in `failed_links`.
+        '''
+        self.failed_links.extend(self.link_stage.flush(self._send_link, self.stage_workers))
+
+    def create_issues_plan(self, project_key: str, issues_list: Dict[str, Any], sync: bool = False) -> None:
+        '''
+        Create the epics and issues of a loaded plan, then run the deferred stages
+        (post-creation updates and issue links).
+
+        Args:
+            project_key (str): The key of the Jira project where the plan will be created.
+            issues_list (Dict[str, Any]): The loaded plan, with optional 'epics' and 'issues' lists.
+            sync (bool, optional): Update the existing issues of the plan first (see PlanSync). Defaults to False.
+        '''
+        self.create_issues_stream([issues_list], project_key, sync=sync)
+
+    def create_issues_stream(self,
+                             documents: Iterable[Dict[str, Any]],
+                             project_key: Optional[str] = None,
+                             preflight: bool = False,
+                             sync: bool = False) -> None:
+        '''
+        Create the epics and issues of a stream of plan documents, one document at a time, then create
+        the issue links. Every document is created as soon as it is read, and its post-creation updates
+        are flushed before the next one, so only one document is held in memory at a time.
+
+        Args:
+            documents (Iterable[Dict[str, Any]]): The plan documents, with optional 'project_key',
+                'epics' and 'issues' keys (see plan_stream).
+            project_key (Optional[str], optional): The key of the Jira project, until a document sets
+                its 'project_key'. Defaults to None.
+            preflight (bool, optional): Resolve the values of every document before creating it. Defaults to False.
+                With `dedupe` enabled, the existing issues of every document are also searched before creating it.
+            sync (bool, optional): Update the existing issues of every document before creating the
+                remaining ones (see PlanSync). Requires the run journal. Defaults to False.
+
+        Raises:
+            KeyError: If a document has no project key.
+        '''
+        # The occurrences of identical nodes are counted across the documents (see run_journal)
+        node_occurrences: Dict[str, int] = {}
+        # The values resolved by the pre-flight of the previous documents (see PlanPreflight)
+        resolved_values: Dict[str, Set[str]] = {}
+        created_documents = 0
+        self.collect_links = True
         try:
+            for position, document in enumerate(documents):
+                project_key = document.get('project_key') or project_key
+                if not project_key:
+                    raise KeyError('project_key')
+                if preflight:
+                    logging.debug(f'Resolving the values of the plan in the "{project_key}" project')
+                    PlanPreflight(self, project_key, check_refs=False,
+                                  resolved=resolved_values).run(document, created_documents)
+                if self.journal is not None:
+                    self._node_ids = plan_node_ids(document, node_occurrences)
+                    self._node_paths = plan_node_paths(document, position, self.plan_file)
+                if sync:
+                    PlanSync(self, project_key).run(document)
+                elif self.dedupe:
+                    self.find_existing_issues(project_key, document)
+                self._create_plan_document(project_key, document)
+                if document.get('epics') or document.get('issues'):
+                    created_documents += 1
+                self.flush_post_creation_updates()
+        finally:
+            # The created issues get their post-creation fields and links even if the creation stopped midway
+            self.collect_links = False
+            self.flush_post_creation_updates()
+            self.flush_links()
+
+    def find_existing_issues(self,
+                             project_key: str,
+                             issues_list: Dict[str, Any],
+                             mapped_keys: Optional[Dict[int, str]] = None) -> None:
+        '''
+        Search the issues of a plan document that already exist in the project, so they are reused
+        instead of being created again (see duplicate_index). The nodes that already have an issue
+        (created by a previous run, set by their 'key' field or mapped by the caller) are not searched.
+
+        Args:
+            project_key (str): The key of the Jira project where the plan will be created.
+            issues_list (Dict[str, Any]): The plan document, with optional 'epics' and 'issues' lists.
+            mapped_keys (Optional[Dict[int, str]], optional): The keys of the issues already mapped
+                to nodes, by node identity. Defaults to None.
+        '''
+        logging.debug(f'Searching the existing issues of the plan in the "{project_key}" project')
+        mapped_keys = {id(node): (mapped_keys or {}).get(id(node)) or node.get('key') or self._journaled_issue_key(node)
+                       for node, _, _ in iter_plan_nodes(issues_list)}
+        self.duplicate_index = DuplicateIndex(self, project_key)
+        self.duplicate_index.build(issues_list, {node: key for node, key in mapped_keys.items() if key})
+
+    def _create_plan_document(self, project_key: str, issues_list: Dict[str, Any]) -> None:
+        '''
+        Create the epics and standalone issues of a plan document.
+
+        Args:
+            project_key (str): The key of the Jira project where the plan will be created.
+            issues_list (Dict[str, Any]): The plan document, with optional 'epics' and 'issues' lists.
+        '''
+        if self.max_workers > 1:
+            # Schedule the epics and the standalone issues together
+            logging.debug(f'Creating Epics and Issues in the "{project_key}" project '
+                          f'with {self.max_workers} workers')
+            IssueScheduler(self, project_key, self.max_workers).run(
+                epics=issues_list.get('epics'), issues=issues_list.get('issues'))
+            return
+
+        if 'epics' in issues_list:
+            logging.debug(
+                f'Creating Epics and associated Issues in the "{project_key}" project')
+            self.create_epics_and_issues(project_key, issues_list['epics'])
+
+        if 'issues' in issues_list:
+            logging.debug(f'Creating Issues in the "{project_key}" project')
+            self.create_list_of_jira_issues(project_key, issues_list['issues'])
+
+    def _raise_for_failures(self) -> None:
+        '''
+        Raise a RuntimeError if any issue, post-creation update or link of the run failed.
+        '''
+        if self.failed_issues or self.failed_updates or self.failed_links:
+            raise RuntimeError(f'Failed to create {len(self.failed_issues)} issues, to update '
+                               f'{len(self.failed_updates)} issues and to create '
+                               f'{len(self.failed_links)} links. Check log for details.')
+
+    def start_journal(self,
+                      issue_list: Optional[str] = None,
+                      issues_stream: Optional[str] = None,
+                      resume: bool = False,
+                      sync: bool = False,
+                      issues_file: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        '''
+        Open the run journal: start a new one for a plan, or load the journal of the previous run.
+        The path of the file of the plan (if any) is kept in `plan_file`.
+
+        Args:
+            issue_list (Optional[str], optional): The plan of the run (YAML content). Ignored when resuming.
+            issues_stream (Optional[str], optional): The streamed issues file of the run. Ignored when resuming.
+            resume (bool, optional): Resume the previous run. Defaults to False.
+            sync (bool, optional): Keep the completed steps of the previous runs for a sync run. Defaults to False.
+            issues_file (Optional[str], optional): The file that the plan was read from. Ignored when resuming.
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: The plan or the streamed issues file of the run.
+
+        Raises:
+            RuntimeError: If there is no run journal to resume.
+        '''
+        self.journal = RunJournal(self.journal_file)
+        if resume:
+            try:
+                record = self.journal.resume()
+            except (FileNotFoundError, ValueError) as e:
+                self.journal = None
+                raise RuntimeError(f'There is no run to resume: {e}')
+            self.plan_file = record.get('issues_file') or record.get('plan_file')
+            return record.get('plan'), record.get('plan_file')
+        self.journal.start(issue_list, issues_stream, keep_steps=sync, issues_file=issues_file)
+        plan_file = issues_stream or issues_file
+        self.plan_file = os.path.abspath(plan_file) if plan_file else None
+        return issue_list, issues_stream
+
+    def jira_issues_creator(self,
+                            issue_list: Optional[str] = None,
+                            resume: bool = False,
+                            issues_stream: Optional[str] = None,
+                            sync: bool = False,
+                            issues_file: Optional[str] = None):
+        try:
+            if resume or sync or self.journal_enabled:
+                # Recording a journal makes any run resumable, and a sync run needs the steps of the previous runs
+                issue_list, issues_stream = self.start_journal(issue_list, issues_stream, resume, sync and not resume,
+                                                               issues_file)
+
+            if issues_stream:
+                logging.info(f'Creating the issues of "{issues_stream}" as its documents are read')
+                self.create_issues_stream(iter_plan_documents(issues_stream), preflight=self.preflight, sync=sync)
+                self._raise_for_failures()
+                return
+
             issues_list = load_yaml(issue_list)
 
             # Load the Jira project key
@@ -525,19 +1370,19 @@ class Jira:
                 raise KeyError('project_key')
             project_key = issues_list['project_key']
 
-            if 'epics' in issues_list:
-                logging.debug(
-                    f'Creating Epics and associated Issues in the "{project_key}" project')
-                self.create_epics_and_issues(project_key, issues_list['epics'])
+            if self.preflight:
+                logging.debug(f'Resolving the values of the plan in the "{project_key}" project')
+                PlanPreflight(self, project_key).run(issues_list)
 
-            if 'issues' in issues_list:
-                logging.debug(f'Creating Issues in the "{project_key}" project')
-                self.create_list_of_jira_issues(project_key, issues_list['issues'])
+            self.create_issues_plan(project_key, issues_list, sync=sync)
+            self._raise_for_failures()
 
         except KeyError as e:
             logging.error(
-                f'Missing required key "{e}" in "{issue_list}"')
+                f'Missing required key "{e}" in "{issues_stream or issue_list}"')
             sys.exit(1)
         except Exception as e:
             logging.error(f'An unexpected error occurred: {e}')
             sys.exit(1)
+        finally:
+            self.log_run_summary()
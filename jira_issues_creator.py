@@ -10,34 +10,129 @@ and issues to be associated with those epics. It utilizes the `jira_handler` mod
 The script provides the following functionalities:
 - Handling of Jira API authentication and request errors.
 - Creation of Jira epics and their associated issues.
+- Creation of the issues of an existing plan (--issues-file), without loading the LLM stack.
+- Batch generation of tickets from a CSV or JSON Lines prompts file (--prompts-file).
+- Live display of the generated ticket as its tokens arrive, with the generation times.
 '''
 
 import argparse
 import jira_handler
 import logging
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from getpass import getpass
 from config_utils import get_config_file_path, setup_logging, load_yaml_file
-from chat_handler import ChatHandler
+from metadata_cache import APP_CACHE_DIR
+from prompt_batch import read_prompt_rows, generate_plan_documents, write_plan_documents
+from response_cache import ResponseCache, DEFAULT_LLM_CACHE_SETTINGS
+from run_report import RunReport
 
 APP_NAME = 'jira-issues-creator'
 DEFAULT_CONFIG_FILE = 'jira_config.yaml'
 
 
+def create_jira(jira_config, parsed_args, run_report=None):
+    '''
+    Create the Jira instance of the configuration, with the creation settings overridden by the arguments.
+
+    Args:
+        jira_config (dict): The Jira configuration.
+        parsed_args (argparse.Namespace): The parsed command-line arguments.
+        run_report (RunReport, optional): The instrumentation of the run.
+
+    Returns:
+        jira_handler.Jira: The Jira instance, with validated credentials.
+    '''
+    creation_settings = dict(jira_config.get('jira_creation') or {})
+    if parsed_args.bulk_create:
+        creation_settings['bulk_create'] = True
+    if parsed_args.max_workers:
+        creation_settings['max_workers'] = parsed_args.max_workers
+    if parsed_args.skip_preflight:
+        creation_settings['preflight'] = False
+    if parsed_args.defer_updates:
+        creation_settings['defer_updates'] = True
+    if parsed_args.dedupe:
+        creation_settings['dedupe'] = True
+
+    cache_settings = dict(jira_config.get('jira_cache') or {})
+    if parsed_args.refresh_cache:
+        cache_settings['refresh'] = True
+
+    logging.debug('Initializing Jira instance based on the configuration')
+    return jira_handler.Jira(jira_url=jira_config['jira_url'],
+                             jira_api_base_url=jira_config['jira_api_base_url'],
+                             jira_token=jira_config['jira_token'],
+                             jira_special_fields=jira_config['jira_special_fields'],
+                             connection_settings=jira_config.get('jira_connection'),
+                             creation_settings=creation_settings,
+                             cache_settings=cache_settings,
+                             run_report=run_report)
+
+
+def warm_up_jira(jira_config, parsed_args, run_report=None):
+    '''
+    Create the Jira instance (opening the pooled connection and validating the token),
+    then prefetch the metadata of the --jira-project project.
+    '''
+    jira = create_jira(jira_config, parsed_args, run_report)
+    jira.warm_up(parsed_args.jira_project)
+    return jira
+
+
+def wait_for_warm_up(jira_warm_up):
+    '''
+    Wait for the background Jira warm-up (if any) before a generated ticket is reviewed, so a Jira
+    credential or project failure stops the run before the ticket is accepted.
+
+    Raises:
+        RuntimeError: If the Jira URL, the token or the project of the warm-up is invalid.
+    '''
+    if jira_warm_up is not None:
+        jira_warm_up.result()
+
+
+def stream_ticket(chat, prompt_parameters, use_cache=True):
+    '''
+    Print the generated ticket as its tokens arrive, then report the generation times.
+
+    Args:
+        chat (ChatHandler): The ticket generation chat handler.
+        prompt_parameters (dict): The 'ticket_type', 'issue_description' and 'project' of the ticket.
+        use_cache (bool): Reuse the cached response of the prompt, if any.
+
+    Returns:
+        str: The generated ticket.
+    '''
+    print('Please review the generated ticket:')
+    chunks = []
+    for chunk in chat.stream_chain(prompt_parameters, use_cache=use_cache):
+        chunks.append(chunk)
+        print(chunk, end='', flush=True)
+    print()
+    # The timings are part of the review prompt, so they are printed rather than logged
+    # (log records are written by a background thread and could come after the prompt)
+    stats = chat.last_generation_stats
+    if stats['cached']:
+        print('(Reused the cached ticket of this prompt)')
+    else:
+        print(f'(Generated in {stats["total_time"]:.1f}s, first token after {stats["time_to_first_token"]:.1f}s)')
+    return ''.join(chunks)
+
+
 def main():
     # Set the Python command-line parser and setup the arguments
     parser = argparse.ArgumentParser(prog=APP_NAME,
                                      description='Automates the creation of epics, stories, tasks, and sub-tasks in Jira based on YAML configuration files.',
                                      formatter_class=argparse.ArgumentDefaultsHelpFormatter)
-    # Required arguments
+    # Required arguments (unless the issues are read from a file or from the journal of the previous run)
     parser.add_argument('-p', '--prompt',
-                        required=True,
                         help=('prompt describing the issue to create.'))
     parser.add_argument('-t', '--ticket-type',
-                        required=True,
                         help=('Type of the ticket to create (e.g., story, epic, etc.).'))
     parser.add_argument('-j', '--jira-project',
-                        required=True,
                         help=('Jira project key where the issue will be created.'))
 
     # Optional arguments
@@ -55,8 +150,63 @@ def main():
     parser.add_argument('--model-name',
                         default='o4-mini-2025-04-16',
                         help=('Name of the model to use for generating tickets.'))
+    parser.add_argument('--bulk-create',
+                        action='store_true',
+                        help=('Create sibling issues together through the Jira bulk endpoint.'))
+    parser.add_argument('--max-workers',
+                        type=int,
+                        help=('Number of issues created concurrently (overrides the configuration file).'))
+    parser.add_argument('--defer-updates',
+                        action='store_true',
+                        help=('Send the post-creation field updates concurrently after all the issues are created.'))
+    parser.add_argument('--dedupe',
+                        action='store_true',
+                        help=('Reuse the existing issues with the summary and issue type of a planned issue '
+                              'instead of creating them again.'))
+    parser.add_argument('--skip-preflight',
+                        action='store_true',
+                        help=('Skip resolving the sprints, users, components, versions and linked issues before creating.'))
+    parser.add_argument('--refresh-cache',
+                        action='store_true',
+                        help=('Ignore the cached Jira metadata (projects, boards, sprints) and fetch it again.'))
+    parser.add_argument('--issues-file',
+                        help=('Create the issues of an existing YAML plan (like jira_issues.yaml) '
+                              'instead of generating them from a prompt.'))
+    parser.add_argument('--issues-stream',
+                        help=('Create the issues of a multi-document YAML or JSON Lines file as it is read, '
+                              'instead of generating them from a prompt.'))
+    parser.add_argument('--no-stream',
+                        action='store_true',
+                        help=('Print the generated ticket once it is complete, instead of as its tokens arrive.'))
+    parser.add_argument('--llm-cache',
+                        action='store_true',
+                        help=('Reuse the cached responses of identical prompts instead of generating them again.'))
+    parser.add_argument('--prompts-file',
+                        help=('Generate the tickets of a CSV or JSON Lines file with prompt, ticket_type '
+                              'and project columns, instead of a single prompt.'))
+    parser.add_argument('--max-concurrency',
+                        type=int,
+                        default=4,
+                        help=('Maximum number of concurrent ticket generations of --prompts-file.'))
+    parser.add_argument('--output-plan',
+                        help=('Write the tickets generated from --prompts-file to this YAML plan for review '
+                              '(create them later with --issues-stream), instead of creating them.'))
+    parser.add_argument('--report-file',
+                        help=('Write the run report (requests by endpoint, latency histograms, retries, '
+                              'LLM invocations and critical path) to this file: JSON for a .json file, '
+                              'otherwise a Prometheus textfile.'))
+    parser.add_argument('--sync',
+                        action='store_true',
+                        help=('Update the existing issues of an edited plan (only the changed fields) '
+                              'and create its new issues, instead of creating the whole plan again.'))
+    parser.add_argument('--resume',
+                        action='store_true',
+                        help=('Resume the previous run from its journal: reuse the issues it created and create the rest.'))
     # Parse arguments
     parsed_args = parser.parse_args()
+    if (not (parsed_args.resume or parsed_args.issues_file or parsed_args.issues_stream or parsed_args.prompts_file)
+            and not (parsed_args.prompt and parsed_args.ticket_type and parsed_args.jira_project)):
+        parser.error('the following arguments are required: -p/--prompt, -t/--ticket-type, -j/--jira-project')
 
     log_level = logging.DEBUG if parsed_args.debug else logging.INFO
     setup_logging(level=log_level)
@@ -65,33 +215,104 @@ def main():
     logging.info(f'Loading configuration from "{jira_config_file}"')
     jira_config = load_yaml_file(jira_config_file)
 
-    if not parsed_args.use_ollama:
+    # Every Jira request and LLM invocation of the run is recorded
+    run_report = RunReport()
+    response = None
+    issues_stream = parsed_args.issues_stream
+    generation_failures = []
+    if parsed_args.issues_file:
+        with open(parsed_args.issues_file, 'r') as issues_file:
+            response = issues_file.read()
+
+    # The issues are only generated when they are not read from a file or from the run journal
+    satisfied = parsed_args.resume or bool(parsed_args.issues_file or parsed_args.issues_stream)
+
+    # The Jira instance is created in the background while the tickets are generated and reviewed,
+    # so the creation starts right after they are accepted
+    jira_warm_up = None
+    if not satisfied and not parsed_args.output_plan:
+        warm_up_executor = ThreadPoolExecutor(max_workers=1)
+        jira_warm_up = warm_up_executor.submit(warm_up_jira, jira_config, parsed_args, run_report)
+        warm_up_executor.shutdown(wait=False)
+
+    if not satisfied and not parsed_args.use_ollama:
         # Set the OpenAI API key environment variable
         os.environ["OPENAI_API_KEY"] = getpass("Enter Your OpenAI API Key: ")
 
-    chat = ChatHandler(model_name=parsed_args.model_name,
-                       ollama=parsed_args.use_ollama)
+    response_cache = None
+    llm_cache_settings = {**DEFAULT_LLM_CACHE_SETTINGS, **(jira_config.get('llm_cache') or {})}
+    if not satisfied and (llm_cache_settings['enabled'] or parsed_args.llm_cache):
+        response_cache = ResponseCache(path=llm_cache_settings['path'],
+                                       max_entries=llm_cache_settings['max_entries'])
+
+    if not satisfied:
+        # The LLM stack (langchain) is slow to import, so it is only loaded for generating issues
+        from chat_handler import ChatHandler
+        chat = ChatHandler(model_name=parsed_args.model_name,
+                           ollama=parsed_args.use_ollama,
+                           response_cache=response_cache,
+                           run_report=run_report)
+
+    if not satisfied and parsed_args.prompts_file:
+        # Batch mode: all the tickets are generated together into a multi-document plan
+        documents, generation_failures = generate_plan_documents(chat,
+                                                                 read_prompt_rows(parsed_args.prompts_file),
+                                                                 parsed_args.max_concurrency)
+        issues_stream = parsed_args.output_plan or os.path.join(
+            APP_CACHE_DIR, 'generated', f'plan_{datetime.now().strftime("%Y_%m_%d-%H_%M_%S")}.yaml')
+        write_plan_documents(issues_stream, documents)
+        logging.info(f'Wrote {len(documents)} generated tickets to "{issues_stream}"')
+        if generation_failures:
+            logging.error(f'Failed to generate {len(generation_failures)} tickets. Check log for details.')
+        if parsed_args.output_plan or not documents:
+            if documents:
+                logging.info(f'Review the plan, then create its issues with: --issues-stream "{issues_stream}"')
+            if response_cache is not None:
+                response_cache.close()
+            if parsed_args.report_file:
+                run_report.write(parsed_args.report_file)
+            sys.exit(1 if generation_failures else 0)
+        satisfied = True
 
-    satisfied = False
+    # A rejected ticket is regenerated, bypassing the response cache
+    regenerate = False
     while not satisfied:
-        response = chat.invoke_chain({"ticket_type": parsed_args.ticket_type,
-                                      "issue_description": parsed_args.prompt,
-                                      "project": parsed_args.jira_project})
-        validation = input(f"""Please review the generated ticket:
+        prompt_parameters = {"ticket_type": parsed_args.ticket_type,
+                             "issue_description": parsed_args.prompt,
+                             "project": parsed_args.jira_project}
+        if parsed_args.no_stream:
+            response = chat.invoke_chain(prompt_parameters, use_cache=not regenerate)
+            wait_for_warm_up(jira_warm_up)
+            validation = input(f"""Please review the generated ticket:
                            {response}
                            \nAre you satisfied with the ticket? [y/n]: """)
+        else:
+            response = stream_ticket(chat, prompt_parameters, use_cache=not regenerate)
+            wait_for_warm_up(jira_warm_up)
+            validation = input("\nAre you satisfied with the ticket? [y/n]: ")
         if validation.lower() == "y":
             satisfied = True
         else:
+            regenerate = True
             print("Let's try again.")
+    if response_cache is not None:
+        response_cache.close()
 
-    logging.debug('Initializing Jira instance based on the configuration')
-    jira = jira_handler.Jira(jira_url=jira_config['jira_url'],
-                             jira_api_base_url=jira_config['jira_api_base_url'],
-                             jira_token=jira_config['jira_token'],
-                             jira_special_fields=jira_config['jira_special_fields'])
+    # The failures of a warm-up that no review waited for (batch generation) are raised here
+    jira = jira_warm_up.result() if jira_warm_up else create_jira(jira_config, parsed_args, run_report)
 
-    jira.jira_issues_creator(response)
+    try:
+        jira.jira_issues_creator(response,
+                                 resume=parsed_args.resume,
+                                 issues_stream=issues_stream,
+                                 sync=parsed_args.sync,
+                                 issues_file=parsed_args.issues_file)
+    finally:
+        if parsed_args.report_file:
+            jira.write_run_report(parsed_args.report_file)
+        jira.close()
+    if generation_failures:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+'''
+link_stage.py
+
+This module provides the LinkStage class, a deferred stage for creating issue links.
+
+All the links requested while a plan is created (the 'issuelinks' of the issues and the
+parent -> child 'linkType' links) are collected instead of being sent one at a time. When the
+stage is flushed, every endpoint exists: links that point to other nodes of the same plan
+(by their 'ref' name) are resolved to the newly created keys, identical (from, to, type)
+links are deduplicated, and the links are sent concurrently.
+'''
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class LinkStage:
+    def __init__(self):
+        '''
+        Initializes a new instance of the LinkStage class.
+        '''
+        self._lock = threading.Lock()
+        # Issue keys of the plan nodes by their 'ref' name
+        self.refs: Dict[str, str] = {}
+        # Requested links: (inward issue key, outward issue key or {'ref': name}, link type, summary)
+        self._links: List[Tuple[str, Any, str, str]] = []
+
+    def register_ref(self, ref: str, issue_key: str) -> None:
+        '''
+        Record the key of a created plan node that has a 'ref' name.
+        '''
+        with self._lock:
+            self.refs[str(ref)] = issue_key
+
+    def add(self, issue_key: str, target: Any, link_type: str, summary: str = '') -> None:
+        '''
+        Queue a link between a created issue and a target issue.
+
+        Args:
+            issue_key (str): The key of the created issue (inward issue).
+            target (Any): The key of the linked issue (outward issue), or {'ref': name} for a node of the plan.
+            link_type (str): The type of the link (e.g. 'Related', 'Blocks').
+            summary (str, optional): The summary of the created issue, used when reporting failures.
+        '''
+        with self._lock:
+            self._links.append((issue_key, target, link_type, summary))
+
+    def resolve_target(self, target: Any) -> Optional[str]:
+        '''
+        Return the issue key of a link target, or None for a 'ref' that was not created.
+        '''
+        if isinstance(target, dict):
+            with self._lock:
+                return self.refs.get(str(target.get('ref')))
+        return target
+
+    def flush(self,
+              link_issues: Callable[[str, str, str], Any],
+              max_workers: int) -> List[Dict[str, Any]]:
+        '''
+        Resolve, deduplicate and send all the queued links, and empty the queue.
+
+        Args:
+            link_issues (Callable[[str, str, str], Any]): Function linking an issue key
+                to a target issue key with a link type (see Jira.link_jira_issues).
+            max_workers (int): Number of links sent concurrently.
+
+        Returns:
+            List[Dict[str, Any]]: The failed links, with their endpoints and error.
+        '''
+        with self._lock:
+            links, self._links = self._links, []
+
+        failures: List[Dict[str, Any]] = []
+        unique_links: Dict[Tuple[str, str, str], str] = {}
+        for issue_key, target, link_type, summary in links:
+            target_key = self.resolve_target(target)
+            if not target_key:
+                logging.error(f'Failed to link issue {issue_key} ("{summary}"): '
+                              f'the linked issue {target} was not created')
+                failures.append({'key': issue_key, 'target': str(target), 'type': link_type,
+                                 'summary': summary, 'error': 'Linked issue was not created'})
+                continue
+            unique_links.setdefault((issue_key, target_key, link_type), summary)
+        if not unique_links:
+            return failures
+
+        duplicates = len(links) - len(failures) - len(unique_links)
+        logging.info(f'Creating {len(unique_links)} issue links ({duplicates} duplicates skipped)')
+
+        def link(link_key: Tuple[str, str, str]) -> Dict[str, Any]:
+            issue_key, target_key, link_type = link_key
+            logging.debug('Requesting a "%s" link between %s --> %s', link_type, issue_key, target_key)
+            try:
+                link_issues(issue_key, target_key, link_type)
+                return {}
+            except Exception as e:
+                logging.error(f'Failed to create a "{link_type}" link between {issue_key} '
+                              f'("{unique_links[link_key]}") --> {target_key}: {e}')
+                return {'key': issue_key, 'target': target_key, 'type': link_type,
+                        'summary': unique_links[link_key], 'error': str(e)}
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                thread_name_prefix='jira-link') as executor:
+            failures.extend(result for result in executor.map(link, unique_links) if result)
+        return failures
+
+
+def link_target(link: Dict[str, Any]) -> Any:
+    '''
+    Return the target of an 'issuelinks' entry of the plan: the outward issue key,
+    or {'ref': name} when it refers to another node of the plan.
+    '''
+    outward_issue = link.get('outwardIssue') or {}
+    if 'ref' in outward_issue:
+        return {'ref': outward_issue['ref']}
+    return outward_issue.get('key', '')
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+'''
+metadata_cache.py
+
+This module provides the MetadataCache class, a persistent SQLite cache for Jira metadata.
+
+Jira metadata such as project IDs, board lists and sprint lists rarely changes
+between runs, but fetching it costs several round-trips (the project list alone can have thousands
+of entries). The cache stores every entry as JSON with its own expiration time, so repeated runs
+against the same project start without metadata requests.
+
+The default cache file is located under the user cache directory ($XDG_CACHE_HOME or ~/.cache).
+'''
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+APP_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+                             'jira-issues-creator')
+DEFAULT_METADATA_CACHE_FILE = os.path.join(APP_CACHE_DIR, 'metadata.sqlite3')
+
+# Defaults for the 'jira_cache' section of the Jira configuration file
+DEFAULT_CACHE_SETTINGS = {
+    'enabled': True,  # Persist the metadata between runs (otherwise it is cached for the run only)
+    'path': DEFAULT_METADATA_CACHE_FILE,  # Path of the SQLite cache file
+    'refresh': False,  # Ignore the stored entries and fetch everything again (--refresh-cache)
+    'ttl': {  # Time to live of the cached entries in seconds, by metadata type
+        'project': 604800,  # Project IDs (7 days)
+        'boards': 86400,  # Board lists (1 day)
+        'sprints': 3600,  # Sprint lists (1 hour)
+    },
+}
+
+
+class MetadataCache:
+    def __init__(self, path: Optional[str] = None, refresh: bool = False):
+        '''
+        Initializes a new instance of the MetadataCache class.
+
+        Args:
+            path (Optional[str]): Path of the SQLite cache file. When None, the entries are kept
+                in memory for the lifetime of the instance only.
+            refresh (bool): Ignore the entries stored before this instance was created.
+                Fetched values still replace them.
+        '''
+        if path:
+            path = os.path.expanduser(path)
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path or ':memory:'
+        self.refresh = refresh
+        self._refreshed_keys = set()  # Keys stored by this instance, valid in refresh mode
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS metadata ('
+                                     'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)')
+
+    def get(self, key: str) -> Optional[Any]:
+        '''
+        Return the cached value of a key, or None if it is missing or expired.
+        '''
+        if self.refresh and key not in self._refreshed_keys:
+            return None
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value, expires_at FROM metadata WHERE key = ?', (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        '''
+        Store the value of a key for `ttl` seconds.
+        '''
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO metadata (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value), time.time() + ttl))
+            self._refreshed_keys.add(key)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any], ttl: float) -> Any:
+        '''
+        Return the cached value of a key, or fetch and store it on a cache miss.
+
+        Args:
+            key (str): The cache key.
+            fetch (Callable[[], Any]): Function fetching the value. The value must be JSON serializable.
+            ttl (float): Time to live of a fetched value in seconds.
+
+        Returns:
+            Any: The cached or fetched value.
+        '''
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            logging.debug('Metadata cache hit: %s', key)
+            return value
+
+        self.misses += 1
+        logging.debug('Metadata cache miss: %s', key)
+        value = fetch()
+        self.set(key, value, ttl)
+        return value
+
+    def close(self) -> None:
+        '''
+        Log the cache statistics and close the cache file.
+        '''
+        logging.debug(f'Metadata cache "{self.path}": {self.hits} hits, {self.misses} misses')
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+'''
+plan_preflight.py
+
+This module provides the PlanPreflight class, a pre-flight resolution pass over an issues plan.
+
+Before any issue is created, the whole plan is walked once to collect the distinct sprints,
+users (assignee/reporter), components, versions and linked issue keys it refers to. They are
+resolved with batched and deduplicated calls:
+
+- Sprints: one sprint index of the project (see sprint_resolver).
+- Components and versions: one request each for the whole project.
+- Users: one request per distinct user.
+- Linked issues, epics and existing issues (the 'key' of a node): JQL searches of up to SEARCH_BATCH_SIZE keys.
+- Links to other nodes of the plan: the 'ref' names defined in the plan, without requests.
+
+Every unresolvable value is reported up front, so a bad value on the last node no longer
+leaves a partially created tree behind. The documents of a streamed plan share the values resolved
+by the previous documents, so a value used by every document is only looked up once.
+'''
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+import requests
+
+from issue_plan import iter_plan_nodes, field_values
+
+SEARCH_BATCH_SIZE = 100  # Maximum number of issue keys per JQL search
+USER_FIELDS = ('assignee', 'reporter')
+# Categories whose values belong to the project (the users and the issue keys are global)
+PROJECT_CATEGORIES = ('sprint', 'component', 'version')
+VERSION_FIELDS = ('fixVersions', 'versions')
+
+
+class PlanPreflight:
+    def __init__(self,
+                 jira: Any,
+                 project_key: str,
+                 check_refs: bool = True,
+                 resolved: Optional[Dict[str, Set[str]]] = None):
+        '''
+        Initializes a new instance of the PlanPreflight class.
+
+        Args:
+            jira (Jira): The Jira instance used for the lookups.
+            project_key (str): The key of the project where the plan will be created.
+            check_refs (bool, optional): Report the link refs that the plan does not define. Disabled for
+                the documents of a streamed plan, which can refer to the nodes of other documents.
+            resolved (Optional[Dict[str, Set[str]]], optional): The values resolved by previous pre-flight
+                passes, by category (and project), shared by the documents of a streamed plan. They are
+                not looked up again, and the values resolved by this pass are added. Defaults to None.
+        '''
+        self.jira = jira
+        self.project_key = project_key
+        self.check_refs = check_refs
+        self.resolved = {} if resolved is None else resolved
+        # Referenced values by category, each with the summaries of the nodes referring to it
+        self.references: Dict[str, Dict[str, Set[str]]] = {
+            'sprint': {}, 'user': {}, 'component': {}, 'version': {}, 'issue': {}, 'ref': {}}
+        # The 'ref' names of the plan nodes, which links can point to
+        self.defined_refs: Set[str] = set()
+
+    def collect(self, plan: Dict[str, Any]) -> None:
+        '''
+        Collect the distinct values that the nodes of a plan refer to.
+
+        Args:
+            plan (Dict[str, Any]): The loaded issues plan.
+        '''
+        for node, _, _ in iter_plan_nodes(plan):
+            summary = node.get('summary', '')
+            if node.get('sprint'):
+                self._add('sprint', node['sprint'], summary)
+            for field_name in USER_FIELDS:
+                for user in field_values(node.get(field_name) or []):
+                    self._add('user', user, summary)
+            for component in field_values(node.get('components') or []):
+                self._add('component', component, summary)
+            for field_name in VERSION_FIELDS:
+                for version in field_values(node.get(field_name) or []):
+                    self._add('version', version, summary)
+            if node.get('epicLink'):
+                self._add('issue', node['epicLink'], summary)
+            if node.get('key'):
+                self._add('issue', node['key'], summary)
+            if 'ref' in node:
+                self.defined_refs.add(str(node['ref']))
+            for link in node.get('issuelinks') or []:
+                outward_issue = link.get('outwardIssue') or {}
+                if 'ref' in outward_issue:
+                    if self.check_refs:
+                        self._add('ref', outward_issue['ref'], summary)
+                elif outward_issue.get('key'):
+                    self._add('issue', outward_issue['key'], summary)
+
+    def _add(self, category: str, value: Any, summary: str) -> None:
+        self.references[category].setdefault(str(value), set()).add(summary)
+
+    def resolve(self) -> Dict[str, Dict[str, Set[str]]]:
+        '''
+        Resolve all the collected values.
+
+        Returns:
+            Dict[str, Dict[str, Set[str]]]: The unresolvable values by category,
+                each with the summaries of the nodes referring to it.
+        '''
+        resolvers = {
+            'sprint': self._resolve_sprints,
+            'user': self._resolve_users,
+            'component': self._resolve_components,
+            'version': self._resolve_versions,
+            'issue': self._resolve_issue_keys,
+            'ref': self._resolve_refs,
+        }
+        unresolved: Dict[str, Dict[str, Set[str]]] = {}
+        for category, resolver in resolvers.items():
+            values = self.references[category]
+            scope = f'{category}:{self.project_key}' if category in PROJECT_CATEGORIES else category
+            resolved = self.resolved.setdefault(scope, set())
+            pending = [value for value in values if value not in resolved]
+            if not pending:
+                continue
+            logging.debug(f'Pre-flight: resolving {len(pending)} distinct {category} values')
+            missing = resolver(pending)
+            if category != 'ref':
+                # The refs are defined by the plan itself, so they are checked again for every plan
+                resolved.update(set(pending) - set(missing))
+            if missing:
+                unresolved[category] = {value: values[value] for value in missing}
+        return unresolved
+
+    def run(self, plan: Dict[str, Any], created_documents: int = 0) -> None:
+        '''
+        Collect and resolve the values of a plan, and report the unresolvable ones.
+
+        Args:
+            plan (Dict[str, Any]): The loaded issues plan.
+            created_documents (int, optional): The number of documents of a streamed plan that were
+                created before this one, for the error message. Defaults to 0.
+
+        Raises:
+            RuntimeError: If any value of the plan cannot be resolved.
+        '''
+        self.collect(plan)
+        unresolved = self.resolve()
+        if not unresolved:
+            logging.debug('Pre-flight: all the plan values were resolved')
+            return
+
+        for category, values in unresolved.items():
+            for value, summaries in values.items():
+                logging.error(f'Pre-flight: {category} "{value}" cannot be resolved. Used by: '
+                              + ', '.join(f'"{summary}"' for summary in sorted(summaries)))
+        count = sum(len(values) for values in unresolved.values())
+        if created_documents:
+            raise RuntimeError(f'{count} values of the plan cannot be resolved, no issue of this document was '
+                               f'created, but the {created_documents} previous documents were created. '
+                               'Check log for details.')
+        raise RuntimeError(f'{count} values of the plan cannot be resolved, no issue was created. '
+                           'Check log for details.')
+
+    def _resolve_sprints(self, sprint_names: List[str]) -> List[str]:
+        return [name for name in sprint_names
+                if self.jira.sprint_resolver.resolve(self.project_key, name) is None]
+
+    def _resolve_users(self, usernames: List[str]) -> List[str]:
+        def user_exists(username: str) -> bool:
+            try:
+                self.jira.send_request(api_type='user', method='get',
+                                       jira_request_data={'username': username})
+                return True
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
+                    return False
+                # Only a missing user is definite: e.g. Jira Cloud rejects the 'username' parameter
+                logging.warning(f'Pre-flight: user "{username}" cannot be checked, it is left to Jira: {e}')
+                return True
+
+        with ThreadPoolExecutor(max_workers=max(1, self.jira.max_workers)) as executor:
+            exists = list(executor.map(user_exists, usernames))
+        return [username for username, found in zip(usernames, exists) if not found]
+
+    def _resolve_components(self, component_names: List[str]) -> List[str]:
+        components = self.jira.send_request(api_type=f'project/{self.project_key}/components', method='get')
+        known = {component.get('name') for component in components}
+        return [name for name in component_names if name not in known]
+
+    def _resolve_versions(self, version_names: List[str]) -> List[str]:
+        versions = self.jira.send_request(api_type=f'project/{self.project_key}/versions', method='get')
+        known = {version.get('name') for version in versions} | {str(version.get('id')) for version in versions}
+        return [name for name in version_names if name not in known]
+
+    def _resolve_refs(self, refs: List[str]) -> List[str]:
+        return [ref for ref in refs if ref not in self.defined_refs]
+
+    def _resolve_issue_keys(self, issue_keys: List[str]) -> List[str]:
+        found: Set[str] = set()
+        for start in range(0, len(issue_keys), SEARCH_BATCH_SIZE):
+            batch = issue_keys[start:start + SEARCH_BATCH_SIZE]
+            response = self.jira.send_request(api_type='search', method='post', jira_request_data={
+                'jql': 'key in ({})'.format(', '.join(f'"{key}"' for key in batch)),
+                'fields': ['key'],
+                'maxResults': len(batch),
+                # Unknown keys produce warnings instead of failing the whole search
+                'validateQuery': 'warn',
+            })
+            found.update(issue.get('key', '').upper() for issue in response.get('issues', []))
+        return [key for key in issue_keys if key.upper() not in found]
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+'''
+plan_stream.py
+
+This module provides the streaming reader of large issues files.
+
+A streamed issues file is a multi-document YAML file (documents separated by '---') or a
+JSON Lines file (.jsonl/.ndjson, one JSON document per line). Every document is either:
+
+- A plan fragment, with the same 'project_key', 'epics' and 'issues' keys as a plan, or
+- A single epic or issue subtree (an epic when its 'issuetype' is 'Epic').
+
+The documents are parsed one at a time, so the issues of a document can be created before the
+next one is read, and the memory use is bounded by the largest document instead of the whole file.
+Unlike plans, streamed documents are not rendered as Jinja2 templates.
+'''
+
+import json
+import os
+from typing import Any, Dict, Iterator
+
+import yaml
+
+JSON_LINES_EXTENSIONS = ('.jsonl', '.ndjson')
+PLAN_KEYS = frozenset(['project_key', 'epics', 'issues'])
+
+
+def iter_plan_documents(issues_file: str) -> Iterator[Dict[str, Any]]:
+    '''
+    Read the documents of a streamed issues file one at a time.
+
+    Args:
+        issues_file (str): Path of a multi-document YAML file or of a JSON Lines file.
+
+    Yields:
+        Dict[str, Any]: Every document as a plan fragment (see as_plan_document).
+
+    Raises:
+        FileNotFoundError: If the issues file is not found.
+        ValueError: If a document is not valid or is neither a plan fragment nor an issue.
+        yaml.YAMLError: If there's an error parsing a YAML document.
+    '''
+    with open(issues_file, 'r', encoding='utf-8') as stream:
+        if os.path.splitext(issues_file)[1].lower() in JSON_LINES_EXTENSIONS:
+            for line_number, line in enumerate(stream, 1):
+                if not line.strip():
+                    continue
+                try:
+                    document = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f'Invalid JSON document on line {line_number} of "{issues_file}": {e}')
+                yield as_plan_document(document)
+        else:
+            # The YAML documents are parsed lazily, as the stream is read
+            for document in yaml.safe_load_all(stream):
+                if document is not None:
+                    yield as_plan_document(document)
+
+
+def as_plan_document(document: Any) -> Dict[str, Any]:
+    '''
+    Return a streamed document as a plan fragment, wrapping a single epic or issue subtree.
+
+    Raises:
+        ValueError: If the document is not a mapping.
+    '''
+    if not isinstance(document, dict):
+        raise ValueError(f'Streamed documents must be plan fragments, epics or issues, got: {document!r}')
+    if 'summary' not in document and PLAN_KEYS.intersection(document):
+        return document
+    if document.get('issuetype') == 'Epic':
+        return {'epics': [document]}
+    return {'issues': [document]}
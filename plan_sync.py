@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+'''
+plan_sync.py
+
+This module provides the PlanSync class, the incremental sync of an edited plan to its existing issues (--sync).
+
+Every node of the plan is mapped to its existing issue:
+
+- A node that was not edited since the last run has the same identifier (content hash) as in the
+  run journal, so it is skipped without any request.
+- An edited node is mapped by its path (its 'ref', or else its position in the plan tree), which the
+  run journal records with the key of every created node, then by its explicit 'key' field, or else
+  by its summary and issue type (see duplicate_index). Its current fields are fetched with JQL searches
+  of up to SEARCH_BATCH_SIZE keys, compared to the fields built from the plan, and only the fields that
+  differ are updated, with concurrent PUTs.
+
+The nodes that are not mapped are created as usual, under the existing issues of their parents.
+'''
+
+import logging
+from typing import Any, Dict, List, Set, Tuple
+
+from issue_plan import iter_plan_nodes
+from plan_preflight import SEARCH_BATCH_SIZE
+
+# Fields that an update cannot change: the issue type and the project (and the parent and epic of the
+# issue, which are not part of the fields built for the comparison)
+SYNC_IGNORED_FIELDS = frozenset(['project', 'issuetype'])
+# Properties that identify a value set by its ID or name, when Jira returns it as an object
+VALUE_PROPERTIES = ('id', 'key', 'name', 'value')
+
+
+def value_matches(planned: Any, current: Any) -> bool:
+    '''
+    Return True if the current value of a field matches the value built from the plan. The current
+    value can have more properties than the planned one (e.g. a priority set as {'name': 'High'}
+    is returned with its 'id' and 'self'), and the order of multi-value fields is ignored.
+    '''
+    if isinstance(planned, dict):
+        return isinstance(current, dict) and all(value_matches(value, current.get(name))
+                                                 for name, value in planned.items())
+    if isinstance(planned, list):
+        return (isinstance(current, list) and len(planned) == len(current)
+                and all(any(value_matches(value, current_value) for current_value in current)
+                        for value in planned))
+    if isinstance(current, dict):
+        return any(value_matches(planned, current.get(name)) for name in VALUE_PROPERTIES if name in current)
+    if isinstance(current, list) and len(current) == 1:
+        # A single value, returned as a multi-value field (e.g. the sprint)
+        return value_matches(planned, current[0])
+    if planned in (None, '') or current in (None, ''):
+        return planned in (None, '') and current in (None, '')
+    if isinstance(planned, (int, float)) and not isinstance(planned, bool):
+        try:
+            return float(planned) == float(current)
+        except (TypeError, ValueError):
+            return False
+    return str(planned).strip() == str(current).strip()
+
+
+class PlanSync:
+    def __init__(self, jira: Any, project_key: str):
+        '''
+        Initializes a new instance of the PlanSync class.
+
+        Args:
+            jira (Jira): The Jira instance of the run, with its run journal started.
+            project_key (str): The key of the project of the plan.
+        '''
+        self.jira = jira
+        self.project_key = project_key
+
+    def run(self, plan: Dict[str, Any]) -> None:
+        '''
+        Map the nodes of a plan to their existing issues, and update the fields that were edited.
+        The mapped nodes are recorded in the run journal, so creating the plan reuses their issues.
+        The existing issues of the nodes that are not mapped by the journal are searched too (see
+        Jira.find_existing_issues).
+
+        Args:
+            plan (Dict[str, Any]): The loaded plan (or plan document), with its node identifiers computed.
+
+        Raises:
+            RuntimeError: If an issue that a node is mapped to does not exist.
+        '''
+        nodes = [node for node, _, _ in iter_plan_nodes(plan)]
+        unchanged_keys = {id(node): self.jira._journaled_issue_key(node) for node in nodes}
+        claimed: Set[str] = set()
+        for node in nodes:
+            issue_key = unchanged_keys[id(node)]
+            if issue_key:
+                claimed.add(issue_key.upper())
+                # The path of the node is recorded again if the node moved in the plan
+                self.jira._record_created_issue(node, issue_key)
+
+        # The edited nodes are mapped by their path first, unless another node of the plan kept the issue
+        tracked_keys: Dict[int, str] = {}
+        for node in nodes:
+            issue_key = None if unchanged_keys[id(node)] else self.jira._tracked_issue_key(node)
+            if issue_key and issue_key.upper() not in claimed:
+                tracked_keys[id(node)] = issue_key
+                claimed.add(issue_key.upper())
+        self.jira.find_existing_issues(self.project_key, plan, tracked_keys)
+
+        unchanged = 0
+        edited: List[Tuple[Dict[str, Any], str]] = []
+        for node in nodes:
+            if unchanged_keys[id(node)]:
+                unchanged += 1
+                continue
+            issue_key = tracked_keys.get(id(node)) or self.jira._matched_issue_key(node)
+            if issue_key:
+                edited.append((node, issue_key))
+
+        planned = {id(node): self.planned_fields(node) for node, _ in edited}
+        current_fields = self.fetch_fields(sorted({issue_key for _, issue_key in edited}),
+                                           sorted({name for fields in planned.values() for name in fields}))
+        missing = sorted({issue_key for _, issue_key in edited if issue_key.upper() not in current_fields})
+        if missing:
+            raise RuntimeError(f'The issues {", ".join(missing)} of the plan do not exist, nothing was synced')
+
+        updated = 0
+        for node, issue_key in edited:
+            self.jira._record_created_issue(node, issue_key)
+            current = current_fields[issue_key.upper()]
+            changes = {name: value for name, value in planned[id(node)].items()
+                       if not value_matches(value, current.get(name))}
+            if changes:
+                logging.info(f'Issue {issue_key} "{node.get("summary", "")}" changed: {", ".join(sorted(changes))}')
+                self.jira.update_queue.add(issue_key, changes, node.get('summary', ''))
+                updated += 1
+            elif self.jira.journal is not None:
+                # Up to date: the plan's post-creation fields are not sent again when the plan is created
+                self.jira.journal.record_updated(issue_key)
+        self.jira.flush_post_creation_updates()
+        logging.info(f'Sync of the "{self.project_key}" project: {unchanged} issues unchanged since the last run, '
+                     f'{len(edited) - updated} edited issues up to date and {updated} issues updated')
+
+    def planned_fields(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        '''
+        Return the Jira fields of a node, as they are built for its creation and post-creation update.
+        '''
+        create_data, update_data = self.jira._build_issue_payloads(self.project_key, node)
+        fields = {**create_data['fields'], **update_data['fields']}
+        return {name: value for name, value in fields.items() if name not in SYNC_IGNORED_FIELDS}
+
+    def fetch_fields(self, issue_keys: List[str], field_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        '''
+        Fetch the current fields of issues, with JQL searches of up to SEARCH_BATCH_SIZE keys.
+
+        Args:
+            issue_keys (List[str]): The keys of the issues.
+            field_names (List[str]): The Jira fields to fetch (the fields that the plan sets).
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The fields of every found issue, by upper case issue key.
+        '''
+        fields: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(issue_keys), SEARCH_BATCH_SIZE):
+            batch = issue_keys[start:start + SEARCH_BATCH_SIZE]
+            response = self.jira.send_request(api_type='search', method='post', jira_request_data={
+                'jql': 'key in ({})'.format(', '.join(f'"{key}"' for key in batch)),
+                'fields': field_names,
+                'maxResults': len(batch),
+                # Unknown keys produce warnings instead of failing the whole search
+                'validateQuery': 'warn',
+            })
+            for issue in response.get('issues', []):
+                fields[issue.get('key', '').upper()] = issue.get('fields') or {}
+        return fields
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+'''
+prompt_batch.py
+
+This module provides the batch generation of tickets from a prompts file.
+
+A prompts file lists the tickets to generate, one row per ticket, with a 'prompt', a 'ticket_type'
+and a 'project' column. It is either a CSV file with a header row, or a JSON Lines file
+(.jsonl/.ndjson) with one object per line. All the rows are sent through the ticket generation
+chain with bounded concurrency, and the generated tickets are written to a multi-document YAML
+plan (one document per ticket) that can be reviewed, then created with --issues-stream.
+'''
+
+import csv
+import json
+import logging
+import os
+from typing import Any, Dict, List, Tuple
+
+import yaml
+
+from config_utils import load_yaml
+from plan_stream import JSON_LINES_EXTENSIONS
+
+PROMPT_COLUMNS = ('prompt', 'ticket_type', 'project')
+
+
+def read_prompt_rows(prompts_file: str) -> List[Dict[str, str]]:
+    '''
+    Read the rows of a CSV or JSON Lines prompts file.
+
+    Args:
+        prompts_file (str): Path of the prompts file.
+
+    Returns:
+        List[Dict[str, str]]: The rows, with their 'prompt', 'ticket_type' and 'project' values.
+
+    Raises:
+        FileNotFoundError: If the prompts file is not found.
+        ValueError: If a row is not valid or misses one of the columns.
+    '''
+    with open(prompts_file, 'r', encoding='utf-8', newline='') as rows_file:
+        if os.path.splitext(prompts_file)[1].lower() in JSON_LINES_EXTENSIONS:
+            rows = [json.loads(line) for line in rows_file if line.strip()]
+        else:
+            rows = list(csv.DictReader(rows_file))
+
+    for row_number, row in enumerate(rows, 1):
+        if not isinstance(row, dict):
+            raise ValueError(f'Row {row_number} of "{prompts_file}" is not an object')
+        missing_columns = [column for column in PROMPT_COLUMNS if not row.get(column)]
+        if missing_columns:
+            raise ValueError(f'Row {row_number} of "{prompts_file}" misses: {", ".join(missing_columns)}')
+    return rows
+
+
+def generate_plan_documents(chat: Any,
+                            rows: List[Dict[str, str]],
+                            max_concurrency: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    '''
+    Generate the tickets of the prompt rows, with at most `max_concurrency` concurrent generations.
+
+    Args:
+        chat (ChatHandler): The ticket generation chat handler.
+        rows (List[Dict[str, str]]): The prompt rows (see read_prompt_rows).
+        max_concurrency (int): Maximum number of concurrent generations.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: The generated plan documents, in the order
+            of the rows, and the failed rows with their error.
+    '''
+    logging.info(f'Generating {len(rows)} tickets with up to {max_concurrency} concurrent generations')
+    prompts_parameters = [{'ticket_type': row['ticket_type'],
+                           'issue_description': row['prompt'],
+                           'project': row['project']} for row in rows]
+    responses = chat.batch_invoke_chain(prompts_parameters, max_concurrency=max_concurrency)
+
+    documents: List[Dict[str, Any]] = []
+    failures: List[Dict[str, Any]] = []
+    for row_number, (row, parameters, response) in enumerate(zip(rows, prompts_parameters, responses), 1):
+        try:
+            if isinstance(response, Exception):
+                raise response
+            document = load_yaml(response)
+            if not isinstance(document, dict):
+                raise ValueError(f'the generated ticket is not a YAML mapping: {response!r}')
+        except Exception as e:
+            logging.error(f'Failed to generate the ticket of row {row_number} ("{row["prompt"]}"): {e}')
+            # An unusable response is not reused by the next run
+            chat.invalidate_cached_response(parameters)
+            failures.append({'row': row_number, 'prompt': row['prompt'], 'error': str(e)})
+            continue
+        document.setdefault('project_key', row['project'])
+        documents.append(document)
+    return documents, failures
+
+
+def write_plan_documents(plan_file: str, documents: List[Dict[str, Any]]) -> None:
+    '''
+    Write generated plan documents to a multi-document YAML file (see plan_stream).
+    '''
+    os.makedirs(os.path.dirname(os.path.abspath(plan_file)), exist_ok=True)
+    with open(plan_file, 'w', encoding='utf-8') as plan:
+        yaml.safe_dump_all(documents, plan, sort_keys=False, allow_unicode=True)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+'''
+rate_limiter.py
+
+This module provides the client-side rate limiting and retry policy of the Jira requests.
+
+- TokenBucket: A token bucket limiter shared by all the threads of a process and, through a
+  locked state file, by all the processes of the host that use the same Jira instance.
+- RetryPolicy: Decides which failed requests are retried and how long to wait before retrying
+  (exponential backoff with jitter, honoring the Retry-After header).
+- RequestStats: Thread-safe counters of requests, retries and time spent throttled.
+'''
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, the bucket is shared by threads only
+    fcntl = None
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, state_file: Optional[str] = None):
+        '''
+        Initializes a new instance of the TokenBucket class.
+
+        Args:
+            rate (float): Number of tokens (requests) added per second.
+            capacity (float): Maximum number of tokens, i.e. the allowed burst of requests.
+            state_file (Optional[str]): Path of the file holding the bucket state. Processes using
+                the same file share the bucket. When None, the bucket is shared by threads only.
+        '''
+        self.rate = rate
+        self.capacity = capacity
+        self.state_file = state_file if fcntl else None
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated = time.time()
+        if self.state_file:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+
+    def acquire(self) -> float:
+        '''
+        Take a token from the bucket, waiting until one is available.
+
+        Returns:
+            float: The number of seconds spent waiting for the token.
+        '''
+        waited = 0.0
+        while True:
+            with self._lock:
+                wait_time = self._take_token()
+            if wait_time <= 0:
+                return waited
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def _take_token(self) -> float:
+        '''
+        Refill the bucket and take a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the number of seconds until the next token.
+        '''
+        if not self.state_file:
+            return self._take_token_from_state()
+
+        with open(self.state_file, 'a+') as state:
+            fcntl.flock(state, fcntl.LOCK_EX)
+            try:
+                state.seek(0)
+                try:
+                    stored = json.loads(state.read() or '{}')
+                except ValueError:
+                    stored = {}
+                self._tokens = stored.get('tokens', self.capacity)
+                self._updated = stored.get('updated', time.time())
+                wait_time = self._take_token_from_state()
+                state.seek(0)
+                state.truncate()
+                state.write(json.dumps({'tokens': self._tokens, 'updated': self._updated}))
+                state.flush()
+            finally:
+                fcntl.flock(state, fcntl.LOCK_UN)
+        return wait_time
+
+    def _take_token_from_state(self) -> float:
+        now = time.time()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+class RetryPolicy:
+    # Methods that can be safely sent again after any transient failure
+    IDEMPOTENT_METHODS = {'GET', 'PUT', 'DELETE', 'HEAD', 'OPTIONS'}
+    # Statuses retried for idempotent methods
+    RETRY_STATUSES = {429, 502, 503, 504}
+
+    def __init__(self, max_retries: int = 5, backoff_base: float = 1.0, backoff_max: float = 60.0):
+        '''
+        Initializes a new instance of the RetryPolicy class.
+
+        Args:
+            max_retries (int): Maximum number of retries of a request.
+            backoff_base (float): Delay of the first retry in seconds, doubled on every retry.
+            backoff_max (float): Maximum delay between retries in seconds.
+        '''
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def should_retry_status(self, method: str, status_code: int, retry_after: Optional[str]) -> bool:
+        '''
+        Return whether a request that got an error response can be safely retried.
+        Non-idempotent requests (e.g. issue creation) are retried only when Jira explicitly
+        throttled them (429, or 503 with a Retry-After header), so they were not processed.
+        '''
+        if method.upper() in self.IDEMPOTENT_METHODS:
+            return status_code in self.RETRY_STATUSES
+        return status_code == 429 or (status_code == 503 and retry_after is not None)
+
+    def should_retry_error(self, method: str, error: Exception) -> bool:
+        '''
+        Return whether a request that failed without a response can be safely retried.
+        Non-idempotent requests are retried only when the connection was never established.
+        '''
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        return (method.upper() in self.IDEMPOTENT_METHODS
+                and isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)))
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        '''
+        Return the number of seconds to wait before a retry.
+
+        Args:
+            attempt (int): The number of the retry, starting from 0.
+            retry_after (Optional[str]): The Retry-After header of the response, in seconds or as an HTTP date.
+
+        Returns:
+            float: The Retry-After delay if present, otherwise an exponential backoff with full jitter.
+        '''
+        if retry_after:
+            try:
+                return min(self.backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                try:
+                    return min(self.backoff_max,
+                               max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()))
+                except (TypeError, ValueError):
+                    logging.debug(f'Ignoring an invalid Retry-After header: "{retry_after}"')
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class RequestStats:
+    def __init__(self):
+        '''
+        Initializes a new instance of the RequestStats class.
+        '''
+        self._lock = threading.Lock()
+        self.requests = 0  # Requests sent, including retries
+        self.retries = 0  # Retried requests
+        self.throttled_seconds = 0.0  # Time spent waiting for retries of throttled/failed requests
+        self.rate_limit_seconds = 0.0  # Time spent waiting for the client-side rate limiter
+
+    def add(self, **counters: float) -> None:
+        '''
+        Add values to the counters, e.g. stats.add(requests=1, retries=1).
+        '''
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {'requests': self.requests,
+                    'retries': self.retries,
+                    'throttled_seconds': round(self.throttled_seconds, 3),
+                    'rate_limit_seconds': round(self.rate_limit_seconds, 3)}
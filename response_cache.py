@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+'''
+response_cache.py
+
+This module provides the ResponseCache class, a persistent SQLite cache of LLM responses.
+
+Generating a ticket costs tokens and tens of seconds of model latency. The responses are stored
+by a hash of the fully rendered prompt, the model name and the backend (OpenAI or Ollama), so
+generating the same tickets again (e.g. re-running a batch after a Jira failure) reuses them.
+The cache keeps at most `max_entries` responses and evicts the least recently used ones.
+'''
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from metadata_cache import APP_CACHE_DIR
+
+DEFAULT_RESPONSE_CACHE_FILE = os.path.join(APP_CACHE_DIR, 'llm_responses.sqlite3')
+
+# Defaults for the 'llm_cache' section of the Jira configuration file
+DEFAULT_LLM_CACHE_SETTINGS = {
+    'enabled': False,  # Reuse the stored responses of identical prompts (can be enabled with --llm-cache)
+    'path': DEFAULT_RESPONSE_CACHE_FILE,  # Path of the SQLite cache file
+    'max_entries': 1000,  # Maximum number of stored responses, the least recently used are evicted
+}
+
+
+def response_cache_key(backend: str, model_name: str, prompt: str) -> str:
+    '''
+    Return the cache key of the response of a model to a fully rendered prompt.
+    '''
+    content = json.dumps({'backend': backend, 'model': model_name, 'prompt': prompt}, sort_keys=True)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path: str = DEFAULT_RESPONSE_CACHE_FILE, max_entries: int = 1000):
+        '''
+        Initializes a new instance of the ResponseCache class.
+
+        Args:
+            path (str): Path of the SQLite cache file.
+            max_entries (int): Maximum number of stored responses.
+        '''
+        path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS responses ('
+                                     'key TEXT PRIMARY KEY, response TEXT NOT NULL, last_used REAL NOT NULL)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)')
+
+    def get(self, key: str) -> Optional[str]:
+        '''
+        Return the stored response of a key, or None, and mark it as recently used.
+        '''
+        with self._lock, self._connection:
+            row = self._connection.execute('SELECT response FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                self._connection.execute('UPDATE responses SET last_used = ? WHERE key = ?', (time.time(), key))
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        logging.debug('LLM response cache hit: %s', key)
+        return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        '''
+        Store the response of a key, evicting the least recently used responses above `max_entries`.
+        '''
+        with self._lock, self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO responses (key, response, last_used) VALUES (?, ?, ?)',
+                                     (key, response, time.time()))
+            self._connection.execute('DELETE FROM responses WHERE key IN ('
+                                     'SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                                     (self.max_entries,))
+
+    def invalidate(self, key: str) -> None:
+        '''
+        Remove the stored response of a key.
+        '''
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def close(self) -> None:
+        '''
+        Log the cache statistics and close the cache file.
+        '''
+        logging.debug(f'LLM response cache "{self.path}": {self.hits} hits, {self.misses} misses')
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+
+'''
+run_journal.py
+
+This module provides the RunJournal class, an append-only journal of an issues plan run.
+
+The journal starts with the plan of the run (or the path of a streamed issues file), followed by one JSON line per completed step:
+the key created for every plan node, the post-creation updates and the issue links that were
+sent. Plan nodes are identified by a stable hash of their content and of the content of their
+ancestors, so a resumed run of the same plan skips the completed steps and reuses the created
+keys, while a node edited between the runs is created again. Every created key is also recorded
+with the path of its node (its 'ref', or else its position in the plan tree, within the plan file),
+which does not change when the node is edited, so a sync run maps the edited nodes to their issues.
+
+Starting a run keeps the steps of the previous runs (of the same plan or of other plans) that a plan
+can still reuse: the journal is compacted into a new file with these steps and the new plan record,
+which then replaces the previous journal at once, so an interrupted compaction loses nothing. Only
+the last node identifier and path of every issue are kept (with its updates and links), for up to
+MAX_JOURNALED_ISSUES issues. A resumed run only reuses the steps recorded after the last plan record,
+while a sync run (--sync) reuses all of them, so the nodes that were not edited since they were
+created are recognized without any request.
+'''
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from issue_plan import iter_plan_nodes
+
+MAX_JOURNALED_ISSUES = 10000  # Issues whose steps are kept when the journal is compacted, the last recorded ones
+
+
+def plan_node_ids(plan: Dict[str, Any], occurrences: Optional[Dict[str, int]] = None) -> Dict[int, str]:
+    '''
+    Compute the stable identifiers of the nodes of a plan.
+
+    Args:
+        plan (Dict[str, Any]): The loaded issues plan.
+        occurrences (Optional[Dict[str, int]], optional): The occurrence counters of the node hashes,
+            shared by the documents of a streamed plan. Defaults to new counters.
+
+    Returns:
+        Dict[int, str]: The identifier of every node, by the id() of the node dictionary.
+    '''
+    node_ids: Dict[int, str] = {}
+    # Identical siblings are told apart by their number of occurrences
+    occurrences = {} if occurrences is None else occurrences
+    for node, _, parent in iter_plan_nodes(plan):
+        parent_id = node_ids[id(parent)] if parent is not None else plan.get('project_key', '')
+        content = json.dumps({name: value for name, value in node.items() if name != 'issues'},
+                             sort_keys=True, default=str)
+        digest = hashlib.sha256(f'{parent_id}\n{content}'.encode('utf-8')).hexdigest()
+        occurrences[digest] = occurrences.get(digest, 0) + 1
+        node_ids[id(node)] = f'{digest[:32]}-{occurrences[digest]}'
+    return node_ids
+
+
+def plan_node_paths(plan: Dict[str, Any], document: int = 0, plan_file: Optional[str] = None) -> Dict[int, str]:
+    '''
+    Compute the paths of the nodes of a plan: the 'ref' of a node, or else its position in the plan
+    tree, under the path of its parent. Unlike the node identifiers, the path of a node does not change
+    when the node or its ancestors are edited.
+
+    Args:
+        plan (Dict[str, Any]): The loaded issues plan.
+        document (int, optional): The position of the plan document in a streamed plan. Defaults to 0.
+        plan_file (Optional[str], optional): The path of the plan file. The paths of the plans that are
+            not read from a file are only told apart by their project key. Defaults to None.
+
+    Returns:
+        Dict[int, str]: The path of every node, by the id() of the node dictionary.
+    '''
+    scope = plan_file or plan.get('project_key', '')
+    node_paths: Dict[int, str] = {}
+    for root_list in ('epics', 'issues'):
+        _add_node_paths(plan.get(root_list) or [], scope, f'{scope}:{document}/{root_list}', node_paths)
+    return node_paths
+
+
+def _add_node_paths(nodes: List[Dict[str, Any]], scope: str, parent_path: str, node_paths: Dict[int, str]) -> None:
+    for position, node in enumerate(nodes):
+        path = f'{scope}:ref:{node["ref"]}' if node.get('ref') else f'{parent_path}/{position}'
+        node_paths[id(node)] = path
+        _add_node_paths(node.get('issues') or [], scope, path, node_paths)
+
+
+class RunJournal:
+    def __init__(self, path: str):
+        '''
+        Initializes a new instance of the RunJournal class.
+
+        Args:
+            path (str): The path of the journal file.
+        '''
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        # Completed steps: created keys by node identifier and by node path, updated keys and sent links
+        self._created: Dict[str, str] = {}
+        self._paths: Dict[str, str] = {}
+        self._node_paths: Dict[str, str] = {}
+        self._updated: Set[str] = set()
+        self._linked: Set[Tuple[str, str, str]] = set()
+
+    def start(self,
+              plan: Optional[str] = None,
+              plan_file: Optional[str] = None,
+              keep_steps: bool = False,
+              issues_file: Optional[str] = None) -> None:
+        '''
+        Start the journal of the plan of a run. The steps of the previous runs that a plan can still reuse
+        are kept (see _prune), in a compacted file that replaces the journal file.
+
+        Args:
+            plan (Optional[str], optional): The plan of the run, as given to the creator (YAML content).
+            plan_file (Optional[str], optional): The path of the streamed issues file of the run.
+            keep_steps (bool, optional): Reuse the completed steps of the previous runs in this run
+                (a sync run). Otherwise they are only kept for later sync runs. Defaults to False.
+            issues_file (Optional[str], optional): The path of the issues file that the plan was read from.
+        '''
+        record = {'stage': 'plan', 'plan': plan}
+        if issues_file:
+            record['issues_file'] = os.path.abspath(issues_file)
+        if plan_file:
+            record = {'stage': 'plan', 'plan_file': os.path.abspath(plan_file)}
+        if os.path.exists(self.path):
+            self._load()
+            self._prune()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # The journal file is only replaced once the compacted file is complete
+        compacted_path = f'{self.path}.tmp'
+        with self._lock:
+            self._file = open(compacted_path, 'w', encoding='utf-8')
+            if keep_steps:
+                self._write(record)
+            # The previous steps are written before the plan record of a regular run, so resuming
+            # the run does not reuse them
+            for node_id, issue_key in self._created.items():
+                self._write(self._create_record(node_id, issue_key, self._node_paths.get(node_id)))
+            for issue_key in sorted(self._updated):
+                self._write({'stage': 'update', 'key': issue_key})
+            for issue_key, target_key, link_type in sorted(self._linked):
+                self._write({'stage': 'link', 'key': issue_key, 'target': target_key, 'type': link_type})
+            if not keep_steps:
+                self._write(record)
+                self._reset()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(compacted_path, self.path)
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+    def resume(self) -> Dict[str, Any]:
+        '''
+        Load the journal of the previous run and continue appending to it.
+
+        Returns:
+            Dict[str, Any]: The plan record of the previous run, with its 'plan' (and its 'issues_file')
+                or its 'plan_file'.
+
+        Raises:
+            FileNotFoundError: If there is no journal to resume.
+            ValueError: If the journal does not start with a plan.
+        '''
+        plan = self._load(last_run=True)
+        if plan is None:
+            raise ValueError(f'The run journal "{self.path}" has no plan to resume')
+
+        logging.info(f'Resuming the run journal "{self.path}": {len(self._created)} issues created, '
+                     f'{len(self._updated)} updated and {len(self._linked)} links created')
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return plan
+
+    def _load(self, last_run: bool = False) -> Optional[Dict[str, Any]]:
+        '''
+        Load the completed steps of the journal file, and return its last plan record (None if there is none).
+
+        Args:
+            last_run (bool, optional): Only load the steps recorded after the last plan record. Defaults to False.
+        '''
+        plan = None
+        with open(self.path, 'r', encoding='utf-8') as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by an interrupted run
+                    continue
+                stage = record.get('stage')
+                if stage == 'plan':
+                    plan = record
+                    if last_run:
+                        self._reset()
+                elif stage == 'create':
+                    self._add_created(record['node'], record['key'], record.get('path'))
+                elif stage == 'update':
+                    self._updated.add(record['key'])
+                elif stage == 'link':
+                    self._linked.add((record['key'], record['target'], record['type']))
+        return plan
+
+    def _prune(self) -> None:
+        '''
+        Drop the steps that no plan can reuse: the node identifiers and paths that a later step recorded
+        for another issue, the issues left without any of them, and the oldest issues beyond MAX_JOURNALED_ISSUES.
+        '''
+        # The last node identifier of every issue, in the order of their last recording
+        last_node_ids: Dict[str, str] = {}
+        for node_id, issue_key in self._created.items():
+            last_node_ids.pop(issue_key, None)
+            last_node_ids[issue_key] = node_id
+        kept = list(last_node_ids.items())[-MAX_JOURNALED_ISSUES:]
+        self._created = {node_id: issue_key for issue_key, node_id in kept}
+        self._node_paths = {node_id: path for node_id, path in self._node_paths.items()
+                            if node_id in self._created and self._paths.get(path) == self._created[node_id]}
+        self._paths = {path: self._created[node_id] for node_id, path in self._node_paths.items()}
+        issue_keys = set(self._created.values())
+        self._updated &= issue_keys
+        self._linked = {link for link in self._linked if link[0] in issue_keys}
+
+    def _reset(self) -> None:
+        self._created, self._paths, self._node_paths = {}, {}, {}
+        self._updated, self._linked = set(), set()
+
+    def _add_created(self, node_id: str, issue_key: str, path: Optional[str]) -> None:
+        # The identifiers are kept in the order of their last recording (see _prune)
+        self._created.pop(node_id, None)
+        self._created[node_id] = issue_key
+        if path:
+            self._paths[path] = issue_key
+            self._node_paths[node_id] = path
+
+    def _create_record(self, node_id: str, issue_key: str, path: Optional[str]) -> Dict[str, Any]:
+        record = {'stage': 'create', 'node': node_id, 'key': issue_key}
+        if path and self._paths.get(path) == issue_key:
+            record['path'] = path
+        return record
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        # Called with the lock held. One line per step, flushed right away so it survives a crash of the run
+        if self._file is not None:
+            self._file.write(json.dumps(record, default=str) + '\n')
+            self._file.flush()
+
+    def issue_key(self, node_id: str) -> Optional[str]:
+        '''
+        Return the key created for a plan node by a previous run, or None.
+        '''
+        return self._created.get(node_id)
+
+    def path_issue_key(self, path: str) -> Optional[str]:
+        '''
+        Return the key last recorded for a plan node path (see plan_node_paths), or None.
+        '''
+        return self._paths.get(path)
+
+    def record_created(self, node_id: str, issue_key: str, path: Optional[str] = None) -> None:
+        with self._lock:
+            if self._created.get(node_id) == issue_key and (not path or self._paths.get(path) == issue_key):
+                # Already recorded
+                return
+            self._add_created(node_id, issue_key, path)
+            self._write(self._create_record(node_id, issue_key, path))
+
+    def is_updated(self, issue_key: str) -> bool:
+        return issue_key in self._updated
+
+    def record_updated(self, issue_key: str) -> None:
+        with self._lock:
+            self._updated.add(issue_key)
+            self._write({'stage': 'update', 'key': issue_key})
+
+    def is_linked(self, issue_key: str, target_key: str, link_type: str) -> bool:
+        return (issue_key, target_key, link_type) in self._linked
+
+    def record_linked(self, issue_key: str, target_key: str, link_type: str) -> None:
+        with self._lock:
+            self._linked.add((issue_key, target_key, link_type))
+            self._write({'stage': 'link', 'key': issue_key, 'target': target_key, 'type': link_type})
+
+    def close(self) -> None:
+        '''
+        Close the journal file.
+        '''
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
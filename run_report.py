@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+
+'''
+run_report.py
+
+This module provides the RunReport class, the instrumentation of a run.
+
+Every HTTP request to Jira (including retries) is recorded with its method, endpoint template
+(e.g. '/rest/api/2/issue/{key}'), status, response size and duration, and every LLM invocation
+with its operation, model and duration. The created issues are recorded with their parent and
+creation cost, so the critical path of the epics/issues tree (the most expensive chain from a
+root issue to a leaf) can be broken down by tree depth.
+
+At the end of the run, a summary is logged, and the report can be written as JSON (.json) or as
+a Prometheus textfile (any other extension), e.g. for the node exporter textfile collector.
+'''
+
+import bisect
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+# Upper bounds of the latency histogram buckets, in seconds (the Prometheus defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_PREFIX = 'jira_issues_creator'
+
+ISSUE_KEY_PATTERN = re.compile(r'^[A-Z][A-Z0-9_]*-\d+$')
+
+
+def endpoint_template(url: str) -> str:
+    '''
+    Return the endpoint template of a request URL: the path without its query, with the issue keys,
+    project keys and numeric IDs replaced by '{key}' and '{id}'.
+    '''
+    segments = urlparse(url).path.split('/')
+    for index, segment in enumerate(segments):
+        if ISSUE_KEY_PATTERN.match(segment) or (index > 0 and segments[index - 1] == 'project' and segment):
+            segments[index] = '{key}'
+        elif segment.isdigit() and not (index > 0 and segments[index - 1] in ('api', 'agile')):
+            segments[index] = '{id}'
+    return '/'.join(segments)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    '''
+    Return a percentile of sorted values (nearest rank), 0 if there are none.
+    '''
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+class RunReport:
+    def __init__(self):
+        '''
+        Initializes a new instance of the RunReport class.
+        '''
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        # Request durations, statuses and sizes by (method, endpoint template)
+        self._durations: Dict[tuple, List[float]] = defaultdict(list)
+        self._statuses: Dict[tuple, Counter] = defaultdict(Counter)
+        self._bytes: Counter = Counter()
+        # LLM invocation durations by (operation, model)
+        self._llm_durations: Dict[tuple, List[float]] = defaultdict(list)
+        self._llm_cached: Counter = Counter()
+        self._llm_first_token: Dict[tuple, List[float]] = defaultdict(list)
+        # Parent key and creation cost of every created issue, by issue key
+        self._nodes: Dict[str, tuple] = {}
+
+    def record_request(self, method: str, url: str, status: Optional[int], size: int, seconds: float) -> None:
+        '''
+        Record an HTTP request (a request hook of JiraTransport).
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The request URL.
+            status (Optional[int]): The response status, None when the request failed without a response.
+            size (int): The size of the response body in bytes.
+            seconds (float): The duration of the request.
+        '''
+        endpoint = (method.upper(), endpoint_template(url))
+        with self._lock:
+            self._durations[endpoint].append(seconds)
+            self._statuses[endpoint][str(status) if status is not None else 'error'] += 1
+            self._bytes[endpoint] += size
+
+    def record_llm(self,
+                   operation: str,
+                   model_name: str,
+                   seconds: float,
+                   cached: bool = False,
+                   time_to_first_token: Optional[float] = None) -> None:
+        '''
+        Record an LLM invocation.
+
+        Args:
+            operation (str): 'invoke', 'stream' or 'batch'.
+            model_name (str): The name of the model.
+            seconds (float): The duration of the invocation.
+            cached (bool): Whether the response came from the response cache.
+            time_to_first_token (Optional[float]): The time to the first streamed token.
+        '''
+        key = (operation, model_name)
+        with self._lock:
+            self._llm_durations[key].append(seconds)
+            if cached:
+                self._llm_cached[key] += 1
+            if time_to_first_token is not None:
+                self._llm_first_token[key].append(time_to_first_token)
+
+    def record_node(self, issue_key: str, parent_key: Optional[str], seconds: float) -> None:
+        '''
+        Record the creation of an issue of the tree.
+
+        Args:
+            issue_key (str): The key of the created issue.
+            parent_key (Optional[str]): The key of its parent issue or epic, None for a root issue.
+            seconds (float): The cost of creating the issue (creation and inline update requests).
+        '''
+        with self._lock:
+            self._nodes[issue_key] = (parent_key, seconds)
+
+    def critical_path(self) -> List[Dict[str, Any]]:
+        '''
+        Return the most expensive chain of created issues from a root issue to a leaf, as the
+        depth, issue key and creation cost of every issue of the chain.
+        '''
+        with self._lock:
+            nodes = dict(self._nodes)
+        chain_costs: Dict[str, float] = {}
+
+        def chain_cost(issue_key: str) -> float:
+            # The chain is walked iteratively up to a root or an already computed issue
+            chain = []
+            while issue_key in nodes and issue_key not in chain_costs:
+                chain.append(issue_key)
+                issue_key = nodes[issue_key][0]
+            cost = chain_costs.get(issue_key, 0.0)
+            for key in reversed(chain):
+                cost += nodes[key][1]
+                chain_costs[key] = cost
+            return cost
+
+        if not nodes:
+            return []
+        issue_key = max(nodes, key=chain_cost)
+        path = []
+        while issue_key in nodes:
+            path.append(issue_key)
+            issue_key = nodes[issue_key][0]
+        return [{'depth': depth, 'issue': key, 'seconds': round(nodes[key][1], 6)}
+                for depth, key in enumerate(reversed(path))]
+
+    def as_dict(self, request_stats: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        '''
+        Return the report as a dictionary.
+
+        Args:
+            request_stats (Optional[Dict[str, float]]): The RequestStats of the transport (retries and
+                waiting times), added to the report.
+        '''
+        with self._lock:
+            endpoints = []
+            for (method, endpoint), durations in sorted(self._durations.items()):
+                ordered = sorted(durations)
+                endpoints.append({
+                    'method': method,
+                    'endpoint': endpoint,
+                    'count': len(ordered),
+                    'statuses': dict(self._statuses[(method, endpoint)]),
+                    'bytes': self._bytes[(method, endpoint)],
+                    'seconds': round(sum(ordered), 6),
+                    'p50_seconds': round(percentile(ordered, 0.50), 6),
+                    'p95_seconds': round(percentile(ordered, 0.95), 6),
+                    'max_seconds': round(ordered[-1], 6),
+                    # Cumulative counts of the requests under every bucket bound, like Prometheus
+                    'histogram': {str(bound): bisect.bisect_right(ordered, bound) for bound in LATENCY_BUCKETS},
+                })
+            llm = [{'operation': operation,
+                    'model': model_name,
+                    'count': len(durations),
+                    'cached': self._llm_cached[(operation, model_name)],
+                    'seconds': round(sum(durations), 6),
+                    'max_seconds': round(max(durations), 6),
+                    'time_to_first_token_seconds': [round(seconds, 6) for seconds in
+                                                    self._llm_first_token[(operation, model_name)]]}
+                   for (operation, model_name), durations in sorted(self._llm_durations.items())]
+            depths: Dict[int, Dict[str, float]] = {}
+            for issue_key in self._nodes:
+                depth, parent_key = 0, self._nodes[issue_key][0]
+                while parent_key in self._nodes:
+                    depth, parent_key = depth + 1, self._nodes[parent_key][0]
+                totals = depths.setdefault(depth, {'depth': depth, 'issues': 0, 'seconds': 0.0})
+                totals['issues'] += 1
+                totals['seconds'] += self._nodes[issue_key][1]
+
+        critical_path = self.critical_path()
+        return {'duration_seconds': round(time.monotonic() - self._start, 6),
+                'requests': sum(endpoint['count'] for endpoint in endpoints),
+                **(request_stats or {}),
+                'endpoints': endpoints,
+                'llm': llm,
+                'depths': [{**totals, 'seconds': round(totals['seconds'], 6)}
+                           for _, totals in sorted(depths.items())],
+                'critical_path': critical_path,
+                'critical_path_seconds': round(sum(node['seconds'] for node in critical_path), 6)}
+
+    def log_summary(self, request_stats: Optional[Dict[str, float]] = None) -> None:
+        '''
+        Log the requests by endpoint, the LLM invocations and the critical path of the run.
+        '''
+        report = self.as_dict(request_stats)
+        for endpoint in report['endpoints']:
+            logging.info(f'{endpoint["method"]} {endpoint["endpoint"]}: {endpoint["count"]} requests, '
+                         f'p50 {endpoint["p50_seconds"] * 1000:.0f}ms, p95 {endpoint["p95_seconds"] * 1000:.0f}ms, '
+                         f'{endpoint["bytes"]} bytes, statuses {endpoint["statuses"]}')
+        for llm in report['llm']:
+            logging.info(f'LLM {llm["operation"]} ({llm["model"]}): {llm["count"]} invocations, '
+                         f'{llm["cached"]} cached, {llm["seconds"]:.1f}s')
+        if report['critical_path']:
+            breakdown = ', '.join(f'depth {node["depth"]} {node["seconds"]:.2f}s' for node in report['critical_path'])
+            logging.info(f'Critical path: {report["critical_path_seconds"]:.2f}s ({breakdown})')
+
+    def write(self, report_file: str, request_stats: Optional[Dict[str, float]] = None) -> None:
+        '''
+        Write the report as JSON when the file extension is '.json', otherwise as a Prometheus textfile.
+        '''
+        report = self.as_dict(request_stats)
+        os.makedirs(os.path.dirname(os.path.abspath(report_file)), exist_ok=True)
+        with open(report_file, 'w', encoding='utf-8') as output:
+            if report_file.lower().endswith('.json'):
+                json.dump(report, output, indent=2)
+            else:
+                output.write(prometheus_text(report))
+        logging.info(f'Wrote the run report to "{report_file}"')
+
+
+def prometheus_text(report: Dict[str, Any]) -> str:
+    '''
+    Return a report (see RunReport.as_dict) in the Prometheus text exposition format.
+    '''
+    lines: List[str] = []
+
+    def metric(name: str, metric_type: str, help_text: str, samples: List[tuple]) -> None:
+        lines.append(f'# HELP {METRIC_PREFIX}_{name} {help_text}')
+        lines.append(f'# TYPE {METRIC_PREFIX}_{name} {metric_type}')
+        for suffix, labels, value in samples:
+            label_text = ','.join(f'{label}="{label_value}"' for label, label_value in labels.items())
+            lines.append(f'{METRIC_PREFIX}_{name}{suffix}{{{label_text}}} {value}' if label_text
+                         else f'{METRIC_PREFIX}_{name}{suffix} {value}')
+
+    metric('run_duration_seconds', 'gauge', 'Duration of the run.', [('', {}, report['duration_seconds'])])
+    metric('requests_total', 'counter', 'Jira HTTP requests, including retries.',
+           [('', {'method': endpoint['method'], 'endpoint': endpoint['endpoint'], 'status': status}, count)
+            for endpoint in report['endpoints'] for status, count in sorted(endpoint['statuses'].items())])
+    metric('response_bytes_total', 'counter', 'Size of the Jira responses.',
+           [('', {'method': endpoint['method'], 'endpoint': endpoint['endpoint']}, endpoint['bytes'])
+            for endpoint in report['endpoints']])
+    histogram_samples = []
+    for endpoint in report['endpoints']:
+        labels = {'method': endpoint['method'], 'endpoint': endpoint['endpoint']}
+        for bound, count in endpoint['histogram'].items():
+            histogram_samples.append(('_bucket', {**labels, 'le': bound}, count))
+        histogram_samples.append(('_bucket', {**labels, 'le': '+Inf'}, endpoint['count']))
+        histogram_samples.append(('_sum', labels, endpoint['seconds']))
+        histogram_samples.append(('_count', labels, endpoint['count']))
+    metric('request_duration_seconds', 'histogram', 'Duration of the Jira HTTP requests.', histogram_samples)
+    if 'retries' in report:
+        metric('retries_total', 'counter', 'Retried Jira requests.', [('', {}, report['retries'])])
+    metric('llm_invocations_total', 'counter', 'LLM invocations.',
+           [('', {'operation': llm['operation'], 'model': llm['model']}, llm['count']) for llm in report['llm']])
+    metric('llm_duration_seconds_total', 'counter', 'Time spent in LLM invocations.',
+           [('', {'operation': llm['operation'], 'model': llm['model']}, llm['seconds']) for llm in report['llm']])
+    metric('depth_issues', 'gauge', 'Created issues by tree depth.',
+           [('', {'depth': depth['depth']}, depth['issues']) for depth in report['depths']])
+    metric('depth_seconds', 'gauge', 'Creation cost of the issues by tree depth.',
+           [('', {'depth': depth['depth']}, depth['seconds']) for depth in report['depths']])
+    metric('critical_path_seconds', 'gauge', 'Creation cost of the critical path issues by tree depth.',
+           [('', {'depth': node['depth']}, node['seconds']) for node in report['critical_path']])
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+'''
+sprint_resolver.py
+
+This module provides the SprintResolver class for resolving sprint names into sprint IDs.
+
+Instead of scanning all the boards of a project for every sprint-tagged issue, the resolver
+builds a normalized sprint name -> sprint ID index once per project. Lookups are dictionary
+hits, and the index is rebuilt only when a requested name is missing from it (e.g. a sprint
+that was created during the run).
+'''
+
+import logging
+import threading
+from typing import Callable, Dict, Optional, Set
+
+
+def normalize_sprint_name(sprint_name: str) -> str:
+    '''
+    Return the normalized form of a sprint name, used for matching names case-insensitively.
+    '''
+    return str(sprint_name).strip().lower()
+
+
+class SprintResolver:
+    def __init__(self, fetch_sprint_index: Callable[[str, bool], Dict[str, str]]):
+        '''
+        Initializes a new instance of the SprintResolver class.
+
+        Args:
+            fetch_sprint_index (Callable[[str, bool], Dict[str, str]]): Function returning the sprint
+                index of a project key, as normalized sprint name -> sprint ID. Its second argument
+                requests fresh data, bypassing any metadata cache.
+        '''
+        self.fetch_sprint_index = fetch_sprint_index
+        self._indexes: Dict[str, Dict[str, str]] = {}
+        # Names that were already missing after the last rebuild of a project index
+        self._missing_names: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, project_key: str, sprint_name: str) -> Optional[str]:
+        '''
+        Return the ID of a sprint of the project by its name.
+
+        Args:
+            project_key (str): The key of the project.
+            sprint_name (str): The name of the sprint.
+
+        Returns:
+            Optional[str]: The ID of the sprint, or None if the sprint is not found.
+        '''
+        name = normalize_sprint_name(sprint_name)
+        with self._lock:
+            index = self._indexes.get(project_key)
+            if index is None:
+                index = self._build_index(project_key, refresh=False)
+            if name not in index and name not in self._missing_names[project_key]:
+                logging.debug(f'Sprint "{sprint_name}" is not in the sprint index of the '
+                              f'"{project_key}" project, refreshing the index')
+                index = self._build_index(project_key, refresh=True)
+
+            sprint_id = index.get(name)
+            if sprint_id is None:
+                self._missing_names[project_key].add(name)
+                logging.error(f'Sprint "{sprint_name}" was not found in the "{project_key}" project.')
+            return sprint_id
+
+    def prefetch(self, project_key: str) -> None:
+        '''
+        Build the sprint index of a project ahead of its first lookup, unless it is already built.
+        '''
+        with self._lock:
+            if project_key not in self._indexes:
+                self._build_index(project_key, refresh=False)
+
+    def _build_index(self, project_key: str, refresh: bool) -> Dict[str, str]:
+        '''
+        Fetch and store the sprint index of a project.
+        '''
+        index = self.fetch_sprint_index(project_key, refresh)
+        logging.debug(f'Indexed {len(index)} sprints of the "{project_key}" project')
+        self._indexes[project_key] = index
+        self._missing_names[project_key] = set()
+        return index
@@ -1,5 +1,4 @@
 from langchain.prompts import PromptTemplate
-from langchain.prompts.pipeline import PipelinePromptTemplate
 
 
 introduction = PromptTemplate.from_template("""
@@ -40,21 +39,11 @@ issues:
     storyPoints: 3
 """)
 
-full_template = PromptTemplate.from_template("""
-{introduction}
+# The static sections are rendered once into a fixed prefix that always comes first, so every prompt
+# starts with the same bytes and the provider-side prompt caching and Ollama's context reuse can hit.
+# Only the create section varies between the prompts.
+static_sections = [introduction, format_jira_ticket_template, jira_ticket_example_template]
+static_prompt_prefix = '\n' + ''.join(f'{section.format()}\n\n' for section in static_sections)
 
-{format}
-
-{example}
-
-{create}
-""")
-
-input_prompt = [
-    ("introduction", introduction),
-    ("format", format_jira_ticket_template),
-    ("example", jira_ticket_example_template),
-    ("create", create_jira_ticket_template)
-]
-
-pipeline_prompt = PipelinePromptTemplate(final_prompt=full_template, pipeline_prompts=input_prompt)
+ticket_prompt = PromptTemplate.from_template(
+    static_prompt_prefix.replace('{', '{{').replace('}', '}}') + create_jira_ticket_template.template + '\n')
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+'''
+update_queue.py
+
+This module provides the UpdateQueue class, a deferred stage for issue field updates.
+
+Instead of sending a blocking PUT right after every issue creation, the post-creation fields
+(storyPoints, sprint, status, ...) are queued and flushed after the creation stage, with a
+pool of workers. Multiple updates of the same issue are coalesced into a single PUT, and every
+failed update is reported for its issue without aborting the others.
+'''
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+
+class UpdateQueue:
+    def __init__(self):
+        '''
+        Initializes a new instance of the UpdateQueue class.
+        '''
+        self._lock = threading.Lock()
+        # Pending fields and the summary of the issue (for reporting), by issue key
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._summaries: Dict[str, str] = {}
+
+    def add(self, issue_key: str, fields: Dict[str, Any], summary: str = '') -> None:
+        '''
+        Queue an update of issue fields, merged with the pending update of the same issue.
+
+        Args:
+            issue_key (str): The key of the issue to update.
+            fields (Dict[str, Any]): The Jira fields to set. Later values of a field win.
+            summary (str, optional): The summary of the issue, used when reporting failures.
+        '''
+        with self._lock:
+            self._pending.setdefault(issue_key, {}).update(fields)
+            if summary:
+                self._summaries[issue_key] = summary
+
+    def flush(self, send_update: Callable[[str, Dict[str, Any]], Any], max_workers: int) -> List[Dict[str, Any]]:
+        '''
+        Send all the pending updates, one PUT per issue, and empty the queue.
+
+        Args:
+            send_update (Callable[[str, Dict[str, Any]], Any]): Function sending the update data
+                ({'fields': ...}) of an issue key.
+            max_workers (int): Number of updates sent concurrently.
+
+        Returns:
+            List[Dict[str, Any]]: The failed updates, with the issue key, summary and error.
+        '''
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            summaries, self._summaries = self._summaries, {}
+        if not pending:
+            return []
+
+        logging.info(f'Updating the post-creation fields of {len(pending)} issues')
+
+        def update(issue_key: str) -> Dict[str, Any]:
+            try:
+                send_update(issue_key, {'fields': pending[issue_key]})
+                return {}
+            except Exception as e:
+                logging.error(f'Failed to update the post-creation fields of issue {issue_key} '
+                              f'("{summaries.get(issue_key, "")}"): {e}')
+                return {'key': issue_key, 'summary': summaries.get(issue_key, ''), 'error': str(e)}
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                thread_name_prefix='jira-update') as executor:
+            results = list(executor.map(update, pending))
+        return [result for result in results if result]